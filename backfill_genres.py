@@ -1,78 +1,64 @@
 #!/usr/bin/env python3
 """
 Backfill genre data for existing movies using TMDB API
+
+Fetches run concurrently behind a token-bucket rate limiter and are committed
+in chunks. A checkpoint file lets an interrupted run pick up where it stopped.
 """
+import argparse
 import os
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from movie_app import create_app
-from movie_app.extensions import db
 from movie_app.models.movie import Movie
 from movie_app.services import tmdb
-import time
+from movie_app.services.backfill import run_backfill, missing_json_list_filter
+
+
+def _apply_genres(movie, details):
+    genres = details.get("genres") or []
+    if not genres:
+        return False
+    movie.set_genres(genres)
+    return True
+
 
-def backfill_genres():
+def backfill_genres(rate=20.0, workers=8, chunk_size=100, checkpoint=None, reset=False):
     app = create_app()
     with app.app_context():
         print("Backfilling genre data for existing movies...")
-        
-        # Get all movies that don't have genre data
-        # Use text() for database-agnostic JSON comparison
-        from sqlalchemy import text
-        
-        # Check database type for appropriate query
-        if 'sqlite' in str(db.engine.url):
-            movies = Movie.query.filter(
-                text("genres IS NULL OR genres = '[]' OR json_array_length(genres) = 0")
-            ).all()
-        else:
-            # PostgreSQL
-            movies = Movie.query.filter(
-                text("genres IS NULL OR genres::text = '[]' OR json_array_length(genres) = 0")
-            ).all()
-        
-        if not movies:
+        checkpoint = checkpoint or os.path.join(app.instance_path, "backfill_genres.checkpoint.json")
+        if reset and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        rows = Movie.query.filter(missing_json_list_filter("genres"))
+        stats = run_backfill(
+            "genres",
+            rows,
+            # Raises on timeouts and 5xx, so those rows count as failed and are retried on resume
+            fetch=tmdb.fetch_movie_details,
+            apply=_apply_genres,
+            rate=rate,
+            workers=workers,
+            chunk_size=chunk_size,
+            checkpoint_path=checkpoint,
+        )
+
+        if not stats["total"]:
             print("✓ All movies already have genre data")
             return
-            
-        print(f"Found {len(movies)} movies without genre data")
-        
-        updated_count = 0
-        failed_count = 0
-        
-        for movie in movies:
-            try:
-                print(f"Fetching genres for '{movie.title}' (TMDB ID: {movie.tmdb_id})...")
-                
-                # Get movie details from TMDB
-                movie_data = tmdb.movie_details(movie.tmdb_id)
-                
-                if movie_data and movie_data.get("genres"):
-                    movie.genres = movie_data.get("genres", [])
-                    updated_count += 1
-                    print(f"  ✓ Added genres: {', '.join(movie.genres)}")
-                else:
-                    print(f"  ✗ No genre data found")
-                    failed_count += 1
-                
-                # Rate limit to be nice to TMDB API
-                time.sleep(0.25)
-                
-            except Exception as e:
-                print(f"  ✗ Error fetching data: {e}")
-                failed_count += 1
-        
-        # Commit all changes
-        try:
-            if updated_count > 0:
-                db.session.commit()
-                print(f"\n✓ Successfully updated {updated_count} movies")
-            if failed_count > 0:
-                print(f"✗ Failed to update {failed_count} movies")
-        except Exception as e:
-            db.session.rollback()
-            print(f"✗ Error saving changes: {e}")
+        print(f"\n✓ Successfully updated {stats['updated']} movies")
+        if stats["failed"] or stats["skipped"]:
+            print(f"✗ Failed to update {stats['failed'] + stats['skipped']} movies")
+
 
 if __name__ == "__main__":
-    backfill_genres()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Backfill movie genres from TMDB")
+    parser.add_argument("--rate", type=float, default=20.0, help="max TMDB requests per second")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent TMDB requests")
+    parser.add_argument("--chunk-size", type=int, default=100, help="rows per commit")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: instance/backfill_genres.checkpoint.json)")
+    parser.add_argument("--reset", action="store_true", help="ignore any existing checkpoint")
+    args = parser.parse_args()
+    backfill_genres(args.rate, args.workers, args.chunk_size, args.checkpoint, args.reset)
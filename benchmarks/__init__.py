@@ -0,0 +1,3 @@
+"""
+Performance benchmarks. Run modules with `python -m benchmarks.<name>` from the repo root.
+"""
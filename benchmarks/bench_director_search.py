@@ -0,0 +1,61 @@
+"""
+Director-filtered TMDB search: serial vs concurrent fan-out.
+
+Runs tmdb.search_movies with a director against the local stub with injected
+latency, once with a single worker (the old serial behaviour) and once with
+the configured pool, and checks both return identical results.
+
+    python -m benchmarks.bench_director_search --latency 0.05 --runs 5
+"""
+import argparse
+import statistics
+import time
+
+from movie_app.services import tmdb
+from benchmarks.tmdb_stub import StubTMDBServer
+
+
+def _time_search(query: str, director: str, runs: int):
+    timings = []
+    results = None
+    for i in range(runs):
+        started = time.perf_counter()
+        results = tmdb.search_movies(f"{query} {i}", director=director)
+        timings.append(time.perf_counter() - started)
+    return timings, results
+
+
+def run(latency: float, runs: int, workers: int):
+    report = {}
+    outputs = {}
+    with StubTMDBServer(latency=latency) as stub:
+        for label, max_workers in (("serial", 1), ("concurrent", workers)):
+            tmdb.client.configure(base_url=stub.base_url, api_key="bench", max_workers=max_workers)
+            tmdb.clear_memo()
+            timings, results = _time_search("stub", "Stub Director", runs)
+            outputs[label] = results
+            report[label] = {
+                "median_ms": statistics.median(timings) * 1000,
+                "max_ms": max(timings) * 1000,
+            }
+            tmdb.client.close()
+    assert outputs["serial"] == outputs["concurrent"], "concurrent search changed results or ordering"
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the stub adds to each response")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    report = run(args.latency, args.runs, args.workers)
+    for label, r in report.items():
+        print(f"{label:>10}: median {r['median_ms']:8.1f} ms   max {r['max_ms']:8.1f} ms")
+    speedup = report["serial"]["median_ms"] / report["concurrent"]["median_ms"]
+    print(f"   speedup: {speedup:.1f}x (results identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Seeded synthetic library for benchmarks: movies with genres, tags and reviews.
+
+The same size and seed always produce the same rows, so timings from different
+runs (and machines) compare like for like. Distributions roughly follow a real
+shared watchlist: mostly recent releases, Drama/Comedy-heavy genres, a few
+popular tags with a long tail, and two users who rate a good share of movies.
+
+    python -m benchmarks.library_generator --size 10k --db /tmp/bench-10k.db
+"""
+import argparse
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import insert
+
+from benchmarks.tmdb_stub import GENRES
+from movie_app.extensions import db
+from movie_app.models.movie import Movie, MovieGenre
+from movie_app.models.review import Review
+from movie_app.models.tag import PREDEFINED_TAGS, MovieTag, Tag
+from movie_app.models.user import User
+from movie_app.services import counters
+from movie_app.services.search_index import search_index
+from movie_app.services.tag_catalog import tag_catalog
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+# Generated movies use tmdb ids from here up, so adds of stub ids never collide
+TMDB_ID_BASE = 1_000_000
+
+# Relative genre frequencies, loosely after TMDB's catalogue
+GENRE_WEIGHTS = {
+    "Drama": 30, "Comedy": 20, "Thriller": 12, "Action": 11, "Romance": 9, "Horror": 8, "Crime": 8,
+    "Adventure": 7, "Science Fiction": 6, "Documentary": 5, "Fantasy": 5, "Mystery": 5, "Family": 4,
+    "Animation": 4, "History": 3, "Music": 2, "War": 2,
+}
+
+CUSTOM_TAGS = [
+    "Date Night", "Rewatch", "Oscar Winner", "Cult Classic", "Based on a Book", "Twist Ending",
+    "Soundtrack", "Guilty Pleasure", "Long", "Subtitled", "Road Movie", "Heist", "Time Travel",
+    "Coming of Age", "Noir", "Space", "Musical", "Sports", "True Story", "Ensemble Cast",
+    "Remake", "Sequel", "Holiday", "Black and White", "Silent", "Anthology", "Mockumentary",
+    "Slasher", "Courtroom", "Dystopia",
+]
+
+_WORDS = (
+    "silent river night city last summer shadow dream stranger house road winter light secret "
+    "garden fire ocean mountain island empire storm heart glass iron paper golden broken lost "
+    "hidden wild quiet dark bright long little red blue black white northern southern electric "
+    "midnight morning harbor station letter promise journey return kingdom forest echo mirror"
+).split()
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[-\s]+", "-", re.sub(r"[^\w\s-]", "", name.lower())).strip("-") or "tag"
+
+
+def _title(rng: random.Random) -> str:
+    words = rng.sample(_WORDS, rng.choice((1, 2, 2, 3)))
+    prefix = rng.choice(("The ", "", "", "A "))
+    return (prefix + " ".join(words)).title()
+
+
+def _year(rng: random.Random) -> int:
+    # Skewed towards recent releases
+    return max(1920, min(2025, int(2025 - abs(rng.gauss(0, 20)))))
+
+
+def _rating(rng: random.Random):
+    if rng.random() < 0.05:
+        return None  # reviewed without a rating
+    return max(0.5, min(5.0, round(rng.gauss(3.5, 0.9) * 2) / 2))
+
+
+def generate_library(size: int, seed: int = 42, batch_size: int = 2000) -> Dict[str, int]:
+    """
+    Fill the (empty) library of the current app with `size` synthetic movies.
+    Must run inside an app context; returns row counts per table.
+    """
+    if db.session.query(Movie.id).first() is not None:
+        raise ValueError("generate_library needs an empty library")
+
+    rng = random.Random(seed)
+    genre_names = [g for g in GENRES if g in GENRE_WEIGHTS]
+    genre_weights = [GENRE_WEIGHTS[g] for g in genre_names]
+    user_ids = [row.id for row in db.session.query(User.id).order_by(User.id)]
+    review_odds = [0.55, 0.35] + [0.1] * max(0, len(user_ids) - 2)
+
+    tag_names = [t["name"] for t in PREDEFINED_TAGS] + CUSTOM_TAGS
+    db.session.execute(insert(Tag.__table__), [
+        {"id": i + 1, "name": name, "slug": _slug(name), "created_at": datetime(2020, 1, 1)}
+        for i, name in enumerate(tag_names)
+    ])
+    tag_ids = list(range(1, len(tag_names) + 1))
+    # Long tail: the first few tags are used far more than the rest
+    tag_weights = [1.0 / (rank + 1) for rank in range(len(tag_ids))]
+
+    started_at = datetime(2021, 1, 1)
+    totals = {"movies": 0, "movie_genres": 0, "movie_tags": 0, "reviews": 0, "tags": len(tag_ids)}
+    for start in range(0, size, batch_size):
+        movies, genres, tags, reviews = [], [], [], []
+        for movie_id in range(start + 1, min(size, start + batch_size) + 1):
+            title = _title(rng)
+            picked = []
+            for genre in rng.choices(genre_names, genre_weights, k=rng.choice((1, 2, 2, 3))):
+                if genre not in picked:
+                    picked.append(genre)
+            movies.append({
+                "id": movie_id,
+                "tmdb_id": TMDB_ID_BASE + movie_id,
+                "title": title,
+                "original_title": title,
+                "year": _year(rng),
+                "poster_path": f"/poster{movie_id}.jpg",
+                "backdrop_path": f"/backdrop{movie_id}.jpg",
+                "overview": " ".join(rng.choices(_WORDS, k=rng.randint(12, 40))).capitalize() + ".",
+                "runtime": rng.randint(75, 180),
+                "tmdb_rating": round(rng.uniform(4.0, 8.8), 1),
+                "genres": picked,
+                # Added over a few years, in id order
+                "added_at": started_at + timedelta(minutes=movie_id * 7 + rng.randint(0, 6)),
+            })
+            genres.extend({"movie_id": movie_id, "name": g} for g in picked)
+            if rng.random() < 0.45:
+                chosen = set(rng.choices(tag_ids, tag_weights, k=rng.choice((1, 1, 2, 3))))
+                tags.extend({"movie_id": movie_id, "tag_id": t, "added_by": rng.choice(user_ids),
+                             "added_at": movies[-1]["added_at"]} for t in sorted(chosen))
+            for user_id, odds in zip(user_ids, review_odds):
+                if rng.random() < odds:
+                    reviews.append({"movie_id": movie_id, "user_id": user_id, "rating": _rating(rng),
+                                    "created_at": movies[-1]["added_at"], "updated_at": movies[-1]["added_at"]})
+        for table, rows in ((Movie.__table__, movies), (MovieGenre.__table__, genres),
+                            (MovieTag.__table__, tags), (Review.__table__, reviews)):
+            if rows:
+                db.session.execute(insert(table), rows)
+                totals[table.name] += len(rows)
+        db.session.commit()
+
+    counters.reconcile()
+    search_index.rebuild()
+    tag_catalog.invalidate()
+    return totals
+
+
+def _parse_size(value: str) -> int:
+    return SIZES.get(value.lower()) or int(value)
+
+
+def main():
+    from movie_app.app import create_app
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", default="1k", help="1k, 10k, 100k or a number of movies")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", required=True, help="path of the SQLite database to create")
+    args = parser.parse_args()
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{args.db}"})
+    started = time.perf_counter()
+    with app.app_context():
+        totals = generate_library(_parse_size(args.size), seed=args.seed)
+    print(", ".join(f"{n} {table}" for table, n in totals.items()),
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
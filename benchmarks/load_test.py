@@ -0,0 +1,170 @@
+"""
+Load test for the gunicorn serving profile: library reads while TMDB calls are in flight.
+
+Starts the stub TMDB server with injected latency and runs the app under
+gunicorn twice, with the same number of worker processes: once with sync
+workers (the old default) and once with gunicorn.conf.py's gthread workers.
+In each run some clients keep TMDB searches in flight while others read the
+library; the report shows how many library reads got through meanwhile.
+
+    python -m benchmarks.load_test --latency 0.5 --duration 10
+
+Needs gunicorn (from requirements.txt) and a free local port.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from benchmarks.tmdb_stub import StubTMDBServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILES = {
+    "sync": ["--worker-class", "sync", "--threads", "1"],
+    "gthread": [],  # as configured in gunicorn.conf.py
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_gunicorn(extra_args, port: int, workers: int, stub_url: str, db_path: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "TMDB_API_BASE": stub_url,
+        "TMDB_API_KEY": "load-test",
+        # Every search must reach the (slow) stub
+        "HTTP_CACHE_BACKEND": "none",
+        "TMDB_MEMO_SIZE": "0",
+        "GUNICORN_LOG_LEVEL": "warning",
+    }
+    # gunicorn 20.0 has no __main__ module; run its console entry point with this interpreter
+    cmd = [sys.executable, "-c", "from gunicorn.app.wsgiapp import run; run()",
+           "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}", "--access-logfile", "/dev/null",
+           *extra_args, "main:app"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and proc.poll() is None:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/auth/status", timeout=1)
+            return proc
+        except requests.RequestException:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("gunicorn did not start")
+
+
+def _login(base: str) -> requests.Session:
+    session = requests.Session()
+    resp = session.post(f"{base}/auth/login", json={"username": "Alex", "password": "alex"}, timeout=10)
+    resp.raise_for_status()
+    return session
+
+
+def _run_clients(base: str, duration: float, slow_clients: int, fast_clients: int):
+    stop = time.monotonic() + duration
+    lock = threading.Lock()
+    results = {"slow": [], "fast": [], "errors": 0}
+
+    def loop(kind: str, index: int):
+        session = _login(base)
+        n = 0
+        while time.monotonic() < stop:
+            n += 1
+            if kind == "slow":
+                url = f"{base}/api/movies/search?q=load-{index}-{n}"
+            else:
+                url = f"{base}/api/movies?page={1 + n % 3}&per_page=20"
+            started = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=60).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    results[kind].append(elapsed)
+                else:
+                    results["errors"] += 1
+
+    threads = [threading.Thread(target=loop, args=("slow", i)) for i in range(slow_clients)]
+    threads += [threading.Thread(target=loop, args=("fast", i)) for i in range(fast_clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def _summary(timings, duration: float):
+    if not timings:
+        return {"rps": 0.0, "p50_ms": None, "p95_ms": None}
+    ordered = sorted(timings)
+    return {
+        "rps": len(timings) / duration,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    }
+
+
+def run(latency: float, duration: float, workers: int, slow_clients: int, fast_clients: int, movies: int):
+    report = {}
+    with StubTMDBServer(latency=latency) as stub, tempfile.TemporaryDirectory() as tmp:
+        for label, extra_args in PROFILES.items():
+            port = _free_port()
+            proc = _start_gunicorn(extra_args, port, workers, stub.base_url, os.path.join(tmp, f"{label}.db"))
+            try:
+                base = f"http://127.0.0.1:{port}"
+                seed = _login(base).post(f"{base}/api/movies/batch",
+                                         json={"tmdb_ids": list(range(1, movies + 1))}, timeout=120)
+                seed.raise_for_status()
+                results = _run_clients(base, duration, slow_clients, fast_clients)
+            finally:
+                proc.terminate()
+                proc.wait(timeout=30)
+            report[label] = {
+                "library": _summary(results["fast"], duration),
+                "search": _summary(results["slow"], duration),
+                "errors": results["errors"],
+            }
+    return report
+
+
+def _fmt(value):
+    return "      -" if value is None else f"{value:7.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds the stub adds to each TMDB response")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per profile")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes in both profiles")
+    parser.add_argument("--slow-clients", type=int, default=4, help="clients looping on TMDB searches")
+    parser.add_argument("--fast-clients", type=int, default=4, help="clients looping on library reads")
+    parser.add_argument("--movies", type=int, default=60, help="movies added before the run")
+    args = parser.parse_args()
+
+    report = run(args.latency, args.duration, args.workers, args.slow_clients, args.fast_clients, args.movies)
+    print(f"{'profile':>8}  {'library rps':>11}  {'p50 ms':>7}  {'p95 ms':>7}  {'search rps':>10}  errors")
+    for label, r in report.items():
+        lib, search = r["library"], r["search"]
+        print(f"{label:>8}  {lib['rps']:11.1f}  {_fmt(lib['p50_ms'])}  {_fmt(lib['p95_ms'])}  "
+              f"{search['rps']:10.1f}  {r['errors']:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Record the TMDB fixtures used by offline tests and benchmarks (TMDB_MODE=replay).
+
+Runs the lookups the benchmark suite and tests make through the app's own TMDB
+helpers with TMDB_MODE=record, so the fixture file holds exactly the requests
+the app sends. Records from live TMDB (needs TMDB_API_KEY or TMDB_BEARER_TOKEN)
+or, with --stub, from the local stub server (benchmarks.tmdb_stub).
+
+    python -m benchmarks.record_tmdb_fixtures --stub
+    python -m benchmarks.record_tmdb_fixtures --query "the matrix" --movie 603 --out /tmp/tmdb.jsonl.gz
+
+Recordings are added to an existing file; pass --fresh to start over.
+"""
+import argparse
+import contextlib
+import os
+import tempfile
+
+from benchmarks.tmdb_stub import StubTMDBServer
+from movie_app.services import tmdb
+from movie_app.services.tmdb_fixtures import FixtureStore
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "tmdb.jsonl.gz")
+
+# What benchmarks.suite asks for, for up to SUITE_REQUESTS warmup + timed iterations:
+# "bench <i>" searches, adds of tmdb ids 10 + i, batch adds of PER_REQUEST ids from
+# BATCH_BASE on, and Stremio imports of PER_REQUEST IMDb ids from IMPORT_BASE on
+SUITE_REQUESTS = 60
+PER_REQUEST = 5
+BATCH_BASE = 1000
+IMPORT_BASE = 2000
+SEARCHES = [f"bench {i}" for i in range(SUITE_REQUESTS)] + ["stub"]
+DIRECTOR_SEARCHES = [("bench 0", "Stub Director"), ("stub", "Stub Director")]
+_IMPORTED = range(IMPORT_BASE, IMPORT_BASE + SUITE_REQUESTS * PER_REQUEST)
+MOVIES = (list(range(10, 10 + SUITE_REQUESTS)) + [603]
+          + list(range(BATCH_BASE, BATCH_BASE + SUITE_REQUESTS * PER_REQUEST))
+          # On the stub every fifth IMDb id is a TV series, which has no movie details
+          + [n for n in _IMPORTED if n % 5])
+# tt0000011 and tt0000015 are a movie and a TV series on the stub
+IMDB_IDS = ["tt0000011", "tt0000015"] + [f"tt{n:07d}" for n in _IMPORTED]
+
+
+def record(out: str, searches=SEARCHES, director_searches=DIRECTOR_SEARCHES, movies=MOVIES, imdb_ids=IMDB_IDS,
+           api_base=None, fresh: bool = False) -> int:
+    """Record the lookups into `out`; returns the number of fixtures in the file."""
+    from movie_app.app import create_app
+
+    if fresh and os.path.exists(out):
+        os.remove(out)
+    with tempfile.TemporaryDirectory() as tmp:
+        overrides = {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'record.db')}",
+            "TMDB_MODE": "record",
+            "TMDB_FIXTURES_PATH": out,
+            # Every lookup must reach TMDB to be recorded
+            "HTTP_CACHE_BACKEND": "none",
+            "TMDB_MEMO_SIZE": 0,
+            "METRICS_ENABLED": False,
+        }
+        if api_base:
+            overrides.update({"TMDB_API_BASE": api_base, "TMDB_API_KEY": "record"})
+        create_app(overrides)
+        try:
+            for query in searches:
+                tmdb.search_movies(query)
+            for query, director in director_searches:
+                tmdb.search_movies(query, director=director)
+            tmdb.movie_details_many(movies)
+            for imdb_id in imdb_ids:
+                tmdb.find_by_imdb(imdb_id)
+        finally:
+            tmdb.client.close()
+            tmdb.clear_memo()
+    return len(FixtureStore(out))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=DEFAULT_FIXTURES)
+    parser.add_argument("--stub", action="store_true", help="record from the local stub instead of live TMDB")
+    parser.add_argument("--query", action="append", default=[], help="extra search to record (repeatable)")
+    parser.add_argument("--movie", action="append", type=int, default=[], help="extra tmdb id to record")
+    parser.add_argument("--fresh", action="store_true", help="discard existing recordings first")
+    args = parser.parse_args()
+
+    with StubTMDBServer() if args.stub else contextlib.nullcontext() as stub:
+        count = record(args.out, searches=SEARCHES + args.query, movies=MOVIES + args.movie,
+                       api_base=stub.base_url if stub else None, fresh=args.fresh)
+    print(f"{count} fixtures in {args.out} ({os.path.getsize(args.out) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
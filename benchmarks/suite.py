@@ -0,0 +1,278 @@
+"""
+Benchmark suite for the library API: timed scenarios over a seeded synthetic library.
+
+Builds a fresh SQLite library of the requested size (benchmarks.library_generator),
+points the TMDB client at the local stub (benchmarks.tmdb_stub) or, with
+--tmdb replay, at the recorded fixtures (benchmarks.record_tmdb_fixtures), and
+times every scenario below through the Flask test client. Per scenario it records latency
+(median, p95, mean, min) and SQL statements per request. Results are written as
+JSON and can be compared against a stored baseline: a scenario regresses when its
+median slows down past the tolerance, or when it issues more SQL statements.
+
+    python -m benchmarks.suite --size 1k --out bench-1k.json
+    python -m benchmarks.suite --size 1k --baseline benchmarks/baselines/1k.json
+    python -m benchmarks.suite --size 10k --save-baseline benchmarks/baselines/10k.json
+    python -m benchmarks.suite --size 1k --tmdb replay --tmdb-latency 0.05
+
+Exits with status 1 when the comparison finds a regression. Timings depend on
+the machine, so baselines are only meaningful on the machine that recorded them;
+SQL statement counts are machine independent.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from benchmarks.library_generator import SIZES, generate_library
+from benchmarks.record_tmdb_fixtures import BATCH_BASE, DEFAULT_FIXTURES, IMPORT_BASE, PER_REQUEST
+from benchmarks.tmdb_stub import StubTMDBServer
+from movie_app.extensions import db
+from movie_app.models.tag import MovieTag
+from movie_app.services import tmdb
+
+DEFAULT_TOLERANCE = 0.30  # a median this much slower than the baseline is a regression...
+DEFAULT_MIN_DELTA_MS = 2.0  # ...as long as it is also at least this many ms slower
+
+
+def _scenarios(size: int, movie_tags: List[Tuple[int, int]]) -> Dict[str, Callable[[Any, int], Any]]:
+    """
+    name -> fn(client, iteration) returning the response. Reads first, then writes.
+    movie_tags are (movie_id, tag_id) pairs of the generated library, for tag_remove.
+    """
+    cursor = {"next": ""}
+
+    def cursor_walk(client, i):
+        resp = client.get(f"/api/movies?cursor={cursor['next']}&per_page=20")
+        cursor["next"] = resp.get_json().get("next_cursor") or ""
+        return resp
+
+    def get(url):
+        return lambda client, i: client.get(url)
+
+    def stremio_import(client, i):
+        numbers = range(IMPORT_BASE + i * PER_REQUEST, IMPORT_BASE + (i + 1) * PER_REQUEST)
+        export = {"library": [{"_id": f"tt{n:07d}", "name": f"Import {n}", "type": "movie"} for n in numbers]}
+        return client.post("/api/import/stremio", data=json.dumps(export), content_type="application/json")
+
+    return {
+        "list_default": get("/api/movies"),
+        "list_deep_page": get(f"/api/movies?page={max(1, size // 40)}"),
+        "list_cursor_walk": cursor_walk,
+        "list_include_tags": get("/api/movies?include=tags"),
+        "list_genre": get("/api/movies?genre=Horror"),
+        "list_genres_any": get("/api/movies?genre=Drama,Comedy"),
+        "list_year_range": get("/api/movies?year_from=1990&year_to=1999"),
+        "list_tag": get("/api/movies?tags=Classic"),
+        "list_min_rating": get("/api/movies?min_rating=4.5"),
+        "list_unrated": get("/api/movies?unrated=1"),
+        "list_combined": get("/api/movies?genre=Drama&year_from=2000&tags=Deep&min_rating=3"),
+        "facets": get("/api/movies/facets"),
+        "facets_filtered": get("/api/movies/facets?genre=Drama&year_from=2000"),
+        "genres": get("/api/movies/genres"),
+        "stats": get("/api/movies/stats"),
+        "search_local": lambda client, i: client.get(
+            f"/api/movies/search?library_only=true&q={('silent', 'river night', 'gold')[i % 3]}"),
+        "search_tmdb": lambda client, i: client.get(f"/api/movies/search?q=bench {i}"),
+        "tag_search": lambda client, i: client.get(f"/api/tags/search?q={('cl', 'd', 'time', 'ur')[i % 4]}"),
+        "tags_all": get("/api/tags/all"),
+        "movie_tags_bulk": get("/api/movies/tags?ids=" + ",".join(str(n) for n in range(1, 41))),
+        "add_movie": lambda client, i: client.post("/api/movies", json={"tmdb_id": 10 + i}),
+        "review": lambda client, i: client.post(f"/api/movies/{1 + i % size}/review",
+                                                json={"rating": (i % 10 + 1) / 2}),
+        "tag_add": lambda client, i: client.post(f"/api/movies/{1 + (i * 7) % size}/tags",
+                                                 json={"name": f"Bench {i % 5}"}),
+        "tag_remove": lambda client, i: client.delete("/api/movies/{}/tags/{}".format(*movie_tags[i])),
+        "add_batch": lambda client, i: client.post("/api/movies/batch", json={
+            "tmdb_ids": list(range(BATCH_BASE + i * PER_REQUEST, BATCH_BASE + (i + 1) * PER_REQUEST))}),
+        "stremio_import": stremio_import,
+        # Last, and from the end of the library, so no other scenario meets a deleted movie
+        "delete_movie": lambda client, i: client.delete(f"/api/movies/{size - i}"),
+    }
+
+
+def _measure(app, client, fn, iterations: int, warmup: int) -> Dict[str, Any]:
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    timings: List[float] = []
+    queries: List[int] = []
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        for i in range(warmup + iterations):
+            statements[0] = 0
+            started = time.perf_counter()
+            resp = fn(client, i)
+            elapsed = time.perf_counter() - started
+            if resp.status_code >= 400:
+                raise RuntimeError(f"HTTP {resp.status_code}: {resp.get_data(as_text=True)[:200]}")
+            if i >= warmup:
+                timings.append(elapsed * 1000)
+                queries.append(statements[0])
+    finally:
+        with app.app_context():
+            event.remove(db.engine, "before_cursor_execute", count)
+    ordered = sorted(timings)
+    return {
+        "iterations": iterations,
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "min_ms": round(ordered[0], 3),
+        # Statement counts can vary with cache state; the largest is the stable upper bound
+        "queries": max(queries),
+    }
+
+
+def run_suite(size: int, seed: int = 42, iterations: int = 30, warmup: int = 3, tmdb_latency: float = 0.0,
+              only: Optional[List[str]] = None, log: Callable[[str], None] = print,
+              tmdb_fixtures: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the scenarios against TMDB answers from the stub server, or replayed from
+    `tmdb_fixtures` when given (no sockets at all); either way TMDB calls take
+    tmdb_latency seconds.
+    """
+    from movie_app.app import create_app
+
+    replay = tmdb_fixtures is not None
+    with (contextlib.nullcontext() if replay else StubTMDBServer(latency=tmdb_latency)) as stub, \
+            tempfile.TemporaryDirectory() as tmp:
+        if replay:
+            tmdb_config = {"TMDB_MODE": "replay", "TMDB_FIXTURES_PATH": tmdb_fixtures,
+                           "TMDB_REPLAY_LATENCY": tmdb_latency}
+        else:
+            tmdb_config = {"TMDB_MODE": "live", "TMDB_API_BASE": stub.base_url, "TMDB_API_KEY": "bench"}
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            **tmdb_config,
+            # Time the real work: no TMDB HTTP cache and no cached list payloads
+            "HTTP_CACHE_BACKEND": "none",
+            "RESPONSE_CACHE_BACKEND": "none",
+            "METRICS_ENABLED": False,
+            "TESTING": True,
+        })
+        tmdb.clear_memo()
+        started = time.perf_counter()
+        with app.app_context():
+            totals = generate_library(size, seed=seed)
+            movie_tags = [(mt.movie_id, mt.tag_id)
+                          for mt in MovieTag.query.order_by(MovieTag.movie_id, MovieTag.tag_id)]
+        log(f"generated {size} movies in {time.perf_counter() - started:.1f}s")
+
+        client = app.test_client()
+        client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+        scenarios = {}
+        for name, fn in _scenarios(size, movie_tags).items():
+            if only and name not in only:
+                continue
+            scenarios[name] = _measure(app, client, fn, iterations, warmup)
+            log(f"{name:>20}: median {scenarios[name]['median_ms']:8.2f} ms  "
+                f"p95 {scenarios[name]['p95_ms']:8.2f} ms  {scenarios[name]['queries']:3d} queries")
+        tmdb.client.close()
+        tmdb.clear_memo()
+
+    return {
+        "meta": {
+            "size": size,
+            "seed": seed,
+            "iterations": iterations,
+            "tmdb": "replay" if replay else "stub",
+            "tmdb_latency": tmdb_latency,
+            "only": only,
+            "rows": totals,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[str]:
+    """
+    Regressions of results against baseline, as human-readable lines (empty when none).
+    A baseline scenario missing from the results is one too, unless the run left it out with --only.
+    """
+    for key in ("size", "seed", "tmdb"):
+        if results["meta"].get(key) != baseline["meta"].get(key):
+            raise ValueError(f"Baseline was recorded with {key}={baseline['meta'].get(key)}, "
+                             f"this run used {key}={results['meta'].get(key)}")
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        current = results["scenarios"].get(name)
+        if current is None:
+            only = results["meta"].get("only")
+            if not only or name in only:
+                regressions.append(f"{name}: missing from the results")
+            continue
+        if current["queries"] > base["queries"]:
+            regressions.append(f"{name}: {current['queries']} SQL statements per request, baseline {base['queries']}")
+        slower = current["median_ms"] - base["median_ms"]
+        if current["median_ms"] > base["median_ms"] * (1 + tolerance) and slower >= min_delta_ms:
+            regressions.append(f"{name}: median {current['median_ms']:.2f} ms, baseline {base['median_ms']:.2f} ms "
+                               f"(+{slower / base['median_ms']:.0%})")
+    return regressions
+
+
+def _parse_size(value: str) -> int:
+    return SIZES.get(value.lower()) or int(value)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", default="1k", help="1k, 10k, 100k or a number of movies")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--tmdb", choices=("stub", "replay"), default="stub",
+                        help="answer TMDB calls from the stub server or from recorded fixtures")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="fixture file for --tmdb replay")
+    parser.add_argument("--tmdb-latency", type=float, default=0.0, help="seconds added to each TMDB call")
+    parser.add_argument("--only", help="comma-separated scenario names")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON; exit 1 on regressions")
+    parser.add_argument("--save-baseline", help="write results JSON here as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    args = parser.parse_args(argv)
+
+    only = [s.strip() for s in args.only.split(",")] if args.only else None
+    results = run_suite(_parse_size(args.size), seed=args.seed, iterations=args.iterations, warmup=args.warmup,
+                        tmdb_latency=args.tmdb_latency, only=only,
+                        tmdb_fixtures=args.fixtures if args.tmdb == "replay" else None)
+    for path in filter(None, (args.out, args.save_baseline)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"wrote {path}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"\nno regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Local stand-in for the TMDB API with configurable latency.
+
+Serves deterministic synthetic data for the endpoints the app uses, so
+benchmarks can measure our side of a TMDB round-trip without the network:
+
+    with StubTMDBServer(latency=0.05) as stub:
+        tmdb.client.configure(base_url=stub.base_url)
+"""
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+GENRES = ["Action", "Adventure", "Animation", "Comedy", "Crime", "Drama", "Family", "Fantasy",
+          "History", "Horror", "Music", "Mystery", "Romance", "Science Fiction", "Thriller", "War"]
+DIRECTOR_ID = 525
+MAX_SEARCH_ID = 500 * 20 + 40
+
+
+def _seed(value: str) -> int:
+    return zlib.crc32(value.encode("utf-8"))
+
+
+def movie_payload(tmdb_id: int) -> Dict[str, Any]:
+    seed = _seed(str(tmdb_id))
+    year = 1950 + seed % 75
+    return {
+        "id": tmdb_id,
+        "title": f"Stub Movie {tmdb_id}",
+        "original_title": f"Stub Movie {tmdb_id}",
+        "release_date": f"{year}-0{1 + seed % 9}-1{seed % 10}",
+        "poster_path": f"/poster{tmdb_id}.jpg",
+        "backdrop_path": f"/backdrop{tmdb_id}.jpg",
+        "overview": f"Synthetic overview for movie {tmdb_id}. " * 4,
+        "runtime": 80 + seed % 90,
+        "vote_average": round(5 + (seed % 50) / 10, 1),
+        "genres": [{"id": i, "name": GENRES[(seed >> i) % len(GENRES)]} for i in range(1 + seed % 3)],
+    }
+
+
+def _directed_by_stub_director(tmdb_id: int) -> bool:
+    return tmdb_id % 3 == 0
+
+
+def _is_stub_series(number: int) -> bool:
+    return number % 5 == 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        stub: "StubTMDBServer" = self.server.stub
+        stub.record(self.path)
+        if stub.latency:
+            time.sleep(stub.latency)
+        url = urlparse(self.path)
+        if url.path in stub.errors:
+            return self._send(stub.errors[url.path], {"status_message": "Injected error."})
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+        if parts[:2] == ["t", "p"] and len(parts) == 4:
+            return self._send_image(parts[3])
+        body = self._route(parts, params)
+        if body is None:
+            return self._send(404, {"status_message": "The resource you requested could not be found."})
+        return self._send(200, body)
+
+    def _route(self, parts, params) -> Optional[Dict[str, Any]]:
+        if parts == ["search", "movie"]:
+            base = _seed(params.get("query", "")) % 500 * 20
+            page = int(params.get("page", 1))
+            results = [movie_payload(base + (page - 1) * 20 + i) for i in range(20)]
+            for r in results:
+                r["title"] = f"{params.get('query', '')} {r['id']}"
+            return {"page": page, "results": results, "total_results": 20}
+        if parts == ["search", "person"]:
+            return {"results": [{"id": DIRECTOR_ID, "name": params.get("query", "")}]}
+        if len(parts) == 3 and parts[0] == "person" and parts[2] == "movie_credits":
+            # The stub director directed every third id in the synthetic search range
+            return {"crew": [{"id": i, "job": "Director", "department": "Directing"}
+                             for i in range(0, MAX_SEARCH_ID, 3) if _directed_by_stub_director(i)]}
+        if len(parts) == 3 and parts[0] == "movie" and parts[2] == "credits":
+            tmdb_id = int(parts[1])
+            name = "Stub Director" if _directed_by_stub_director(tmdb_id) else f"Director {tmdb_id}"
+            return {"id": tmdb_id, "crew": [{"name": name, "job": "Director", "department": "Directing"}]}
+        if len(parts) == 2 and parts[0] == "movie" and parts[1].isdigit():
+            return movie_payload(int(parts[1]))
+        if len(parts) == 2 and parts[0] == "find" and parts[1][2:].isdigit():
+            # IMDb ids map to the TMDB id with the same number; every fifth one is a TV series
+            number = int(parts[1][2:])
+            if _is_stub_series(number):
+                return {"movie_results": [], "tv_results": [{"id": number, "name": f"Stub Series {number}"}]}
+            return {"movie_results": [movie_payload(number)], "tv_results": []}
+        return None
+
+    def _send_image(self, name):
+        # Image CDN stand-in (POSTER_SOURCE_BASE=<base_url>/t/p): a few bytes unique to the file name
+        if not name.startswith("poster"):
+            return self._send(404, {"status_message": "Not found"})
+        payload = b"\xff\xd8\xff\xe0stub-image:" + name.encode("utf-8") + b"\xff\xd9"
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubTMDBServer:
+    """Threaded HTTP server answering TMDB-style requests after `latency` seconds."""
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.request_count = 0
+        # path -> HTTP status to answer it with instead (e.g. {"/movie/3": 503}), to test error handling
+        self.errors: Dict[str, int] = {}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, path: str):
+        with self._lock:
+            self.request_count += 1
+
+    def start(self) -> "StubTMDBServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubTMDBServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local TMDB stand-in")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    args = parser.parse_args()
+    server = StubTMDBServer(latency=args.latency, port=args.port)
+    print(f"Stub TMDB listening on {server.base_url} (latency {args.latency}s)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
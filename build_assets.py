@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Build the static assets: minify app.js/app.css, fingerprint every file under
+movie_app/static with its content hash and precompress text files (gzip, plus
+brotli when installed) into movie_app/static/dist.
+
+Templates pick the build up through asset_url(); run this before starting the
+server in production and again after changing anything under static/.
+"""
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from movie_app.services import assets
+
+STATIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "movie_app", "static")
+
+
+def build_assets():
+    manifest = assets.build(STATIC)
+    print(f"✓ Built {len(manifest['files'])} assets into {os.path.join(STATIC, 'dist')}")
+    for name, entry in sorted(manifest["files"].items()):
+        encodings = ", ".join(entry["encodings"]) or "uncompressed"
+        print(f"  {name} -> {entry['path']} ({entry['size']} bytes; {encodings})")
+
+
+if __name__ == "__main__":
+    build_assets()
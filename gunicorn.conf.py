@@ -0,0 +1,58 @@
+"""
+Gunicorn serving profile for production.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Threaded (gthread) workers, so a request waiting on TMDB holds one thread
+rather than a whole worker. Worker and thread counts come from the CPU count
+(see Config.WEB_CONCURRENCY / WEB_THREADS) and can be overridden with the
+WEB_CONCURRENCY and WEB_THREADS environment variables. The app is loaded once
+in the master (preload_app) and forked; each worker then drops the inherited
+database connections and TMDB session so no socket is shared across processes.
+"""
+import os
+
+# Serving through gunicorn means production settings unless FLASK_ENV says otherwise
+os.environ.setdefault("FLASK_ENV", "production")
+# Several workers: each writes metrics snapshots for /metrics to sum
+os.environ.setdefault("METRICS_MULTIPROCESS", "1")
+
+from movie_app.config import Config  # noqa: E402
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = "gthread"
+workers = Config.WEB_CONCURRENCY
+threads = Config.WEB_THREADS
+preload_app = True
+
+# TMDB calls time out after TMDB_TIMEOUT (with retries), well inside the worker timeout
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth of the in-process caches
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    from movie_app.extensions import db
+    from movie_app.services import tmdb
+
+    app = server.app.wsgi()
+    with app.app_context():
+        # Forget the master's pooled connections without closing them under the master
+        db.engine.dispose(close=False)
+    tmdb.client.close()
+
+
+def worker_exit(server, worker):
+    from movie_app.services.metrics import metrics
+
+    # Keep the counts recorded since the worker's last periodic snapshot
+    with server.app.wsgi().app_context():
+        metrics.flush()
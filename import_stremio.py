@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Import the movies from a Stremio library export (e.g. stremioExport.json).
+
+The export is parsed incrementally; IMDb ids are resolved through TMDB's /find
+endpoint concurrently behind a rate limiter, and new movies are committed in chunks.
+Every entry is reported as added, exists, skipped or failed.
+"""
+import argparse
+import json
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from movie_app import create_app
+from movie_app.models.user import User
+from movie_app.services.stremio import import_stremio_library
+
+
+def _print_item(item):
+    detail = item.get("reason") or item.get("title") or ""
+    print(f"  {item['status']:<8} {item['imdb_id']:<12} {item['name']}" + (f" — {detail}" if detail else ""))
+
+
+def import_stremio(path, rate=20.0, workers=8, chunk_size=50, include_removed=False, username=None, report=None):
+    app = create_app()
+    with app.app_context():
+        added_by = None
+        if username:
+            user = User.query.filter_by(username=username).first()
+            if not user:
+                print(f"✗ Unknown user {username!r}")
+                return
+            added_by = user.id
+
+        print(f"Importing Stremio library from {path}...")
+        with open(path, "rb") as fp:
+            result = import_stremio_library(
+                fp,
+                rate=rate,
+                workers=workers,
+                chunk_size=chunk_size,
+                include_removed=include_removed,
+                added_by=added_by,
+                report=_print_item,
+            )
+
+        s = result["summary"]
+        print(f"\n✓ {s['added']} added, {s['exists']} already in library, "
+              f"{s['skipped']} skipped, {s['failed']} failed ({s['total']} entries)")
+        if report:
+            with open(report, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+            print(f"Report written to {report}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import movies from a Stremio library export")
+    parser.add_argument("path", nargs="?", default="stremioExport.json", help="Stremio export file")
+    parser.add_argument("--rate", type=float, default=20.0, help="max TMDB requests per second")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent TMDB requests")
+    parser.add_argument("--chunk-size", type=int, default=50, help="entries per commit")
+    parser.add_argument("--include-removed", action="store_true", help="also import items removed in Stremio")
+    parser.add_argument("--user", help="username recorded as the adder of imported movies")
+    parser.add_argument("--report", help="write the per-item JSON report to this file")
+    args = parser.parse_args()
+    import_stremio(args.path, args.rate, args.workers, args.chunk_size, args.include_removed, args.user, args.report)
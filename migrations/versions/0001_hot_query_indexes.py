@@ -0,0 +1,56 @@
+"""Secondary indexes for the library's hot queries
+
+The tables themselves predate migrations and are still created by
+db.create_all() at startup, which also creates these indexes for new tables.
+This revision adds whichever ones are missing from databases created earlier
+(CREATE INDEX IF NOT EXISTS), so it is safe to run on any existing database
+and can be rendered offline with `flask db upgrade --sql`.
+
+Downgrading is a no-op: the models' __table_args__ own these indexes, so
+dropping them would remove indexes this revision may never have created, and
+the next db.create_all() would put them back anyway.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # name, table, columns
+    ("ix_movies_added_at_id", "movies", ["added_at", "id"]),  # default sort and keyset paging
+    ("ix_movies_year", "movies", ["year"]),  # year range filter
+    ("ix_movie_genres_name_movie_id", "movie_genres", ["name", "movie_id"]),  # genre filter
+    ("ix_movie_tags_tag_id_movie_id", "movie_tags", ["tag_id", "movie_id"]),  # tag filter
+    ("ix_reviews_user_id_movie_id", "reviews", ["user_id", "movie_id"]),  # unrated filter
+    ("ix_reviews_movie_id_rating", "reviews", ["movie_id", "rating"]),  # min_rating filter, card ratings
+]
+
+
+def _tables():
+    """Existing tables, or None in offline (--sql) mode, where the tables are assumed to exist."""
+    if op.get_context().as_sql:
+        return None
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    tables = _tables()
+    for name, table, columns in INDEXES:
+        if tables is None or table in tables:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    # Intentionally empty, see the module docstring
+    pass
@@ -3,17 +3,43 @@ from .config import get_config
 from .extensions import db, login_manager, csrf, migrate
 from .routes.auth import auth_bp
 from .routes.movies import movies_bp
+from .routes.metrics import metrics_bp
+from .routes.images import images_bp
+from .routes.assets import assets_bp
 from .models.user import User
-from .models.movie import Movie
+from .models.movie import Movie, MovieGenre
 from .models.review import Review
 from .models.tag import Tag, MovieTag
-from .services.cache import init_requests_cache
+from .models.stats import LibraryCounter
+from .services.cache import init_http_cache
+from .services import tmdb, counters
+from .services.search_index import search_index
+from .services.tag_catalog import tag_catalog
+from .services.library_version import library_version
+from .services.response_cache import response_cache
+from .services.identity import identity_cache
+from .services.request_timing import request_timing
+from .services.metrics import metrics
+from .services.posters import poster_cache
+from .services.assets import assets
 
 
-def create_app():
+def create_app(config_overrides=None):
     app = Flask(__name__, template_folder="templates", static_folder="static")
     app.config.from_object(get_config())
-    init_requests_cache()
+    if config_overrides:
+        # Used by tests and scripts, e.g. to point at a throwaway database
+        app.config.update(config_overrides)
+    init_http_cache(app)
+    tmdb.init_app(app)
+    tag_catalog.init_app(app)
+    library_version.init_app(app)
+    response_cache.init_app(app)
+    identity_cache.init_app(app)
+    request_timing.init_app(app)
+    metrics.init_app(app)
+    poster_cache.init_app(app)
+    assets.init_app(app)
 
     # Init extensions
     db.init_app(app)
@@ -27,19 +53,28 @@ def create_app():
 
     @login_manager.user_loader
     def load_user(user_id):
+        # Served from a per-process identity cache rather than a users query per request
         try:
-            return User.query.get(int(user_id))
+            return identity_cache.load(user_id)
         except Exception:
             return None
 
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(movies_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(images_bp)
+    app.register_blueprint(assets_bp)
 
-    # Create tables and seed users on first run (simplified, no migrations required initially)
+    # Create tables and seed users on first run. Indexes added to existing
+    # tables are applied by migrations (flask db upgrade), not here.
     with app.app_context():
         db.create_all()
         _seed_users(app)
+        _sync_movie_genres()
+        search_index.ensure_ready()
+        counters.ensure_ready()
+        library_version.ensure_ready()
 
     return app
 
@@ -63,3 +98,28 @@ def _seed_users(app: Flask):
         db.session.commit()
     except Exception:
         db.session.rollback()
+
+
+def _sync_movie_genres():
+    """
+    Populate movie_genres for movies added before the normalized table existed.
+    Only movies without any genre rows are loaded, so this is cheap once synced.
+    """
+    from sqlalchemy.orm import load_only
+
+    missing = (
+        Movie.query.options(load_only(Movie.id, Movie.genres))
+        .filter(~Movie.genre_links.any())
+        .all()
+    )
+    changed = False
+    for movie in missing:
+        if movie.genres:
+            movie.set_genres(movie.genres)
+            changed = True
+    if not changed:
+        return
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
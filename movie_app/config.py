@@ -53,6 +53,16 @@ def _normalize_db_url(url: str) -> str:
     return url
 
 
+def _default_web_workers() -> int:
+    # One gthread worker per core plus one, capped so database connections stay bounded
+    return max(2, min((os.cpu_count() or 1) + 1, 8))
+
+
+def _default_web_threads() -> int:
+    # Request threads mostly wait on TMDB and the database, so oversubscribe the cores
+    return max(4, min(2 * (os.cpu_count() or 1), 8))
+
+
 class Config:
     # Load .env if present
     load_dotenv()
@@ -73,6 +83,85 @@ class Config:
     TMDB_API_KEY = os.getenv("TMDB_API_KEY", _fallback.get("TMDB_API_KEY", ""))
     TMDB_BEARER_TOKEN = os.getenv("TMDB_BEARER_TOKEN", _fallback.get("TMDB_BEARER_TOKEN", ""))
 
+    # TMDB HTTP client: pooled keep-alive session with retries on 429/5xx
+    TMDB_API_BASE = os.getenv("TMDB_API_BASE", "https://api.themoviedb.org/3")
+    TMDB_TIMEOUT = float(os.getenv("TMDB_TIMEOUT", "10"))
+    TMDB_POOL_SIZE = int(os.getenv("TMDB_POOL_SIZE", "10"))
+    TMDB_MAX_RETRIES = int(os.getenv("TMDB_MAX_RETRIES", "2"))
+    TMDB_RETRY_BACKOFF = float(os.getenv("TMDB_RETRY_BACKOFF", "0.3"))
+    # Worker threads for independent TMDB calls (e.g. director-search credits fan-out)
+    TMDB_MAX_WORKERS = int(os.getenv("TMDB_MAX_WORKERS", "8"))
+    # Max TMDB requests per second for bulk jobs (Stremio import, batch add)
+    TMDB_BULK_RATE = float(os.getenv("TMDB_BULK_RATE", "20"))
+    # Export entries handled per /api/import/stremio request, so each stays within the worker timeout
+    STREMIO_IMPORT_BATCH = int(os.getenv("STREMIO_IMPORT_BATCH", "200"))
+    # In-process memo of search/details results (entries per lookup type, seconds)
+    TMDB_MEMO_SIZE = int(os.getenv("TMDB_MEMO_SIZE", "512"))
+    TMDB_MEMO_TTL = float(os.getenv("TMDB_MEMO_TTL", "3600"))
+
+    # Offline TMDB: live (default), record (also save answers to TMDB_FIXTURES_PATH) or
+    # replay (answer only from TMDB_FIXTURES_PATH, with optional latency/error injection)
+    TMDB_MODE = os.getenv("TMDB_MODE", "live")
+    TMDB_FIXTURES_PATH = os.getenv("TMDB_FIXTURES_PATH")
+    TMDB_REPLAY_LATENCY = float(os.getenv("TMDB_REPLAY_LATENCY", "0"))
+    TMDB_REPLAY_JITTER = float(os.getenv("TMDB_REPLAY_JITTER", "0"))
+    TMDB_REPLAY_ERROR_RATE = float(os.getenv("TMDB_REPLAY_ERROR_RATE", "0"))
+    TMDB_REPLAY_SEED = int(os.environ["TMDB_REPLAY_SEED"]) if os.getenv("TMDB_REPLAY_SEED") else None
+
+    # HTTP cache for TMDB responses: sqlite (WAL), filesystem, memory or none.
+    # The path defaults to the instance folder; expiry is in seconds per endpoint type.
+    HTTP_CACHE_BACKEND = os.getenv("HTTP_CACHE_BACKEND", "sqlite")
+    HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH")
+    HTTP_CACHE_EXPIRE_DEFAULT = int(os.getenv("HTTP_CACHE_EXPIRE_DEFAULT", str(24 * 3600)))
+    HTTP_CACHE_EXPIRE_DETAILS = int(os.getenv("HTTP_CACHE_EXPIRE_DETAILS", str(7 * 24 * 3600)))
+    HTTP_CACHE_EXPIRE_SEARCH = int(os.getenv("HTTP_CACHE_EXPIRE_SEARCH", str(6 * 3600)))
+    HTTP_CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "5000"))
+    HTTP_CACHE_PRUNE_INTERVAL = int(os.getenv("HTTP_CACHE_PRUNE_INTERVAL", "3600"))
+
+    # Seconds before the in-memory tag catalog reloads, to pick up tags created by other workers
+    TAG_CATALOG_TTL = float(os.getenv("TAG_CATALOG_TTL", "300"))
+
+    # Cache of library read payloads, keyed by library version: memory (per worker),
+    # filesystem (shared by all workers on the host) or none
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH")  # default: instance/response_cache
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "600"))
+
+    # Seconds the logged-in user's identity is cached per worker (user changes in other processes apply after this)
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))
+
+    # Server-Timing header and a structured log line per request (SQL, TMDB, cache hits).
+    # Off by default; when off no hooks are installed at all.
+    REQUEST_TIMING_ENABLED = os.getenv("REQUEST_TIMING_ENABLED", "0").lower() in ("1", "true", "yes", "on")
+
+    # Prometheus metrics at /metrics (admin only). With METRICS_MULTIPROCESS (set by
+    # gunicorn.conf.py) each worker writes a snapshot to METRICS_DIR (default: next
+    # to the SQLite database, or the instance folder) at most every
+    # METRICS_FLUSH_INTERVAL seconds and /metrics sums them; otherwise nothing is written.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() in ("1", "true", "yes", "on")
+    METRICS_MULTIPROCESS = os.getenv("METRICS_MULTIPROCESS", "0").lower() in ("1", "true", "yes", "on")
+    METRICS_DIR = os.getenv("METRICS_DIR")
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+    # Poster proxy at /img/<size>/<path>: payloads link to it instead of TMDB's CDN, and
+    # each image is fetched once into POSTER_CACHE_DIR (default: instance/posters),
+    # least recently used images going first past POSTER_CACHE_MAX_BYTES.
+    # POSTER_PREWARM fetches the posters of newly added movies in the background.
+    POSTER_PROXY_ENABLED = os.getenv("POSTER_PROXY_ENABLED", "1").lower() in ("1", "true", "yes", "on")
+    POSTER_CACHE_DIR = os.getenv("POSTER_CACHE_DIR")
+    POSTER_CACHE_MAX_BYTES = int(os.getenv("POSTER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    POSTER_PREWARM = os.getenv("POSTER_PREWARM", "0").lower() in ("1", "true", "yes", "on")
+
+    # Static assets built by build_assets.py (minified, content-hashed, gzip/brotli) are
+    # served from /assets with immutable caching; without a fresh build, from /static.
+    ASSETS_ENABLED = os.getenv("ASSETS_ENABLED", "1").lower() in ("1", "true", "yes", "on")
+    ASSETS_DIR = os.getenv("ASSETS_DIR")  # default: movie_app/static/dist
+
+    # Gunicorn serving profile (gunicorn.conf.py): worker processes x threads per worker
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", str(_default_web_workers())))
+    WEB_THREADS = int(os.getenv("WEB_THREADS", str(_default_web_threads())))
+
     # Auth/admin simplification
     ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "Alex")
 
@@ -89,6 +178,17 @@ class ProductionConfig(Config):
     DEBUG = False
     ENV = "production"
 
+    # Per worker: one connection per request thread plus a little overflow for
+    # scripts and background work. Connections are pinged before use and
+    # recycled before the server's idle timeout drops them.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": Config.WEB_THREADS,
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "2")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+
 
 def get_config():
     env = os.getenv("FLASK_ENV", "development").lower()
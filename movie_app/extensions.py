@@ -6,4 +6,5 @@ from flask_migrate import Migrate
 db = SQLAlchemy()
 login_manager = LoginManager()
 csrf = CSRFProtect()
-migrate = Migrate()
+# Batch mode lets migrations alter SQLite tables (copy and move)
+migrate = Migrate(render_as_batch=True)
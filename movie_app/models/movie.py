@@ -23,6 +23,48 @@ class Movie(db.Model):
     # Relationships
     reviews = db.relationship("Review", back_populates="movie", cascade="all, delete-orphan")
     tags = db.relationship("MovieTag", back_populates="movie", cascade="all, delete-orphan")
+    genre_links = db.relationship("MovieGenre", back_populates="movie", cascade="all, delete-orphan")
+
+    # (added_at, id) serves the default listing order for both OFFSET and keyset paging;
+    # year serves the year range filter and facet
+    __table_args__ = (
+        db.Index("ix_movies_added_at_id", "added_at", "id"),
+        db.Index("ix_movies_year", "year"),
+    )
+
+    def set_genres(self, genres):
+        """
+        Set the genres JSON column and keep the normalized movie_genres rows in sync.
+        The JSON column stays the source for payloads; movie_genres serves SQL filtering.
+        """
+        self.genres = list(genres or [])
+        wanted = []
+        for g in self.genres:
+            if isinstance(g, str) and g.strip() and g.strip() not in wanted:
+                wanted.append(g.strip())
+        # Diff instead of replacing the collection so unchanged rows are not deleted and re-inserted
+        for link in list(self.genre_links):
+            if link.name not in wanted:
+                self.genre_links.remove(link)
+        present = {link.name for link in self.genre_links}
+        for name in wanted:
+            if name not in present:
+                self.genre_links.append(MovieGenre(name=name))
 
     def __repr__(self):
         return f"<Movie {self.title} ({self.year})>"
+
+
+class MovieGenre(db.Model):
+    __tablename__ = "movie_genres"
+
+    movie_id = db.Column(db.Integer, db.ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    name = db.Column(db.String(100), primary_key=True)
+
+    movie = db.relationship("Movie", back_populates="genre_links")
+
+    # Genre filters look up movie ids by name
+    __table_args__ = (db.Index("ix_movie_genres_name_movie_id", "name", "movie_id"),)
+
+    def __repr__(self):
+        return f"<MovieGenre movie_id={self.movie_id} name={self.name}>"
@@ -17,7 +17,13 @@ class Review(db.Model):
     movie = db.relationship("Movie", back_populates="reviews")
     user = db.relationship("User", back_populates="reviews")
 
-    __table_args__ = (db.UniqueConstraint("movie_id", "user_id", name="uq_review_movie_user"),)
+    # (user_id, movie_id) serves the unrated filter and per-user counts;
+    # (movie_id, rating) covers the min_rating filter, rating facets and card ratings
+    __table_args__ = (
+        db.UniqueConstraint("movie_id", "user_id", name="uq_review_movie_user"),
+        db.Index("ix_reviews_user_id_movie_id", "user_id", "movie_id"),
+        db.Index("ix_reviews_movie_id_rating", "movie_id", "rating"),
+    )
 
     def __repr__(self):
         return f"<Review movie_id={self.movie_id} user_id={self.user_id} rating={self.rating}>"
@@ -0,0 +1,20 @@
+from datetime import datetime
+from . import db
+
+
+class LibraryCounter(db.Model):
+    """
+    Denormalized library statistics, one row per counter:
+      - "movies": movies in the library
+      - "reviews:user:<id>": movies reviewed by that user
+      - "library_version": bumped on every library write, for cache keys
+    Maintained by the write routes via services.counters; rebuilt by reconcile_stats.py.
+    """
+    __tablename__ = "library_counters"
+
+    key = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<LibraryCounter {self.key}={self.value}>"
@@ -24,6 +24,9 @@ PREDEFINED_TAGS = [
     {"name": "Thriller", "color": "#f0f9f0"},
 ]
 
+PREDEFINED_TAG_COLORS = {t["name"]: t["color"] for t in PREDEFINED_TAGS}
+DEFAULT_TAG_COLOR = "#e9ecef"
+
 
 def generate_unique_slug(name):
     from . import db
@@ -58,8 +61,7 @@ class Tag(db.Model):
     def get_color(self):
         if self.color:
             return self.color
-        predefined = next((t for t in PREDEFINED_TAGS if t["name"] == self.name), None)
-        return predefined["color"] if predefined else "#e9ecef"
+        return PREDEFINED_TAG_COLORS.get(self.name, DEFAULT_TAG_COLOR)
 
     def __repr__(self):
         return f"<Tag {self.name}>"
@@ -76,5 +78,8 @@ class MovieTag(db.Model):
     movie = db.relationship("Movie", back_populates="tags")
     tag = db.relationship("Tag", back_populates="movies")
 
+    # The primary key leads with movie_id; tag filters and facets look up movies by tag
+    __table_args__ = (db.Index("ix_movie_tags_tag_id_movie_id", "tag_id", "movie_id"),)
+
     def __repr__(self):
         return f"<MovieTag movie_id={self.movie_id} tag_id={self.tag_id}>"
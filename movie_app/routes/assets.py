@@ -0,0 +1,28 @@
+from flask import Blueprint, abort, request, send_from_directory
+
+from ..services.assets import ENCODINGS, assets
+
+assets_bp = Blueprint("assets", __name__)
+
+# Built asset names carry their content hash, so a URL's content never changes
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+@assets_bp.get("/assets/<path:filename>")
+def asset(filename: str):
+    """A fingerprinted build output (see build_assets.py), precompressed when the client accepts it."""
+    entry = assets.built(filename)
+    if entry is None:
+        abort(404)
+    served, encoding = filename, None
+    for name, suffix in ENCODINGS:
+        if name in entry["encodings"] and request.accept_encodings[name] > 0:
+            served, encoding = filename + suffix, name
+            break
+    response = send_from_directory(assets.path, served, mimetype=assets.content_type(filename), conditional=True,
+                                   max_age=31536000)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = IMMUTABLE
+    return response
@@ -0,0 +1,33 @@
+import logging
+
+import requests
+from flask import Blueprint, Response, abort, send_file
+from flask_login import login_required
+
+from ..services.posters import PosterNotFound, poster_cache
+
+logger = logging.getLogger(__name__)
+
+images_bp = Blueprint("images", __name__)
+
+# Poster URLs never change content (TMDB gives new images new paths). Private:
+# only signed-in users may use the proxy, so shared caches must not answer for it
+IMMUTABLE = "private, max-age=31536000, immutable"
+
+
+@images_bp.get("/img/<size>/<path:filename>")
+@login_required
+def poster(size: str, filename: str):
+    """A TMDB poster from the local disk cache, fetched from TMDB on first use."""
+    try:
+        path, content_type, digest = poster_cache.get(size, f"/{filename}")
+    except PosterNotFound:
+        abort(404)
+    except (requests.RequestException, OSError) as exc:
+        logger.warning("Poster fetch failed for %s/%s: %s", size, filename, exc)
+        return Response("Poster unavailable\n", status=502, mimetype="text/plain",
+                        headers={"Cache-Control": "no-store"})
+    # conditional=True answers If-None-Match / If-Modified-Since with 304
+    response = send_file(path, mimetype=content_type, etag=digest, conditional=True, max_age=31536000)
+    response.headers["Cache-Control"] = IMMUTABLE
+    return response
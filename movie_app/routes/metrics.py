@@ -0,0 +1,32 @@
+from flask import Blueprint, Response, current_app, request
+from flask_login import current_user
+
+from ..models.user import User
+from ..services.metrics import metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def _is_admin_request() -> bool:
+    """The logged-in admin, or HTTP Basic auth with the admin's credentials (for scrapers)."""
+    if current_user.is_authenticated:
+        return bool(current_user.is_admin)
+    auth = request.authorization
+    admin = current_app.config.get("ADMIN_USERNAME", "Alex")
+    if not auth or auth.type != "basic" or auth.username != admin:
+        return False
+    user = User.query.filter_by(username=admin).first()
+    return bool(user and user.check_password(auth.password or ""))
+
+
+@metrics_bp.get("/metrics")
+def prometheus_metrics():
+    """Prometheus text format: request latency histograms, TMDB, cache and DB pool metrics."""
+    if not metrics.enabled:
+        return Response("Metrics are disabled\n", status=404, mimetype="text/plain")
+    if not _is_admin_request():
+        if current_user.is_authenticated:
+            return Response("Forbidden\n", status=403, mimetype="text/plain")
+        return Response("Authentication required\n", status=401, mimetype="text/plain",
+                        headers={"WWW-Authenticate": 'Basic realm="metrics"'})
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
@@ -1,12 +1,22 @@
-from typing import List, Dict, Any
-import re
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+import base64
+import json
 from flask import Blueprint, jsonify, request, render_template, redirect, url_for
 from flask_login import login_required, current_user
+from sqlalchemy.orm import load_only
 from ..extensions import db, csrf
-from ..models.movie import Movie
+from ..models.movie import Movie, MovieGenre
 from ..models.review import Review
-from ..models.tag import Tag, MovieTag, generate_unique_slug, PREDEFINED_TAGS
-from ..services import tmdb
+from ..models.user import User
+from ..models.tag import Tag, MovieTag, generate_unique_slug, PREDEFINED_TAGS, PREDEFINED_TAG_COLORS, DEFAULT_TAG_COLOR
+from ..services import tmdb, counters, library
+from ..services.search_index import search_index
+from ..services.tag_catalog import tag_catalog
+from ..services.response_cache import response_cache
+from ..services.posters import poster_cache
+from ..services.library_version import library_version, library_etag
+from ..services.stremio import import_stremio_library
 from flask import current_app
 
 movies_bp = Blueprint("movies", __name__)
@@ -18,46 +28,33 @@ def dashboard():
     return render_template("dashboard.html")
 
 
-@movies_bp.get("/api/movies")
-@login_required
-def list_movies():
+def _parse_movie_filters(args) -> Dict[str, Any]:
     """
-    Movie listing with filtering support for genre, year, tags, and ratings.
+    Parse the library filter query params shared by the listing endpoints.
+    Invalid values are ignored rather than rejected, matching the UI's lenient URLs.
     """
-    try:
-        page = int(request.args.get("page", 1))
-    except Exception:
-        page = 1
-    try:
-        per_page = int(request.args.get("per_page", 20))
-    except Exception:
-        per_page = 20
-    per_page = max(1, min(50, per_page))
+    genre_filter = args.get("genre")
+    year_from = args.get("year_from")
+    year_to = args.get("year_to")
+    tag_filter = args.get("tags")
+    min_rating = args.get("min_rating")
+    unrated_only = (args.get("unrated") or "").lower() in ("1", "true", "yes", "on")
 
-    # Get filter parameters
-    genre_filter = request.args.get("genre")
-    year_from = request.args.get("year_from")
-    year_to = request.args.get("year_to")
-    tag_filter = request.args.get("tags")
-    min_rating = request.args.get("min_rating")
-    unrated_only = (request.args.get("unrated") or "").lower() in ("1", "true", "yes", "on")
-    
-    # Parse filters
     genres = []
     if genre_filter:
         genres = [g.strip() for g in genre_filter.split(",") if g.strip()]
-    
+
     tag_names = []
     if tag_filter:
         tag_names = [t.strip() for t in tag_filter.split(",") if t.strip()]
-    
+
     min_rating_val = None
     if min_rating:
         try:
             min_rating_val = float(min_rating)
         except ValueError:
             pass
-    
+
     year_from_val = None
     year_to_val = None
     if year_from:
@@ -71,87 +68,224 @@ def list_movies():
         except ValueError:
             pass
 
-    # Start with base query - no complex JSON filtering in database
-    query = Movie.query.order_by(Movie.added_at.desc())
-    
-    # Apply non-JSON filters first
-    if year_from_val:
-        query = query.filter(Movie.year >= year_from_val)
-    if year_to_val:
-        query = query.filter(Movie.year <= year_to_val)
-    
-    # Handle tag and rating filtering with subqueries to avoid DISTINCT issues with JSON columns
-    if tag_names:
-        from ..models.tag import Tag, MovieTag
-        # Use subquery to get movie IDs that have the required tags
-        tag_movie_ids = db.session.query(MovieTag.movie_id).join(Tag).filter(Tag.name.in_(tag_names)).subquery()
-        query = query.filter(Movie.id.in_(db.session.query(tag_movie_ids.c.movie_id)))
-    
-    if min_rating_val is not None:
-        # Use subquery to get movie IDs that have ratings >= min_rating
-        rating_movie_ids = db.session.query(Review.movie_id).filter(Review.rating >= min_rating_val).subquery()
-        query = query.filter(Movie.id.in_(db.session.query(rating_movie_ids.c.movie_id)))
+    return {
+        "genres": genres,
+        "year_from": year_from_val,
+        "year_to": year_to_val,
+        "tags": tag_names,
+        "min_rating": min_rating_val,
+        "unrated": unrated_only,
+    }
+
+
+def _filters_key(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Filters for a cache key: list filters are matched as sets, so their order must not matter."""
+    return {**filters, "genres": sorted(filters["genres"]), "tags": sorted(filters["tags"])}
+
+
+def _filtered_movie_query(filters: Dict[str, Any]):
+    """
+    Build an unordered Movie query with every filter applied in SQL.
+    Multi-valued filters use IN subqueries so the outer query never needs DISTINCT.
+    """
+    query = Movie.query
+
+    if filters.get("year_from"):
+        query = query.filter(Movie.year >= filters["year_from"])
+    if filters.get("year_to"):
+        query = query.filter(Movie.year <= filters["year_to"])
+
+    if filters.get("genres"):
+        # Movie matches if it has any of the requested genres
+        genre_movie_ids = db.session.query(MovieGenre.movie_id).filter(MovieGenre.name.in_(filters["genres"]))
+        query = query.filter(Movie.id.in_(genre_movie_ids))
+
+    if filters.get("tags"):
+        tag_movie_ids = db.session.query(MovieTag.movie_id).join(Tag).filter(Tag.name.in_(filters["tags"]))
+        query = query.filter(Movie.id.in_(tag_movie_ids))
 
-    if unrated_only:
+    if filters.get("min_rating") is not None:
+        rating_movie_ids = db.session.query(Review.movie_id).filter(Review.rating >= filters["min_rating"])
+        query = query.filter(Movie.id.in_(rating_movie_ids))
+
+    if filters.get("unrated"):
         # Exclude movies that current user has rated
-        rated_ids_sq = db.session.query(Review.movie_id).filter(Review.user_id == current_user.id).subquery()
-        query = query.filter(~Movie.id.in_(db.session.query(rated_ids_sq.c.movie_id)))
+        rated_ids = db.session.query(Review.movie_id).filter(Review.user_id == current_user.id)
+        query = query.filter(~Movie.id.in_(rated_ids))
+
+    return query
 
-    # Get all matching movies (we'll do genre filtering in Python)
-    all_movies = query.all()
-    
-    # Apply genre filtering in Python (more reliable than JSON database queries)
-    if genres:
-        filtered_movies = []
-        for movie in all_movies:
-            movie_genres = movie.genres or []
-            # Check if movie has any of the requested genres
-            if any(genre in movie_genres for genre in genres):
-                filtered_movies.append(movie)
-        all_movies = filtered_movies
-    
-    # Manual pagination
-    total = len(all_movies)
-    total_pages = (total + per_page - 1) // per_page  # Ceiling division
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    paginated_movies = all_movies[start_idx:end_idx]
-    
-    # Build response items
-    items = []
-    for m in paginated_movies:
-        poster_url = f"{tmdb.IMAGE_BASE}/w185{m.poster_path}" if m.poster_path else None
-        
-        # Get all ratings for this movie
-        ratings = db.session.query(Review.rating, Review.user_id).join(Review.user).filter(Review.movie_id == m.id).all()
-        user_ratings = {}
-        for rating, user_id in ratings:
-            from ..models.user import User
-            user = User.query.get(user_id)
-            if user and rating:
-                user_ratings[user.username] = float(rating)
-        
-        items.append(
-            {
-                "id": m.id,
-                "tmdb_id": m.tmdb_id,
-                "title": m.title,
-                "year": m.year,
-                "poster_url": poster_url,
-                "genres": m.genres or [],
-                "ratings": user_ratings,
-            }
-        )
 
-    return jsonify(
-        {
-            "items": items,
-            "page": page,
+def _ratings_for_movies(movie_ids: List[int]) -> Dict[int, Dict[str, float]]:
+    """
+    Return movie_id -> {username: rating} for the given movies in a single joined query.
+    Unset (and zero) ratings are left out, as the cards only show actual ratings.
+    """
+    if not movie_ids:
+        return {}
+    rows = (
+        db.session.query(Review.movie_id, User.username, Review.rating)
+        .join(User, User.id == Review.user_id)
+        .filter(Review.movie_id.in_(movie_ids))
+        .all()
+    )
+    out: Dict[int, Dict[str, float]] = {}
+    for movie_id, username, rating in rows:
+        if rating:
+            out.setdefault(movie_id, {})[username] = float(rating)
+    return out
+
+
+def _tags_for_movies(movie_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Return movie_id -> tags (with color and the adder's username) in a single joined query.
+    Tags are listed in the order they were added to each movie.
+    """
+    if not movie_ids:
+        return {}
+    rows = (
+        db.session.query(MovieTag.movie_id, Tag, User.username)
+        .join(Tag, Tag.id == MovieTag.tag_id)
+        .outerjoin(User, User.id == MovieTag.added_by)
+        .filter(MovieTag.movie_id.in_(movie_ids))
+        .order_by(MovieTag.movie_id, MovieTag.added_at, Tag.id)
+        .all()
+    )
+    out: Dict[int, List[Dict[str, Any]]] = {}
+    for movie_id, tag, username in rows:
+        out.setdefault(movie_id, []).append({
+            "id": tag.id,
+            "name": tag.name,
+            "color": tag.get_color(),
+            "added_by": username,
+        })
+    return out
+
+
+@movies_bp.get("/api/movies")
+@login_required
+@library_etag
+def list_movies():
+    """
+    Movie listing with filtering support for genre, year, tags, and ratings.
+    Filtering, counting and paging all run in the database.
+    """
+    try:
+        page = int(request.args.get("page", 1))
+    except Exception:
+        page = 1
+    try:
+        per_page = int(request.args.get("per_page", 20))
+    except Exception:
+        per_page = 20
+    per_page = max(1, min(50, per_page))
+
+    filters = _parse_movie_filters(request.args)
+    include = {part.strip() for part in (request.args.get("include") or "").split(",") if part.strip()}
+    include_tags = "tags" in include
+
+    # Only load the columns the card payload needs (skips overview text)
+    query = _filtered_movie_query(filters).options(
+        load_only(Movie.id, Movie.tmdb_id, Movie.title, Movie.year, Movie.poster_path, Movie.genres, Movie.added_at)
+    )
+
+    cursor = request.args.get("cursor")
+    # The payload depends only on these (plus the user for unrated-only), so equal requests share an entry
+    cache_key = response_cache.make_key({
+        "endpoint": "list_movies",
+        "filters": _filters_key(filters),
+        "page": page if cursor is None else None,
+        "cursor": cursor,
+        "per_page": per_page,
+        "include_tags": include_tags,
+        "user": current_user.id if filters["unrated"] else None,
+    })
+    version = library_version.current()
+    cached = response_cache.get(version, cache_key)
+    if cached is not None:
+        return _cache_response(cached, hit=True)
+
+    if cursor is not None:
+        # Keyset mode: seek past the last (added_at, id) seen instead of counting an OFFSET.
+        # An empty cursor starts from the newest movie.
+        if cursor:
+            position = _decode_cursor(cursor)
+            if not position:
+                return jsonify({"ok": False, "error": "Invalid cursor"}), 400
+            query = query.filter(db.tuple_(Movie.added_at, Movie.id) < position)
+        rows = query.order_by(Movie.added_at.desc(), Movie.id.desc()).limit(per_page + 1).all()
+        page_movies = rows[:per_page]
+        next_cursor = None
+        if len(rows) > per_page and page_movies[-1].added_at is not None:
+            next_cursor = _encode_cursor(page_movies[-1])
+        payload = {
+            "items": _movie_list_items(page_movies, include_tags=include_tags),
             "per_page": per_page,
-            "total": total,
-            "total_pages": max(1, total_pages),
+            "next_cursor": next_cursor,
         }
+        response_cache.set(version, cache_key, payload)
+        return _cache_response(payload, hit=False)
+
+    # COUNT(*) for the total, LIMIT/OFFSET for the page
+    pagination = query.order_by(Movie.added_at.desc(), Movie.id.desc()).paginate(
+        page=page, per_page=per_page, error_out=False
     )
+    total = pagination.total or 0
+    total_pages = pagination.pages
+
+    payload = {
+        "items": _movie_list_items(pagination.items, include_tags=include_tags),
+        "page": pagination.page,
+        "per_page": per_page,
+        "total": total,
+        "total_pages": max(1, total_pages),
+    }
+    response_cache.set(version, cache_key, payload)
+    return _cache_response(payload, hit=False)
+
+
+def _cache_response(payload: Dict[str, Any], hit: bool):
+    response = jsonify(payload)
+    response.headers["X-Cache"] = "HIT" if hit else "MISS"
+    return response
+
+
+def _movie_list_items(movies: List[Movie], include_tags: bool = False) -> List[Dict[str, Any]]:
+    """Serialize a page of movies for the library grid."""
+    movie_ids = [m.id for m in movies]
+    # Ratings (and optionally tags) for the whole page come from one query each
+    ratings_by_movie = _ratings_for_movies(movie_ids)
+    tags_by_movie = _tags_for_movies(movie_ids) if include_tags else {}
+    items = []
+    for m in movies:
+        item = {
+            "id": m.id,
+            "tmdb_id": m.tmdb_id,
+            "title": m.title,
+            "year": m.year,
+            "poster_url": poster_cache.url(m.poster_path, "w185"),
+            "genres": m.genres or [],
+            "ratings": ratings_by_movie.get(m.id, {}),
+        }
+        if include_tags:
+            item["tags"] = tags_by_movie.get(m.id, [])
+        items.append(item)
+    return items
+
+
+def _encode_cursor(movie: Movie) -> str:
+    """Opaque keyset cursor for the position just after `movie` in listing order."""
+    raw = json.dumps([movie.added_at.isoformat(), movie.id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        added_at, movie_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(added_at), int(movie_id)
+    except Exception:
+        return None
 
 
 @movies_bp.get("/api/movies/search")
@@ -189,31 +323,35 @@ def search_tmdb():
 
 def search_local_library(query: str):
     """
-    Search the local movie library using fuzzy text matching.
+    Search the local movie library using the full-text index (title, original
+    title, overview and tags), best matches first with prefix and typo tolerance.
     Returns results in the same format as TMDB search for consistency.
     """
     query = query.strip().lower()
     if not query:
         return jsonify({"results": []})
     
-    # Search movies by title (case-insensitive, partial matching)
-    movies = Movie.query.filter(
-        db.or_(
-            Movie.title.ilike(f'%{query}%'),
-            Movie.original_title.ilike(f'%{query}%')
-        )
-    ).order_by(Movie.added_at.desc()).limit(20).all()
+    ids = search_index.search(query, limit=20)
+    if ids is None:
+        # No full-text index on this backend: case-insensitive partial title match
+        movies = Movie.query.filter(
+            db.or_(
+                Movie.title.ilike(f'%{query}%'),
+                Movie.original_title.ilike(f'%{query}%')
+            )
+        ).order_by(Movie.added_at.desc()).limit(20).all()
+    else:
+        by_id = {m.id: m for m in Movie.query.filter(Movie.id.in_(ids)).all()} if ids else {}
+        movies = [by_id[i] for i in ids if i in by_id]
     
     results = []
     for movie in movies:
-        poster_url = f"{tmdb.IMAGE_BASE}/w185{movie.poster_path}" if movie.poster_path else None
-        
         results.append({
             "tmdb_id": movie.tmdb_id,
             "title": movie.title,
             "year": movie.year,
             "poster_path": movie.poster_path,
-            "poster_url": poster_url,
+            "poster_url": poster_cache.url(movie.poster_path, "w185"),
             "overview": movie.overview,
             "directors": [],  # Could be populated if needed
             "in_library": True  # Mark as already in library
@@ -240,21 +378,8 @@ def add_movie():
     if not md:
         return jsonify({"ok": False, "error": "Failed to fetch movie details"}), 502
 
-    movie = Movie(
-        tmdb_id=md.get("tmdb_id"),
-        title=md.get("title") or "",
-        original_title=md.get("original_title"),
-        year=md.get("year"),
-        poster_path=md.get("poster_path"),
-        backdrop_path=md.get("backdrop_path"),
-        overview=md.get("overview"),
-        runtime=md.get("runtime"),
-        tmdb_rating=md.get("tmdb_rating"),
-        genres=md.get("genres", []),
-        added_by=current_user.id if current_user.is_authenticated else None,
-    )
-    db.session.add(movie)
     try:
+        movie = library.add_movies([md], added_by=current_user.id if current_user.is_authenticated else None)[0]
         db.session.commit()
     except Exception:
         db.session.rollback()
@@ -263,6 +388,96 @@ def add_movie():
     return jsonify({"ok": True, "id": movie.id})
 
 
+@movies_bp.post("/api/movies/batch")
+@login_required
+@csrf.exempt
+def add_movies_batch():
+    """
+    Add several movies by TMDB id in one request.
+
+    Body: {"tmdb_ids": [...]} (max 100). Existing movies are found with one IN
+    query, missing details are fetched concurrently, and all new movies are
+    inserted in a single transaction. Returns {"ok", "results"} where results
+    maps each requested tmdb_id to {"status": "added" | "exists" | "failed", ...}.
+    """
+    data = request.get_json(silent=True) or {}
+    raw_ids = data.get("tmdb_ids")
+    if not isinstance(raw_ids, list) or not raw_ids:
+        return jsonify({"ok": False, "error": "tmdb_ids list required"}), 400
+    tmdb_ids: List[int] = []
+    for raw in raw_ids:
+        try:
+            tmdb_id = int(raw)
+        except (TypeError, ValueError):
+            return jsonify({"ok": False, "error": f"Invalid tmdb_id: {raw!r}"}), 400
+        if tmdb_id not in tmdb_ids:
+            tmdb_ids.append(tmdb_id)
+    if len(tmdb_ids) > 100:
+        return jsonify({"ok": False, "error": "At most 100 ids per request"}), 400
+
+    results: Dict[str, Dict[str, Any]] = {}
+    existing = library.existing_tmdb_ids(tmdb_ids)
+    for tmdb_id, movie_id in existing.items():
+        results[str(tmdb_id)] = {"status": "exists", "id": movie_id}
+
+    details = tmdb.movie_details_many([t for t in tmdb_ids if t not in existing])
+    to_add = [(tmdb_id, md) for tmdb_id, md in details.items() if md]
+    for tmdb_id, md in details.items():
+        if not md:
+            results[str(tmdb_id)] = {"status": "failed", "error": "Failed to fetch movie details"}
+
+    if to_add:
+        try:
+            movies = library.add_movies([md for _, md in to_add], added_by=current_user.id)
+            added = [(tmdb_id, movie.id) for (tmdb_id, _), movie in zip(to_add, movies)]
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            for tmdb_id, _ in to_add:
+                results[str(tmdb_id)] = {"status": "failed", "error": "DB error adding movie"}
+            return jsonify({"ok": False, "results": results}), 500
+        for tmdb_id, movie_id in added:
+            results[str(tmdb_id)] = {"status": "added", "id": movie_id}
+
+    return jsonify({"ok": True, "results": {str(t): results[str(t)] for t in tmdb_ids}})
+
+
+@movies_bp.post("/api/import/stremio")
+@login_required
+@csrf.exempt
+def import_stremio():
+    """
+    Import the movies from a Stremio library export.
+
+    Accepts the export as a multipart upload ("file") or as the raw request body;
+    it is parsed as it streams in. Query params:
+      - include_removed: also import items removed from the Stremio library.
+      - offset: first export entry to import (default 0).
+    Returns {"ok", "summary", "items", "next_offset"} with a status (added, exists,
+    skipped, failed) and reason per library entry. At most STREMIO_IMPORT_BATCH
+    entries are handled per request; while next_offset is not null, post the same
+    export again with ?offset=<next_offset> to continue. Use import_stremio.py for
+    very large exports.
+    """
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    include_removed = (request.args.get("include_removed") or "").lower() in ("1", "true", "yes", "on")
+    offset = request.args.get("offset", 0, type=int)
+    try:
+        result = import_stremio_library(
+            stream,
+            rate=current_app.config.get("TMDB_BULK_RATE", 20.0),
+            workers=current_app.config.get("TMDB_MAX_WORKERS", 8),
+            include_removed=include_removed,
+            added_by=current_user.id,
+            offset=offset,
+            limit=current_app.config.get("STREMIO_IMPORT_BATCH", 200),
+        )
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": f"Invalid Stremio export: {exc}"}), 400
+    return jsonify({"ok": True, **result})
+
+
 @movies_bp.post("/api/movies/<int:movie_id>/review")
 @login_required
 @csrf.exempt
@@ -290,6 +505,9 @@ def add_review(movie_id):
         db.session.add(review)
     
     try:
+        if not existing_review:
+            counters.increment(counters.reviews_key(current_user.id))
+        library_version.bump()
         db.session.commit()
         return jsonify({"ok": True})
     except Exception:
@@ -299,6 +517,7 @@ def add_review(movie_id):
 
 @movies_bp.get("/api/movies/<int:movie_id>/review")
 @login_required
+@library_etag
 def get_review(movie_id):
     review = Review.query.filter_by(movie_id=movie_id, user_id=current_user.id).first()
     if review:
@@ -319,11 +538,10 @@ def add_tag(movie_id):
     movie = Movie.query.get_or_404(movie_id)
     
     tag = Tag.query.filter_by(name=tag_name).first()
-    if not tag:
+    created = tag is None
+    if created:
         slug = generate_unique_slug(tag_name)
-        predefined = next((t for t in PREDEFINED_TAGS if t["name"] == tag_name), None)
-        color = predefined["color"] if predefined else None
-        tag = Tag(name=tag_name, slug=slug, color=color)
+        tag = Tag(name=tag_name, slug=slug, color=PREDEFINED_TAG_COLORS.get(tag_name))
         db.session.add(tag)
         db.session.flush()
     
@@ -335,7 +553,12 @@ def add_tag(movie_id):
     db.session.add(movie_tag)
     
     try:
+        db.session.flush()
+        search_index.index_movies([movie_id])
+        library_version.bump()
         db.session.commit()
+        if created:
+            tag_catalog.invalidate()
         return jsonify({"ok": True, "tag_id": tag.id, "tag_name": tag.name})
     except Exception:
         db.session.rollback()
@@ -344,28 +567,34 @@ def add_tag(movie_id):
 
 @movies_bp.get("/api/movies/<int:movie_id>/tags")
 @login_required
+@library_etag
 def get_tags(movie_id):
-    # Join Tag, MovieTag, and User to get tag info with user who added it
-    tags_with_users = db.session.query(Tag, MovieTag.added_by).join(MovieTag).filter(MovieTag.movie_id == movie_id).all()
-    
-    tags_data = []
-    for tag, added_by_id in tags_with_users:
-        # Get username for the user who added the tag
-        username = None
-        if added_by_id:
-            from ..models.user import User
-            user = User.query.get(added_by_id)
-            if user:
-                username = user.username
-        
-        tags_data.append({
-            "id": tag.id,
-            "name": tag.name,
-            "color": tag.get_color(),
-            "added_by": username
-        })
-    
-    return jsonify({"tags": tags_data})
+    return jsonify({"tags": _tags_for_movies([movie_id]).get(movie_id, [])})
+
+
+@movies_bp.get("/api/movies/tags")
+@login_required
+@library_etag
+def get_tags_bulk():
+    """Tags for several movies at once.
+
+    Query params:
+      - ids: comma-separated movie ids (max 100).
+    Returns {"tags": {"<movie_id>": [...]}} with an entry for every requested id.
+    """
+    movie_ids = []
+    for part in (request.args.get("ids") or "").split(","):
+        try:
+            movie_id = int(part)
+        except ValueError:
+            continue
+        if movie_id not in movie_ids:
+            movie_ids.append(movie_id)
+    if len(movie_ids) > 100:
+        return jsonify({"ok": False, "error": "At most 100 ids per request"}), 400
+
+    tags_by_movie = _tags_for_movies(movie_ids)
+    return jsonify({"tags": {str(mid): tags_by_movie.get(mid, []) for mid in movie_ids}})
 
 
 @movies_bp.get("/api/tags/predefined")
@@ -385,114 +614,32 @@ def get_predefined_tags():
 
 @movies_bp.get("/api/tags/all")
 @login_required
+@library_etag
 def get_all_tags():
     """Get all tags (both predefined and user-created) for autocomplete suggestions."""
-    def is_valid_tag_name(name: Any) -> bool:
-        # Require a non-empty string with at least one letter
-        return isinstance(name, str) and bool(name.strip()) and bool(re.search(r"[A-Za-z]", name))
-    # Get all existing tags from database
-    existing_tags = Tag.query.all()
-    
-    # Convert to the same format as predefined tags
-    db_tags = []
-    for tag in existing_tags:
-        db_tags.append({
-            "name": tag.name,
-            "color": tag.get_color()
-        })
-    
-    # Combine predefined tags with existing tags, removing duplicates
-    all_tags = []
-    tag_names = set()
-    
-    # Add predefined tags first (sanitized)
-    for tag in PREDEFINED_TAGS:
-        name = tag.get("name")
-        if is_valid_tag_name(name) and name not in tag_names:
-            all_tags.append({"name": name, "color": tag.get("color")})
-            tag_names.add(name)
-    
-    # Add custom tags that aren't already in predefined
-    for tag in db_tags:
-        name = tag.get("name")
-        if is_valid_tag_name(name) and name not in tag_names:
-            all_tags.append(tag)
-            tag_names.add(name)
-    
-    return jsonify({"tags": all_tags})
+    return jsonify({"tags": tag_catalog.all()})
 
 
 @movies_bp.get("/api/tags/search")
 @login_required
+@library_etag
 def search_tags():
-    """Search tags by substring for fast, frequent suggestions.
+    """Search tags by prefix/substring for fast, frequent suggestions.
+
+    Served from the in-memory tag catalog; predefined tags come first, and
+    prefix matches rank above substring matches.
 
     Query params:
       - q: search term (optional). If empty, returns a limited set of tags.
       - limit: max number of results (default 20, max 50).
     """
-    from sqlalchemy import func
-
     q = (request.args.get("q") or "").strip()
     try:
         limit = int(request.args.get("limit", 20))
     except Exception:
         limit = 20
     limit = max(1, min(50, limit))
-
-    # Base: collect predefined tags matching query
-    def is_valid_tag_name(name: Any) -> bool:
-        # Require a non-empty string with at least one letter
-        return isinstance(name, str) and bool(name.strip()) and bool(re.search(r"[A-Za-z]", name))
-
-    def tag_to_dict(t):
-        name = t.get("name") if isinstance(t, dict) else None
-        return {"name": name, "color": (t.get("color") if isinstance(t, dict) else None)} if is_valid_tag_name(name) else None
-
-    results = []
-    seen = set()
-
-    # Helper: add unique by name preserving order
-    def add_unique(tag_dict):
-        if not tag_dict:
-            return
-        name = tag_dict.get("name")
-        if name and name not in seen:
-            seen.add(name)
-            results.append(tag_dict)
-
-    # Match predefined tags first (prefix preferred), then substring
-    if q:
-        q_lower = q.lower()
-        pref = [t for t in PREDEFINED_TAGS if t["name"].lower().startswith(q_lower)]
-        sub = [t for t in PREDEFINED_TAGS if q_lower in t["name"].lower() and t not in pref]
-        for t in pref + sub:
-            add_unique(tag_to_dict(t))
-    else:
-        # No query: start with all predefined (limited by overall limit later)
-        for t in PREDEFINED_TAGS:
-            add_unique(tag_to_dict(t))
-
-    # Then match custom tags from DB
-    if q:
-        like = f"%{q}%"
-        db_tags = (
-            Tag.query.filter(func.lower(Tag.name).like(func.lower(like)))
-            .order_by(Tag.name.asc())
-            .limit(limit)
-            .all()
-        )
-    else:
-        # When no query, just return some tags alphabetically
-        db_tags = Tag.query.order_by(Tag.name.asc()).limit(limit).all()
-
-    for t in db_tags:
-        if is_valid_tag_name(t.name):
-            add_unique({"name": t.name, "color": t.get_color()})
-
-    # Enforce limit
-    results = results[:limit]
-    return jsonify({"tags": results})
+    return jsonify({"tags": tag_catalog.search(q, limit)})
 
 
 @movies_bp.delete("/api/movies/<int:movie_id>/tags/<int:tag_id>")
@@ -505,6 +652,9 @@ def remove_tag(movie_id, tag_id):
     
     db.session.delete(movie_tag)
     try:
+        db.session.flush()
+        search_index.index_movies([movie_id])
+        library_version.bump()
         db.session.commit()
         return jsonify({"ok": True})
     except Exception:
@@ -514,27 +664,20 @@ def remove_tag(movie_id, tag_id):
 
 @movies_bp.get("/api/movies/stats")
 @login_required
+@library_etag
 def get_library_stats():
     """
     Get library statistics: total movies and unrated movies count for current user.
-    Optimized using EXISTS to avoid counting via left join.
+    Read from the incrementally maintained library_counters table (see services.counters),
+    so the cost does not grow with the library.
     """
-    from sqlalchemy import exists
-
-    # Total movies in library
-    total_movies = db.session.query(db.func.count(Movie.id)).scalar() or 0
-
-    # Movies current user hasn't rated (fast EXISTS-based anti-join)
-    unrated_movies = (
-        db.session.query(db.func.count(Movie.id))
-        .filter(~exists().where(Review.movie_id == Movie.id).where(Review.user_id == current_user.id))
-        .scalar()
-        or 0
-    )
+    reviewed_key = counters.reviews_key(current_user.id)
+    values = counters.get_many([counters.MOVIES, reviewed_key])
+    total_movies = values[counters.MOVIES]
 
     return jsonify({
-        "total_movies": int(total_movies),
-        "unrated_movies": int(unrated_movies),
+        "total_movies": total_movies,
+        "unrated_movies": max(0, total_movies - values[reviewed_key]),
     })
 
 
@@ -551,7 +694,11 @@ def delete_movie(movie_id):
         return jsonify({"ok": False, "error": "Not found"}), 404
 
     try:
+        # Before the delete, while the movie's reviews are still there to count
+        counters.movie_deleted(movie_id)
         db.session.delete(movie)
+        search_index.remove_movies([movie_id])
+        library_version.bump()
         db.session.commit()
         return jsonify({"ok": True})
     except Exception:
@@ -561,17 +708,119 @@ def delete_movie(movie_id):
 
 @movies_bp.get("/api/movies/genres")
 @login_required
+@library_etag
 def get_all_genres():
     """Return a unique, sorted list of all genres present in the library.
 
-    This is a lightweight aggregation to support the filter UI without
-    fetching full movie payloads.
+    Reads the normalized movie_genres table, so no movie rows are loaded.
+    """
+    rows = db.session.query(MovieGenre.name).distinct().all()
+    return jsonify({"genres": sorted(name for (name,) in rows if name)})
+
+
+_RATING_BUCKETS = (5, 4, 3, 2, 1)
+
+
+def _facet_counts(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Count matching movies per genre, tag, year and rating bucket in one UNION ALL
+    of grouped aggregates. Each facet ignores its own filter, so the counts show
+    what choosing a different option would return.
+    """
+    from sqlalchemy import String, case, cast, func, literal
+
+    def filtered(*ignored: str):
+        cleared = {"genres": [], "tags": [], "year_from": None, "year_to": None, "min_rating": None, "unrated": False}
+        return _filtered_movie_query({**filters, **{k: cleared[k] for k in ignored}})
+
+    def row(facet: str, value, count):
+        return (literal(facet, type_=String).label("facet"), value.label("value"), count.label("n"))
+
+    total = filtered().with_entities(*row("total", literal("", type_=String), func.count(Movie.id)))
+    unrated = filtered("unrated").filter(
+        ~Movie.id.in_(db.session.query(Review.movie_id).filter(Review.user_id == current_user.id))
+    ).with_entities(*row("unrated", literal("", type_=String), func.count(Movie.id)))
+    genres = (
+        db.session.query(*row("genre", MovieGenre.name, func.count(MovieGenre.movie_id)))
+        .filter(MovieGenre.movie_id.in_(filtered("genres").with_entities(Movie.id)))
+        .group_by(MovieGenre.name)
+    )
+    tags = (
+        db.session.query(*row("tag", Tag.name, func.count(MovieTag.movie_id)))
+        .join(Tag, Tag.id == MovieTag.tag_id)
+        .filter(MovieTag.movie_id.in_(filtered("tags").with_entities(Movie.id)))
+        .group_by(Tag.name)
+    )
+    years = (
+        filtered("year_from", "year_to")
+        .filter(Movie.year.isnot(None))
+        .with_entities(*row("year", cast(Movie.year, String), func.count(Movie.id)))
+        .group_by(Movie.year)
+    )
+    # Bucket each movie by its best rating, matching min_rating's "any review >= x"
+    best = (
+        db.session.query(Review.movie_id, func.max(Review.rating).label("best"))
+        .filter(Review.rating.isnot(None))
+        .filter(Review.movie_id.in_(filtered("min_rating").with_entities(Movie.id)))
+        .group_by(Review.movie_id)
+        .subquery()
+    )
+    bucket = case(*[(best.c.best >= b, b) for b in _RATING_BUCKETS], else_=0)
+    ratings = (
+        db.session.query(*row("rating", cast(bucket, String), func.count()))
+        .select_from(best)
+        .group_by(bucket)
+    )
+
+    counts: Dict[str, Dict[str, int]] = {}
+    for facet, value, n in total.union_all(unrated, genres, tags, years, ratings).all():
+        counts.setdefault(facet, {})[value] = int(n or 0)
+
+    colors = {t["name"]: t["color"] for t in tag_catalog.all()}
+    year_counts = {int(y): n for y, n in counts.get("year", {}).items()}
+    decades: Dict[int, int] = {}
+    for year, n in year_counts.items():
+        decades[year // 10 * 10] = decades.get(year // 10 * 10, 0) + n
+    rating_counts = {int(float(b)): n for b, n in counts.get("rating", {}).items()}
+    at_least = 0
+    rating_facet = []
+    for b in _RATING_BUCKETS:
+        at_least += rating_counts.get(b, 0)
+        rating_facet.append({"rating": b, "count": rating_counts.get(b, 0), "at_least": at_least})
+
+    by_count = lambda item: (-item[1], item[0])
+    return {
+        "total": counts.get("total", {}).get("", 0),
+        "unrated": counts.get("unrated", {}).get("", 0),
+        "genres": [{"name": g, "count": n} for g, n in sorted(counts.get("genre", {}).items(), key=by_count)],
+        "tags": [
+            {"name": t, "color": colors.get(t, PREDEFINED_TAG_COLORS.get(t, DEFAULT_TAG_COLOR)), "count": n}
+            for t, n in sorted(counts.get("tag", {}).items(), key=by_count)
+        ],
+        "years": [{"year": y, "count": year_counts[y]} for y in sorted(year_counts, reverse=True)],
+        "decades": [{"decade": d, "count": decades[d]} for d in sorted(decades, reverse=True)],
+        "ratings": rating_facet,
+    }
+
+
+@movies_bp.get("/api/movies/facets")
+@login_required
+@library_etag
+def get_movie_facets():
+    """
+    Filter option counts for the library UI: per genre, tag, year/decade and
+    rating bucket, plus the total and unrated counts.
+
+    Takes the same filter params as /api/movies. Results are cached per
+    library version, so repeated loads between writes skip the aggregates.
     """
-    rows = db.session.query(Movie.genres).all()
-    unique = set()
-    for (genres,) in rows:
-        if isinstance(genres, list):
-            for g in genres:
-                if isinstance(g, str) and g.strip():
-                    unique.add(g.strip())
-    return jsonify({"genres": sorted(unique)})
+    filters = _parse_movie_filters(request.args)
+    version = library_version.current()
+    # Keyed by user too: the unrated count is per user
+    cache_key = response_cache.make_key({"endpoint": "facets", "filters": _filters_key(filters), "user": current_user.id})
+    facets = response_cache.get(version, cache_key)
+    hit = facets is not None
+    if not hit:
+        facets = _facet_counts(filters)
+        response_cache.set(version, cache_key, facets)
+    return _cache_response({**facets, "version": version}, hit=hit)
@@ -1,4 +1,4 @@
-from .tmdb import search_movies, movie_details, TMDB_API_BASE, IMAGE_BASE
-from .cache import init_requests_cache
+from .tmdb import search_movies, movie_details, memo_stats, TMDBClient, TMDB_API_BASE, IMAGE_BASE
+from .cache import http_cache, init_http_cache
 
-__all__ = ["search_movies", "movie_details", "TMDB_API_BASE", "IMAGE_BASE", "init_requests_cache"]
+__all__ = ["search_movies", "movie_details", "memo_stats", "TMDBClient", "TMDB_API_BASE", "IMAGE_BASE", "http_cache", "init_http_cache"]
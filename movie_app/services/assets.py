@@ -0,0 +1,334 @@
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from flask import url_for
+
+try:  # optional: .br files are only written when the brotli package is installed
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+# Types worth precompressing; images like png/jpg are already compressed
+COMPRESSIBLE = (".js", ".css", ".svg", ".json", ".txt")
+# Encodings in order of preference, with their file suffix
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+# Minification. Deliberately conservative (no renaming, line breaks kept so
+# automatic semicolon insertion behaves exactly as in the source): comments and
+# indentation go, strings, template literals and regex literals are copied as is.
+
+_WORD = re.compile(r"[A-Za-z0-9_$\\]")
+_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^\n")
+_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw",
+                   "instanceof", "yield", "await"}
+
+
+class _JSMinifier:
+    def __init__(self, source: str):
+        self.src = source
+        self.out: List[str] = []
+        self.last = "\n"  # last significant character written
+        self.word = ""  # identifier/keyword being written, or the last one
+
+    def emit(self, text: str):
+        self.out.append(text)
+        self.last = text[-1]
+
+    def run(self) -> str:
+        self.code(0, in_template=False)
+        return "".join(self.out).strip() + "\n"
+
+    def code(self, i: int, in_template: bool) -> int:
+        """Copy code from i; inside a template's ${...} stop at (and return the index of) its closing brace."""
+        src, n = self.src, len(self.src)
+        depth = 0
+        while i < n:
+            c = src[i]
+            nxt = src[i + 1] if i + 1 < n else ""
+            if c in "'\"":
+                j = self._string_end(i, c)
+                self.emit(src[i:j])
+                i = j
+            elif c == "`":
+                i = self.template(i)
+            elif c == "/" and nxt == "/":
+                while i < n and src[i] not in "\r\n":
+                    i += 1
+            elif c == "/" and nxt == "*":
+                end = src.find("*/", i + 2)
+                end = n if end < 0 else end + 2
+                if "\n" in src[i:end]:
+                    self.newline()
+                i = end
+            elif c == "/" and (self.last in _REGEX_AFTER or self.word in _REGEX_KEYWORDS and self.last.isalpha()):
+                i = self.regex(i)
+            elif c in " \t":
+                j = i
+                while j < n and src[j] in " \t":
+                    j += 1
+                after = src[j] if j < n else ""
+                # A space is only needed between two words, or to keep "+ +" / "- -" apart
+                if (_WORD.match(self.last) and _WORD.match(after or " ")) or (self.last in "+-" and after == self.last):
+                    self.emit(" ")
+                i = j
+            elif c in "\r\n":
+                self.newline()
+                i += 1
+            else:
+                if in_template and c == "{":
+                    depth += 1
+                elif in_template and c == "}":
+                    if depth == 0:
+                        return i
+                    depth -= 1
+                self.word = (self.word + c) if _WORD.match(c) and _WORD.match(self.last) else (c if _WORD.match(c) else "")
+                self.emit(c)
+                i += 1
+        return i
+
+    def newline(self):
+        if self.last != "\n":
+            # Trailing spaces before the break are never needed
+            if self.out and self.out[-1] == " ":
+                self.out.pop()
+            self.emit("\n")
+
+    def template(self, i: int) -> int:
+        src, n = self.src, len(self.src)
+        start = i
+        i += 1
+        while i < n:
+            c = src[i]
+            if c == "\\":
+                i += 2
+            elif c == "`":
+                self.emit(src[start:i + 1])
+                return i + 1
+            elif c == "$" and src[i + 1:i + 2] == "{":
+                self.emit(src[start:i + 2])
+                i = self.code(i + 2, in_template=True)
+                start = i  # the closing brace is copied with the rest of the literal
+            else:
+                i += 1
+        self.emit(src[start:])
+        return n
+
+    def regex(self, i: int) -> int:
+        src, n = self.src, len(self.src)
+        j = i + 1
+        in_class = False
+        while j < n and src[j] not in "\r\n":
+            c = src[j]
+            if c == "\\":
+                j += 2
+                continue
+            if c == "[":
+                in_class = True
+            elif c == "]":
+                in_class = False
+            elif c == "/" and not in_class:
+                j += 1
+                while j < n and src[j].isalpha():
+                    j += 1
+                self.emit(src[i:j])
+                self.word = ""
+                return j
+            j += 1
+        # No closing slash on the line: it was a division after all
+        self.emit("/")
+        return i + 1
+
+    def _string_end(self, i: int, quote: str) -> int:
+        src, n = self.src, len(self.src)
+        j = i + 1
+        while j < n and src[j] != quote:
+            if src[j] == "\\":
+                j += 1
+            elif src[j] in "\r\n":
+                break  # unterminated; copy up to the line end untouched
+            j += 1
+        return min(j + 1, n)
+
+
+def minify_js(source: str) -> str:
+    return _JSMinifier(source).run()
+
+
+# Comments and strings, whichever starts first (quotes inside comments are not strings)
+_CSS_TOKENS = re.compile(r"""(/\*.*?\*/)|("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""", re.S)
+
+
+def _minify_css_code(css: str) -> str:
+    css = re.sub(r"\s+", " ", css)
+    # Spaces around these are never significant (":" is, in selectors like "a :hover")
+    css = re.sub(r" ?([{};,>]) ?", r"\1", css)
+    return css.replace(";}", "}")
+
+
+def minify_css(source: str) -> str:
+    """Drop comments and collapse whitespace outside strings (url()/data URIs in quotes are kept)."""
+    parts, code, pos = [], [], 0
+    for match in _CSS_TOKENS.finditer(source):
+        code.append(source[pos:match.start()])
+        if match.group(1):
+            code.append(" ")
+        else:
+            parts.extend((_minify_css_code("".join(code)), match.group(2)))
+            code = []
+        pos = match.end()
+    code.append(source[pos:])
+    parts.append(_minify_css_code("".join(code)))
+    return "".join(parts).strip() + "\n"
+
+
+MINIFIERS = {".js": minify_js, ".css": minify_css}
+
+
+# Build
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def build(static_folder: str, out_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Minify, fingerprint and precompress every file under static_folder into out_dir
+    (default <static_folder>/dist) and write its manifest.json. Returns the manifest.
+    """
+    out_dir = out_dir or os.path.join(static_folder, "dist")
+    out_abs = os.path.abspath(out_dir)
+    files: Dict[str, Dict[str, Any]] = {}
+    for root, dirs, names in os.walk(static_folder):
+        dirs[:] = sorted(d for d in dirs if os.path.abspath(os.path.join(root, d)) != out_abs)
+        for name in sorted(names):
+            source_path = os.path.join(root, name)
+            logical = os.path.relpath(source_path, static_folder).replace(os.sep, "/")
+            with open(source_path, "rb") as f:
+                source = f.read()
+            stem, ext = os.path.splitext(logical)
+            data = source
+            if ext in MINIFIERS:
+                data = MINIFIERS[ext](source.decode("utf-8")).encode("utf-8")
+            built = f"{stem}.{_digest(data)[:12]}{ext}"
+            _write(os.path.join(out_dir, built), data)
+            encodings = []
+            if ext in COMPRESSIBLE:
+                for encoding, suffix in ENCODINGS:
+                    packed = _compress(encoding, data)
+                    if packed is not None and len(packed) < len(data):
+                        _write(os.path.join(out_dir, built + suffix), packed)
+                        encodings.append(encoding)
+            files[logical] = {
+                "path": built,
+                "source_sha256": _digest(source),
+                "size": len(data),
+                "encodings": encodings,
+            }
+
+    manifest = {"files": files}
+    _write(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    _remove_stale(out_dir, manifest)
+    return manifest
+
+
+def _compress(encoding: str, data: bytes) -> Optional[bytes]:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=11)
+    return None
+
+
+def _write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _remove_stale(out_dir: str, manifest: Dict[str, Any]):
+    """Delete files of earlier builds that the new manifest no longer names."""
+    keep = {MANIFEST}
+    for entry in manifest["files"].values():
+        keep.add(entry["path"])
+        keep.update(entry["path"] + suffix for _, suffix in ENCODINGS)
+    for root, _dirs, names in os.walk(out_dir):
+        for name in names:
+            rel = os.path.relpath(os.path.join(root, name), out_dir).replace(os.sep, "/")
+            if rel not in keep:
+                os.remove(os.path.join(root, name))
+
+
+# Serving
+
+class AssetManifest:
+    """
+    Maps static file names to their built, fingerprinted copies for templates.
+
+    asset_url("js/app.js") (a Jinja global) gives /assets/js/app.<hash>.js when a
+    fresh build exists, and falls back to the plain /static URL otherwise, e.g.
+    in development or for a file edited since the last build. Configured from:
+      - ASSETS_ENABLED: use the build at all
+      - ASSETS_DIR: build output (default: <static folder>/dist)
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.path: Optional[str] = None
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._by_path: Dict[str, Dict[str, Any]] = {}
+
+    def init_app(self, app):
+        self.path = app.config.get("ASSETS_DIR") or os.path.join(app.static_folder, "dist")
+        self.enabled = bool(app.config.get("ASSETS_ENABLED", True))
+        self.files = self._load(app.static_folder) if self.enabled else {}
+        self._by_path = {entry["path"]: entry for entry in self.files.values()}
+        app.add_template_global(self.url, "asset_url")
+
+    def _load(self, static_folder: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.path, MANIFEST), "r", encoding="utf-8") as f:
+                files = json.load(f)["files"]
+        except (OSError, ValueError, KeyError):
+            return {}
+        fresh = {}
+        for logical, entry in files.items():
+            try:
+                with open(os.path.join(static_folder, logical), "rb") as f:
+                    current = _digest(f.read())
+            except OSError:
+                continue
+            if current == entry.get("source_sha256"):
+                fresh[logical] = entry
+            else:
+                logger.warning("%s changed since the last asset build; serving it from /static", logical)
+        return fresh
+
+    def url(self, filename: str) -> str:
+        entry = self.files.get(filename)
+        if entry is None:
+            return url_for("static", filename=filename)
+        return url_for("assets.asset", filename=entry["path"])
+
+    def built(self, built_path: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry of a fingerprinted file name, or None if it is not part of the current build."""
+        return self._by_path.get(built_path)
+
+    @staticmethod
+    def content_type(built_path: str) -> str:
+        return mimetypes.guess_type(built_path)[0] or "application/octet-stream"
+
+
+assets = AssetManifest()
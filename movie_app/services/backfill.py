@@ -0,0 +1,208 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from ..extensions import db
+from .library_version import library_version
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter: `rate` tokens per second, bursts up to `capacity`.
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class Checkpoint:
+    """
+    JSON file remembering the highest row id whose result has been committed,
+    so a rerun can skip everything up to it. Rows are processed in id order.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+
+    def load(self) -> int:
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return int(json.load(f).get("last_id", 0))
+        except Exception:
+            return 0
+
+    def save(self, last_id: int):
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"last_id": last_id, "saved_at": time.time()}, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BackfillJob:
+    """
+    Fill in data for existing rows from TMDB: concurrent, rate-limited and resumable.
+
+    - rows: id-ordered query of the model rows that still need data
+    - fetch(row_key): network call run on worker threads (no app context, no DB access)
+    - apply(row, result): copies the fetched result onto the row; return False to count it as failed
+
+    Results are applied and committed on the calling thread every `chunk_size`
+    rows, and the checkpoint advances with each commit, but never past a row
+    whose fetch failed, so a resumed run retries it. fetch should raise on
+    errors worth retrying and return None only for rows with nothing to fetch
+    (counted as skipped).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rows,
+        fetch: Callable[[Any], Any],
+        apply: Callable[[Any, Any], bool],
+        key: Callable[[Any], Any] = lambda row: row.tmdb_id,
+        rate: float = 20.0,
+        workers: int = 8,
+        chunk_size: int = 100,
+        checkpoint_path: Optional[str] = None,
+        report: Callable[[str], None] = print,
+        report_every: float = 5.0,
+    ):
+        self.name = name
+        self.rows = rows
+        self.fetch = fetch
+        self.apply = apply
+        self.key = key
+        self.limiter = TokenBucket(rate)
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.report = report
+        self.report_every = report_every
+        self.stats = {"total": 0, "updated": 0, "failed": 0, "skipped": 0}
+        self._first_failed: Optional[int] = None
+
+    def _rate_limited_fetch(self, key):
+        self.limiter.acquire()
+        try:
+            return self.fetch(key), None
+        except Exception as exc:
+            return None, exc
+
+    def run(self) -> Dict[str, int]:
+        start_after = self.checkpoint.load()
+        model = self.rows.column_descriptions[0]["entity"]
+        rows = self.rows.filter(model.id > start_after).order_by(model.id)
+        self.stats["total"] = rows.count()
+        if start_after:
+            self.report(f"[{self.name}] resuming after id {start_after}")
+        self.report(f"[{self.name}] {self.stats['total']} rows to process")
+
+        started = time.monotonic()
+        last_report = started
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"backfill-{self.name}") as pool:
+            last_id = start_after
+            while True:
+                # Keyset over ids so committed rows never shift the next chunk
+                chunk: List[Any] = rows.filter(model.id > last_id).limit(self.chunk_size).all()
+                if not chunk:
+                    break
+                results = pool.map(self._rate_limited_fetch, [self.key(row) for row in chunk])
+                for row, (result, error) in zip(chunk, results):
+                    if error is not None:
+                        logger.warning("[%s] fetch failed for id %s: %s", self.name, row.id, error)
+                        self.stats["failed"] += 1
+                        if self._first_failed is None:
+                            self._first_failed = row.id
+                    elif result is None:
+                        self.stats["skipped"] += 1
+                    elif self.apply(row, result) is False:
+                        self.stats["failed"] += 1
+                    else:
+                        self.stats["updated"] += 1
+                last_id = chunk[-1].id
+                self._commit(last_id)
+                done += len(chunk)
+
+                now = time.monotonic()
+                if now - last_report >= self.report_every:
+                    self._report_progress(done, now - started)
+                    last_report = now
+
+        self._report_progress(done, time.monotonic() - started)
+        if self._first_failed is None:
+            self.checkpoint.clear()
+        return dict(self.stats)
+
+    def _commit(self, last_id: int):
+        try:
+            # Updated rows change what the read APIs return
+            library_version.bump()
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        if self._first_failed is not None:
+            # Rows updated since are no longer selected by the job's query, so a resume
+            # from here only fetches the failed rows and the ones never reached
+            last_id = min(last_id, self._first_failed - 1)
+        self.checkpoint.save(last_id)
+        # Committed rows are no longer needed; keep the identity map small on big runs
+        db.session.expunge_all()
+
+    def _report_progress(self, done: int, elapsed: float):
+        total = self.stats["total"] or 1
+        rate = done / elapsed if elapsed > 0 else 0.0
+        self.report(
+            f"[{self.name}] {done}/{self.stats['total']} ({done * 100 // total}%) "
+            f"updated={self.stats['updated']} failed={self.stats['failed']} skipped={self.stats['skipped']} "
+            f"{rate:.1f} rows/s"
+        )
+
+
+def run_backfill(name: str, rows, fetch, apply, **kwargs) -> Dict[str, int]:
+    """Convenience wrapper: build a BackfillJob and run it."""
+    return BackfillJob(name, rows, fetch, apply, **kwargs).run()
+
+
+def missing_json_list_filter(column_name: str):
+    """SQL filter for rows whose JSON list column is NULL or empty, for the current dialect."""
+    from sqlalchemy import text
+
+    # Parenthesized so it composes safely with the job's own id filters
+    if "sqlite" in str(db.engine.url):
+        return text(f"({column_name} IS NULL OR {column_name} = '[]' OR json_array_length({column_name}) = 0)")
+    return text(f"({column_name} IS NULL OR {column_name}::text = '[]' OR json_array_length({column_name}) = 0)")
@@ -1,10 +1,167 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
 import requests_cache
 
 
-def init_requests_cache():
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("sqlite", "filesystem", "memory", "none")
+
+
+class HTTPCache:
     """
-    Install a global requests-cache for outbound HTTP calls (TMDB).
-    24h expiry as per requirements.
+    HTTP response cache for the TMDB client only (no global monkeypatching of requests).
+
+    The backend, per-endpoint expiry and size cap come from the app config:
+      - HTTP_CACHE_BACKEND: sqlite (WAL mode), filesystem, memory or none
+      - HTTP_CACHE_PATH: file/directory for the persistent backends (default: instance folder)
+      - HTTP_CACHE_EXPIRE_DETAILS / HTTP_CACHE_EXPIRE_SEARCH / HTTP_CACHE_EXPIRE_DEFAULT: seconds
+      - HTTP_CACHE_MAX_ENTRIES: expired entries are pruned, then the oldest beyond this cap
+      - HTTP_CACHE_PRUNE_INTERVAL: seconds between background prunes
     """
-    # SQLite backend file 'http_cache.sqlite' in cwd
-    requests_cache.install_cache("http_cache", expire_after=86400)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.backend = "sqlite"
+        self.path: Optional[str] = None
+        self.expire_default = 86400
+        self.urls_expire_after: Dict[str, int] = {}
+        self.max_entries = 5000
+        self.prune_interval = 3600.0
+        self._session: Optional[requests_cache.CachedSession] = None
+        self._last_prune = time.monotonic()
+        self._pruning = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend != "none"
+
+    def init_app(self, app):
+        backend = (app.config.get("HTTP_CACHE_BACKEND") or "sqlite").lower()
+        if backend not in BACKENDS:
+            raise ValueError(f"HTTP_CACHE_BACKEND must be one of {', '.join(BACKENDS)}, got {backend!r}")
+        path = app.config.get("HTTP_CACHE_PATH")
+        if not path and backend in ("sqlite", "filesystem"):
+            os.makedirs(app.instance_path, exist_ok=True)
+            path = os.path.join(app.instance_path, "http_cache")
+
+        # urls_expire_after globs match the URL without its scheme; first match wins
+        api_base = app.config.get("TMDB_API_BASE") or "https://api.themoviedb.org/3"
+        parsed = urlparse(api_base)
+        prefix = f"{parsed.netloc}{parsed.path.rstrip('/')}"
+        details = int(app.config.get("HTTP_CACHE_EXPIRE_DETAILS", 7 * 86400))
+        search = int(app.config.get("HTTP_CACHE_EXPIRE_SEARCH", 6 * 3600))
+
+        with self._lock:
+            self.backend = backend
+            self.path = path
+            self.expire_default = int(app.config.get("HTTP_CACHE_EXPIRE_DEFAULT", 86400))
+            self.urls_expire_after = {
+                f"{prefix}/search/*": search,
+                f"{prefix}/movie/*": details,
+                f"{prefix}/person/*": details,
+                f"{prefix}/find/*": details,
+            }
+            self.max_entries = int(app.config.get("HTTP_CACHE_MAX_ENTRIES", 5000))
+            self.prune_interval = float(app.config.get("HTTP_CACHE_PRUNE_INTERVAL", 3600))
+            self._session = None
+            self.hits = 0
+            self.misses = 0
+
+    def create_session(self) -> requests_cache.CachedSession:
+        """Build the CachedSession the TMDB client sends its requests through."""
+        if self.backend == "memory":
+            session = requests_cache.CachedSession(
+                "tmdb_http_cache",
+                backend="memory",
+                expire_after=self.expire_default,
+                urls_expire_after=self.urls_expire_after,
+            )
+        elif self.backend == "filesystem":
+            session = requests_cache.CachedSession(
+                self.path,
+                backend="filesystem",
+                expire_after=self.expire_default,
+                urls_expire_after=self.urls_expire_after,
+            )
+        else:
+            session = requests_cache.CachedSession(
+                self.path,
+                backend="sqlite",
+                expire_after=self.expire_default,
+                urls_expire_after=self.urls_expire_after,
+                timeout=30,
+            )
+            # WAL lets gunicorn workers read while another one writes
+            with session.cache.responses.connection(commit=True) as con:
+                con.execute("PRAGMA journal_mode=WAL")
+        # Keep cache keys stable across API key rotation
+        session.cache.ignored_parameters = ["api_key"]
+        self._session = session
+        return session
+
+    def record(self, from_cache: bool):
+        """Count a lookup and kick off a background prune when one is due."""
+        prune_due = False
+        with self._lock:
+            if from_cache:
+                self.hits += 1
+            else:
+                self.misses += 1
+                if not self._pruning and time.monotonic() - self._last_prune >= self.prune_interval:
+                    self._pruning = True
+                    prune_due = True
+        if prune_due:
+            threading.Thread(target=self.prune, name="http-cache-prune", daemon=True).start()
+
+    def prune(self) -> int:
+        """Remove expired entries, then the oldest ones beyond max_entries. Returns entries removed."""
+        session = self._session
+        removed = 0
+        try:
+            if session is None:
+                return 0
+            cache = session.cache
+            before = len(cache.responses)
+            cache.delete(expired=True, invalid=True)
+            count = len(cache.responses)
+            if self.max_entries and count > self.max_entries:
+                by_age = sorted(cache.filter(valid=True, expired=True), key=lambda r: r.created_at)
+                stale = [r.cache_key for r in by_age[: count - self.max_entries] if r.cache_key]
+                cache.delete(*stale)
+                count = len(cache.responses)
+            removed = before - count
+            if removed:
+                logger.info("HTTP cache pruned %d entries (%d left)", removed, count)
+        except Exception:
+            logger.exception("HTTP cache prune failed")
+        finally:
+            with self._lock:
+                self._last_prune = time.monotonic()
+                self._pruning = False
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+http_cache = HTTPCache()
+
+
+def init_http_cache(app):
+    """Configure the TMDB HTTP cache from the app config."""
+    http_cache.init_app(app)
@@ -0,0 +1,111 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..extensions import db
+
+
+logger = logging.getLogger(__name__)
+
+MOVIES = "movies"
+# Bumped by every write that changes what the library endpoints return (see library_version)
+VERSION = "library_version"
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def reviews_key(user_id: int) -> str:
+    return f"reviews:user:{int(user_id)}"
+
+
+def increment(key: str, delta: int = 1):
+    """
+    Adjust a counter inside the caller's transaction. The change is done in SQL
+    (value = value + delta) so concurrent writers cannot lose increments, and as
+    an upsert where the database supports it, so two writers creating the same
+    counter cannot collide on its primary key.
+    """
+    from ..models.stats import LibraryCounter
+
+    if not delta:
+        return
+    now = datetime.utcnow()
+    upsert = _UPSERTS.get(db.session.get_bind().dialect.name)
+    if upsert is not None:
+        stmt = upsert(LibraryCounter).values(key=key, value=delta, updated_at=now)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[LibraryCounter.key],
+            set_={"value": LibraryCounter.value + delta, "updated_at": now},
+        ))
+        return
+    updated = (
+        db.session.query(LibraryCounter)
+        .filter(LibraryCounter.key == key)
+        .update({LibraryCounter.value: LibraryCounter.value + delta, LibraryCounter.updated_at: now},
+                synchronize_session=False)
+    )
+    if not updated:
+        db.session.add(LibraryCounter(key=key, value=delta))
+        db.session.flush()
+
+
+def get_many(keys: Iterable[str]) -> Dict[str, int]:
+    """Read several counters with a single primary-key lookup; missing counters read as 0."""
+    from ..models.stats import LibraryCounter
+
+    keys = list(keys)
+    values = dict(
+        db.session.query(LibraryCounter.key, LibraryCounter.value).filter(LibraryCounter.key.in_(keys)).all()
+    )
+    return {k: int(values.get(k) or 0) for k in keys}
+
+
+def movie_deleted(movie_id: int):
+    """Decrement the movie count and the review counts of everyone who reviewed the movie."""
+    from ..models.review import Review
+
+    increment(MOVIES, -1)
+    for (user_id,) in db.session.query(Review.user_id).filter(Review.movie_id == movie_id).all():
+        increment(reviews_key(user_id), -1)
+
+
+def reconcile() -> Dict[str, int]:
+    """Recompute every counter from the source tables and commit. Returns the new values."""
+    from ..models.movie import Movie
+    from ..models.review import Review
+    from ..models.stats import LibraryCounter
+    from ..models.user import User
+
+    values = {
+        MOVIES: db.session.query(func.count(Movie.id)).scalar() or 0,
+        # Never move the version backwards, or stale cache entries could be served again
+        VERSION: (db.session.query(LibraryCounter.value).filter(LibraryCounter.key == VERSION).scalar() or 0) + 1,
+    }
+    # Seed a zero row per user so their first review only has to UPDATE
+    for (user_id,) in db.session.query(User.id):
+        values[reviews_key(user_id)] = 0
+    for user_id, count in db.session.query(Review.user_id, func.count(Review.id)).group_by(Review.user_id):
+        values[reviews_key(user_id)] = count
+
+    try:
+        db.session.query(LibraryCounter).delete(synchronize_session=False)
+        db.session.add_all(LibraryCounter(key=k, value=v) for k, v in values.items())
+        db.session.info["library_version"] = values[VERSION]
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    logger.info("Reconciled %d library counters", len(values))
+    return values
+
+
+def ensure_ready():
+    """Seed the counters on first run (or after the table was emptied)."""
+    from ..models.stats import LibraryCounter
+
+    if db.session.get(LibraryCounter, MOVIES) is None:
+        reconcile()
@@ -0,0 +1,102 @@
+import logging
+from typing import Optional
+
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from .memo import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class Identity(UserMixin):
+    """
+    Immutable stand-in for the logged-in User: just what request handling needs
+    (id, username, admin flag). Loaded through IdentityCache instead of a users
+    query per request; load the User model explicitly when more is needed.
+    """
+
+    __slots__ = ("id", "username", "is_admin")
+
+    def __init__(self, id: int, username: str, is_admin: bool = False):
+        self.id = id
+        self.username = username
+        self.is_admin = is_admin
+
+    def get_id(self):
+        return str(self.id)
+
+    def __repr__(self):
+        return f"<Identity {self.username}>"
+
+
+class IdentityCache:
+    """
+    Per-process TTL cache of Identity objects for the Flask-Login user_loader.
+
+    Entries are dropped when a User row is updated or deleted through this
+    process (including bulk Query.update/delete, as in clear_users.py). Changes
+    made by other processes are picked up once the TTL expires.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.admin_username = "Alex"
+
+    def init_app(self, app):
+        self._cache.configure(ttl=float(app.config.get("USER_CACHE_TTL", 300)))
+        self.admin_username = app.config.get("ADMIN_USERNAME", "Alex")
+        self._cache.clear()
+
+    def load(self, user_id) -> Optional[Identity]:
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        identity = self._cache.get(user_id)
+        if identity is not None:
+            return identity
+
+        from ..models.user import User
+
+        row = db.session.query(User.id, User.username).filter(User.id == user_id).first()
+        if row is None:
+            # Not cached: a later user with this id must not be shadowed
+            return None
+        identity = Identity(row.id, row.username, is_admin=row.username == self.admin_username)
+        self._cache.set(user_id, identity)
+        return identity
+
+    def invalidate(self, user_id: Optional[int] = None):
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.delete(int(user_id))
+
+    def stats(self):
+        return self._cache.stats()
+
+
+identity_cache = IdentityCache()
+
+
+def _register_user_events():
+    from ..models.user import User
+
+    @event.listens_for(User, "after_update")
+    @event.listens_for(User, "after_delete")
+    def _user_changed(mapper, connection, target):
+        identity_cache.invalidate(target.id)
+
+    @event.listens_for(Session, "do_orm_execute")
+    def _bulk_user_change(orm_execute_state):
+        if (orm_execute_state.is_update or orm_execute_state.is_delete) and any(
+            m.class_ is User for m in orm_execute_state.all_mappers
+        ):
+            identity_cache.invalidate()
+
+
+_register_user_events()
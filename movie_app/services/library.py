@@ -0,0 +1,55 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..extensions import db
+from . import counters
+from .library_version import library_version
+from .posters import poster_cache
+from .search_index import search_index
+
+
+def build_movie(md: Dict[str, Any], added_by: Optional[int] = None):
+    """Movie row (with genres) from a tmdb.movie_details() dict; not added to the session."""
+    from ..models.movie import Movie
+
+    movie = Movie(
+        tmdb_id=md.get("tmdb_id"),
+        title=md.get("title") or "",
+        original_title=md.get("original_title"),
+        year=md.get("year"),
+        poster_path=md.get("poster_path"),
+        backdrop_path=md.get("backdrop_path"),
+        overview=md.get("overview"),
+        runtime=md.get("runtime"),
+        tmdb_rating=md.get("tmdb_rating"),
+        added_by=added_by,
+    )
+    movie.set_genres(md.get("genres", []))
+    return movie
+
+
+def existing_tmdb_ids(tmdb_ids: Iterable[int]) -> Dict[int, int]:
+    """tmdb_id -> movie id for the ids already in the library, in one query."""
+    from ..models.movie import Movie
+
+    ids = list({int(i) for i in tmdb_ids if i})
+    if not ids:
+        return {}
+    return dict(db.session.query(Movie.tmdb_id, Movie.id).filter(Movie.tmdb_id.in_(ids)).all())
+
+
+def add_movies(details: List[Dict[str, Any]], added_by: Optional[int] = None) -> List[Any]:
+    """
+    Insert movies from movie_details() dicts within the caller's transaction,
+    keeping the derived data in step: search index, library counters and version.
+    The caller commits (or rolls back) and is responsible for deduplication.
+    """
+    if not details:
+        return []
+    movies = [build_movie(md, added_by) for md in details]
+    db.session.add_all(movies)
+    db.session.flush()
+    search_index.index_movies([m.id for m in movies])
+    counters.increment(counters.MOVIES, len(movies))
+    library_version.bump()
+    poster_cache.prewarm(m.poster_path for m in movies)
+    return movies
@@ -0,0 +1,149 @@
+import hashlib
+import logging
+import os
+import threading
+from functools import wraps
+from typing import Optional, Tuple
+
+from flask import make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from . import counters
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of this process are serialized
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = "library_version"
+
+
+class LibraryVersion:
+    """
+    Monotonic version of the library, bumped by every write that changes what
+    the read APIs return. Used for ETags and as a cache key.
+
+    The durable value is the "library_version" row in library_counters,
+    incremented inside the writing transaction. With a SQLite database file,
+    once that transaction commits the new value is mirrored to a small file
+    next to the database, shared by every process that can open the database,
+    so current() only stats that file instead of querying the database.
+
+    Other databases may be shared by app servers on several hosts, which would
+    never see each other's file, so current() reads the row itself (a primary
+    key lookup).
+    """
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self._lock = threading.Lock()
+        self._cached: Tuple[Optional[tuple], int] = (None, 0)
+
+    def init_app(self, app):
+        # One file per database, so apps pointed at different databases never share a version
+        uri = str(app.config.get("SQLALCHEMY_DATABASE_URI") or "")
+        self.path = None
+        if uri.startswith("sqlite:///") and uri != "sqlite:///:memory:":
+            db_path = uri[len("sqlite:///"):]
+            if not os.path.isabs(db_path):
+                db_path = os.path.join(app.instance_path, db_path)
+            self.path = f"{db_path}.version"
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._cached = (None, 0)
+
+    def ensure_ready(self):
+        """Publish the database's version at startup (it is the source of truth)."""
+        self.publish(counters.get_many([counters.VERSION])[counters.VERSION], force=True)
+
+    def bump(self):
+        """Increment the version inside the current transaction; published on commit."""
+        counters.increment(counters.VERSION)
+        db.session.info[_SESSION_KEY] = counters.get_many([counters.VERSION])[counters.VERSION]
+
+    def current(self) -> int:
+        if not self.path:
+            return counters.get_many([counters.VERSION])[counters.VERSION]
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self.ensure_ready()
+            st = os.stat(self.path)
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached_key, value = self._cached
+        if cached_key == key:
+            return value
+        value = self._read()
+        self._cached = (key, value)
+        return value
+
+    def publish(self, value: int, force: bool = False):
+        """Write value to the shared file unless a newer version is already there."""
+        if not self.path:
+            return
+        with self._lock, open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if not force and self._read() >= value:
+                return
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(str(int(value)))
+            os.replace(tmp, self.path)
+
+    def _read(self) -> int:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+
+library_version = LibraryVersion()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session):
+    value = session.info.pop(_SESSION_KEY, None)
+    if value is not None:
+        try:
+            library_version.publish(value)
+        except OSError:
+            logger.exception("Could not publish library version %s", value)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+def library_etag(fn):
+    """
+    Conditional GET for read endpoints whose output only changes with the library.
+
+    The strong ETag combines the library version, the user and the full request
+    URL. A matching If-None-Match returns 304 before the view runs.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        from flask_login import current_user
+
+        user_id = current_user.get_id() if current_user else None
+        raw = f"{library_version.current()}|{user_id}|{request.full_path}"
+        etag = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+        if request.if_none_match.contains(etag):
+            response = make_response("", 304)
+        else:
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        # Let the browser keep the body but revalidate it on every use
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+    return wrapper
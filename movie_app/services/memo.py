@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded, thread-safe in-memory LRU cache whose entries expire after `ttl` seconds.
+    Keeps hit/miss/eviction counters for observability.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 3600.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = int(maxsize)
+            if ttl is not None:
+                self.ttl = float(ttl)
+            self._trim()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            self._trim()
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def _trim(self):
+        while len(self._data) > max(self.maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+class Uncached:
+    """Returned by a memoized function to hand `value` to the caller without caching it."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def memoize(cache: TTLCache, key: Callable[..., Hashable], cache_none: bool = False):
+    """
+    Cache a function's results in `cache` under key(*args, **kwargs).
+    Results of None are not cached unless cache_none is set, so failed lookups are retried.
+    Neither are results wrapped in Uncached (e.g. built from a partly failed lookup).
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            value = cache.get(cache_key, _MISSING)
+            if value is not _MISSING:
+                return value
+            value = fn(*args, **kwargs)
+            if isinstance(value, Uncached):
+                return value.value
+            if value is not None or cache_none:
+                cache.set(cache_key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
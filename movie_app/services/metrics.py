@@ -0,0 +1,363 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from flask import g, has_app_context, request
+
+from ..extensions import db
+from . import tmdb
+from .cache import http_cache
+from .identity import identity_cache
+from .posters import poster_cache
+from .response_cache import response_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows: archive merges are only serialized within this process
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help). Counters and histograms are summed over every worker that
+# ever wrote a snapshot; gauges only over the workers that are still running.
+METRICS = {
+    "movieapp_http_requests_total": ("counter", "HTTP requests by endpoint, method and status"),
+    "movieapp_http_request_duration_seconds": ("histogram", "HTTP request latency by endpoint and method"),
+    "movieapp_tmdb_requests_total": ("counter", "TMDB API requests by kind and outcome"),
+    "movieapp_tmdb_request_duration_seconds": ("histogram", "Latency of TMDB API requests that reached the network"),
+    "movieapp_cache_hits_total": ("counter", "Cache hits by cache"),
+    "movieapp_cache_misses_total": ("counter", "Cache misses by cache"),
+    "movieapp_cache_hit_ratio": ("gauge", "Hits / (hits + misses) by cache, over all workers"),
+    "movieapp_db_pool_size": ("gauge", "Configured connections in the SQLAlchemy pools"),
+    "movieapp_db_pool_checked_out": ("gauge", "Connections currently in use"),
+    "movieapp_db_pool_checked_in": ("gauge", "Idle connections held by the pools"),
+    "movieapp_db_pool_overflow": ("gauge", "Connections open beyond pool_size"),
+    "movieapp_workers": ("gauge", "Worker processes reporting metrics"),
+}
+
+_ID_SEGMENT = re.compile(r"^(\d+|tt\d+)$")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _tmdb_kind(path: str) -> str:
+    """"/movie/603/credits" -> "movie/credits", so ids do not become label values."""
+    return "/".join(part for part in path.strip("/").split("/") if part and not _ID_SEGMENT.match(part)) or "root"
+
+
+def _tmdb_outcome(error: Optional[BaseException], from_cache: Optional[bool]) -> str:
+    if error is None:
+        return "cached" if from_cache else "ok"
+    if isinstance(error, requests.Timeout):
+        return "timeout"
+    if isinstance(error, requests.ConnectionError):
+        return "connection_error"
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return f"http_{error.response.status_code // 100}xx"
+    return "error"
+
+
+class MetricsRegistry:
+    """
+    Prometheus metrics for this app, aggregated across worker processes.
+
+    Each process keeps its counters and histograms in memory. Under gunicorn
+    (METRICS_MULTIPROCESS, set by gunicorn.conf.py) each worker also writes them
+    as a JSON snapshot to METRICS_DIR/metrics-<pid>.json at most every
+    METRICS_FLUSH_INTERVAL seconds (and when it exits). /metrics sums the
+    snapshots of all workers, so it may lag by up to one interval. Snapshots of
+    workers that have exited are folded into an archive file so their counts are
+    kept while the directory stays small. A single process (flask run, tests,
+    scripts) serves its own values and writes no files.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enabled = False
+        self.multiprocess = False
+        self.path: Optional[str] = None
+        self.flush_interval = 5.0
+        self._last_flush = 0.0
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+
+    def init_app(self, app):
+        self.enabled = bool(app.config.get("METRICS_ENABLED", True))
+        self.multiprocess = bool(app.config.get("METRICS_MULTIPROCESS", False))
+        self.flush_interval = float(app.config.get("METRICS_FLUSH_INTERVAL", 5))
+        self.path = app.config.get("METRICS_DIR") or self._default_path(app)
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+            self._last_flush = 0.0
+        if not self.enabled:
+            return
+        if self.multiprocess:
+            os.makedirs(self.path, exist_ok=True)
+        tmdb.client.add_listener(self._tmdb_request)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._teardown_request)
+
+    @staticmethod
+    def _default_path(app) -> str:
+        # One directory per database, like the library version file
+        uri = str(app.config.get("SQLALCHEMY_DATABASE_URI") or "")
+        if uri.startswith("sqlite:///") and uri != "sqlite:///:memory:":
+            db_path = uri[len("sqlite:///"):]
+            if not os.path.isabs(db_path):
+                db_path = os.path.join(app.instance_path, db_path)
+            return f"{db_path}.metrics"
+        digest = hashlib.sha1(uri.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(app.instance_path, f"metrics-{digest}")
+
+    # Recording
+
+    def inc(self, name: str, labels: Labels, value: float = 1.0):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + value
+
+    def observe(self, name: str, labels: Labels, value: float):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Non-cumulative bucket counts (last one is +Inf), then sum and count
+            data = series.get(labels)
+            if data is None:
+                data = series[labels] = [0.0] * (len(LATENCY_BUCKETS) + 3)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            else:
+                data[len(LATENCY_BUCKETS)] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def _tmdb_request(self, path, elapsed, error, from_cache):
+        kind = _tmdb_kind(path)
+        self.inc("movieapp_tmdb_requests_total", _labels(kind=kind, outcome=_tmdb_outcome(error, from_cache)))
+        if not from_cache:
+            self.observe("movieapp_tmdb_request_duration_seconds", _labels(kind=kind), elapsed)
+
+    def _start_request(self):
+        g._metrics_started = time.perf_counter()
+
+    def _record_request(self, status: int):
+        started = g.pop("_metrics_started", None)
+        if started is None:
+            return
+        endpoint = request.endpoint or "unmatched"
+        self.inc("movieapp_http_requests_total", _labels(endpoint=endpoint, method=request.method, status=status))
+        self.observe("movieapp_http_request_duration_seconds", _labels(endpoint=endpoint, method=request.method),
+                     time.perf_counter() - started)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _finish_request(self, response):
+        self._record_request(response.status_code)
+        return response
+
+    def _teardown_request(self, exc=None):
+        # Only still pending when the view raised and after_request never ran
+        if exc is not None:
+            self._record_request(500)
+
+    # Snapshots
+
+    def _process_values(self) -> Tuple[Dict[str, Dict[Labels, float]], Dict[str, Dict[Labels, float]]]:
+        """Cache counters (running totals kept by each cache) and pool gauges of this process."""
+        totals: Dict[str, Dict[Labels, float]] = {"movieapp_cache_hits_total": {}, "movieapp_cache_misses_total": {}}
+        caches = {"http": http_cache.stats(), "response": response_cache.stats(), "identity": identity_cache.stats(),
+                  "posters": poster_cache.stats()}
+        caches.update({f"tmdb_{name}": stats for name, stats in tmdb.memo_stats().items()})
+        for cache, stats in caches.items():
+            totals["movieapp_cache_hits_total"][_labels(cache=cache)] = float(stats.get("hits") or 0)
+            totals["movieapp_cache_misses_total"][_labels(cache=cache)] = float(stats.get("misses") or 0)
+
+        gauges: Dict[str, Dict[Labels, float]] = {"movieapp_workers": {(): 1.0}}
+        if has_app_context():
+            pool = db.engine.pool
+            for name, attr in (("movieapp_db_pool_size", "size"), ("movieapp_db_pool_checked_out", "checkedout"),
+                               ("movieapp_db_pool_checked_in", "checkedin"), ("movieapp_db_pool_overflow", "overflow")):
+                # Only QueuePool reports these; SQLite's single-connection pools do not
+                fn = getattr(pool, attr, None)
+                if callable(fn):
+                    gauges[name] = {(): float(fn())}
+        return totals, gauges
+
+    def snapshot(self) -> Dict[str, Any]:
+        totals, gauges = self._process_values()
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: {labels: list(data) for labels, data in series.items()}
+                          for name, series in self._histograms.items()}
+        counters.update(totals)
+        return {
+            "pid": os.getpid(),
+            "counters": _dump(counters),
+            "histograms": _dump(histograms),
+            "gauges": _dump(gauges),
+        }
+
+    def flush(self):
+        if not self.enabled or not self.multiprocess or not self.path:
+            return
+        self._last_flush = time.monotonic()
+        path = os.path.join(self.path, f"metrics-{os.getpid()}.json")
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError:
+            logger.exception("Could not write metrics snapshot to %s", path)
+
+    # Aggregation
+
+    def collect(self) -> Dict[str, Dict[str, Dict[Labels, Any]]]:
+        """Sum the snapshots of every worker (this one is flushed first)."""
+        if not self.multiprocess:
+            return _parse(self.snapshot())
+        self.flush()
+        merged: Dict[str, Dict[str, Dict[Labels, Any]]] = {"counters": {}, "histograms": {}, "gauges": {}}
+        with open(os.path.join(self.path, "archive.lock"), "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            archive_path = os.path.join(self.path, "archive.json")
+            archive = _parse(_read_json(archive_path) or {})
+            retired = []
+            for path in glob.glob(os.path.join(self.path, "metrics-*.json")):
+                data = _read_json(path)
+                if data is None:
+                    continue
+                if _pid_alive(int(data.get("pid") or 0)):
+                    _add(merged, _parse(data), ("counters", "histograms", "gauges"))
+                else:
+                    _add(archive, _parse(data), ("counters", "histograms"))
+                    retired.append(path)
+            if retired:
+                tmp = f"{archive_path}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({section: _dump(archive[section]) for section in ("counters", "histograms")}, f,
+                              separators=(",", ":"))
+                os.replace(tmp, archive_path)
+                for path in retired:
+                    os.remove(path)
+            _add(merged, archive, ("counters", "histograms"))
+        return merged
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        data = self.collect()
+        hits = data["counters"].get("movieapp_cache_hits_total", {})
+        misses = data["counters"].get("movieapp_cache_misses_total", {})
+        data["gauges"]["movieapp_cache_hit_ratio"] = {
+            labels: (hits.get(labels, 0.0) / (hits.get(labels, 0.0) + misses.get(labels, 0.0)))
+            if hits.get(labels, 0.0) + misses.get(labels, 0.0) else 0.0
+            for labels in set(hits) | set(misses)
+        }
+
+        lines: List[str] = []
+        for name, (kind, help_text) in METRICS.items():
+            section = "histograms" if kind == "histogram" else kind + "s"
+            series = data[section].get(name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels in sorted(series):
+                value = series[labels]
+                if kind != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0.0
+                for bound, count in zip(list(LATENCY_BUCKETS) + ["+Inf"], value):
+                    cumulative += count
+                    le = bound if isinstance(bound, str) else repr(float(bound))
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {_format_value(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-2])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {_format_value(value[-1])}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def _dump(sections: Dict[str, Dict[Labels, Any]]) -> Dict[str, List[Any]]:
+    return {name: [[list(map(list, labels)), value] for labels, value in series.items()]
+            for name, series in sections.items()}
+
+
+def _parse(snapshot: Dict[str, Any]) -> Dict[str, Dict[str, Dict[Labels, Any]]]:
+    return {
+        section: {
+            name: {tuple(tuple(pair) for pair in labels): value for labels, value in items}
+            for name, items in (snapshot.get(section) or {}).items()
+        }
+        for section in ("counters", "histograms", "gauges")
+    }
+
+
+def _add(target, source, sections):
+    """Add source's series into target: numbers are summed, histogram lists element-wise."""
+    for section in sections:
+        for name, series in source[section].items():
+            into = target[section].setdefault(name, {})
+            for labels, value in series.items():
+                current = into.get(labels)
+                if isinstance(value, list):
+                    into[labels] = [a + b for a, b in zip(current, value)] if current else list(value)
+                else:
+                    into[labels] = (current or 0.0) + value
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
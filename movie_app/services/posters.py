@@ -0,0 +1,283 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import requests
+from flask import current_app, has_app_context, has_request_context, url_for
+from requests.adapters import HTTPAdapter
+
+from .memo import TTLCache
+from .tmdb import IMAGE_BASE
+
+
+logger = logging.getLogger(__name__)
+
+# TMDB's poster sizes; "original" is left out on purpose (multi-megabyte files)
+SIZES = ("w92", "w154", "w185", "w342", "w500", "w780")
+_PATH_RE = re.compile(r"^/[A-Za-z0-9_-]+\.(jpg|jpeg|png|webp)$")
+_CONTENT_TYPES = {"jpg": "image/jpeg", "jpeg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+# A cache hit refreshes the blob's mtime (its LRU position) at most this often
+_TOUCH_INTERVAL = 3600
+# Posters TMDB answered 404 for are not asked for again for this long
+_MISSING_TTL = 3600
+
+
+class PosterNotFound(Exception):
+    """The size is not served or the image does not exist upstream."""
+
+
+class PosterCache:
+    """
+    Disk cache of TMDB poster images behind the /img/<size>/<path> proxy.
+
+    Images are fetched from TMDB once (in the sizes TMDB already renders, so no
+    resizing happens here) and stored content-addressed: blobs/<sha256> holds the
+    bytes and refs/<size>/<path> names the blob for a poster. The digest doubles
+    as a strong ETag. Blob mtimes track use; when the cache grows past its cap the
+    least recently used blobs are deleted. Several workers can share the directory:
+    every write is a rename. Upstream 404s are remembered in memory for an hour, so
+    requests for missing posters do not reach TMDB each time. Configured from the
+    app config:
+      - POSTER_PROXY_ENABLED: payload poster URLs point at the proxy instead of TMDB
+      - POSTER_CACHE_DIR: cache directory (default: instance folder)
+      - POSTER_CACHE_MAX_BYTES: size cap of the blobs
+      - POSTER_PREWARM: fetch the posters of newly added movies in the background
+      - POSTER_SOURCE_BASE: where images are fetched from (default: TMDB's image CDN)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Striped locks so one worker fetches a given poster once even under concurrent requests
+        self._fetch_locks = [threading.Lock() for _ in range(64)]
+        self.enabled = False
+        self.path: Optional[str] = None
+        self.max_bytes = 256 * 1024 * 1024
+        self.prewarm_enabled = False
+        self.prewarm_size = "w185"
+        self.source_base = IMAGE_BASE
+        self.timeout = 10.0
+        self._session: Optional[requests.Session] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._bytes: Optional[int] = None
+        self._missing = TTLCache(maxsize=4096, ttl=_MISSING_TTL)
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        path = app.config.get("POSTER_CACHE_DIR") or os.path.join(app.instance_path, "posters")
+        with self._lock:
+            self.enabled = bool(app.config.get("POSTER_PROXY_ENABLED", True))
+            self.path = path
+            self.max_bytes = int(app.config.get("POSTER_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+            self.prewarm_enabled = bool(app.config.get("POSTER_PREWARM", False))
+            self.source_base = (app.config.get("POSTER_SOURCE_BASE") or IMAGE_BASE).rstrip("/")
+            self.timeout = float(app.config.get("TMDB_TIMEOUT", 10.0))
+            self._bytes = None
+            self.hits = 0
+            self.misses = 0
+        self._missing.clear()
+
+    def url(self, poster_path: Optional[str], size: str = "w185") -> Optional[str]:
+        """URL the client should load a poster from: the proxy when enabled, TMDB otherwise."""
+        if not poster_path:
+            return None
+        if not self.enabled:
+            return f"{IMAGE_BASE}/{size}{poster_path}"
+        values = {"size": size, "filename": poster_path.lstrip("/")}
+        if has_request_context():
+            # Honors SCRIPT_NAME, e.g. behind a reverse proxy mounting the app under a prefix
+            return url_for("images.poster", **values)
+        if has_app_context():
+            adapter = current_app.url_map.bind("localhost", script_name=current_app.config.get("APPLICATION_ROOT"))
+            return adapter.build("images.poster", values)
+        return f"/img/{size}{poster_path}"
+
+    # Lookup
+
+    def get(self, size: str, poster_path: str) -> Tuple[str, str, str]:
+        """
+        (file path, content type, digest) of the cached image, fetching it first on a miss.
+        Raises PosterNotFound for unknown sizes/paths and requests exceptions when the fetch fails.
+        """
+        match = _PATH_RE.match(poster_path or "")
+        if size not in SIZES or not match:
+            raise PosterNotFound(f"{size}{poster_path}")
+        content_type = _CONTENT_TYPES[match.group(1)]
+
+        found = self._lookup(size, poster_path)
+        if found:
+            self._record(hit=True)
+            return found[0], content_type, found[1]
+        with self._fetch_locks[hash((size, poster_path)) % len(self._fetch_locks)]:
+            found = self._lookup(size, poster_path)
+            if found:
+                self._record(hit=True)
+                return found[0], content_type, found[1]
+            if self._missing.get((size, poster_path)):
+                raise PosterNotFound(f"{size}{poster_path}")
+            self._record(hit=False)
+            digest = self._fetch(size, poster_path)
+        return self._blob_path(digest), content_type, digest
+
+    def _lookup(self, size: str, poster_path: str) -> Optional[Tuple[str, str]]:
+        try:
+            with open(self._ref_path(size, poster_path), "r", encoding="ascii") as f:
+                digest = f.read().strip()
+            blob = self._blob_path(digest)
+            mtime = os.stat(blob).st_mtime
+        except (OSError, ValueError):
+            return None  # never fetched, or the blob was evicted
+        if time.time() - mtime > _TOUCH_INTERVAL:
+            try:
+                os.utime(blob)
+            except OSError:
+                pass
+        return blob, digest
+
+    def _fetch(self, size: str, poster_path: str) -> str:
+        resp = self.session.get(f"{self.source_base}/{size}{poster_path}", timeout=self.timeout)
+        if resp.status_code == 404:
+            self._missing.set((size, poster_path), True)
+            raise PosterNotFound(f"{size}{poster_path}")
+        resp.raise_for_status()
+        if not resp.headers.get("Content-Type", "image/").startswith("image/"):
+            raise requests.HTTPError(f"Not an image: {size}{poster_path}", response=resp)
+        data = resp.content
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self._blob_path(digest)
+        if not os.path.exists(blob):
+            self._write(blob, data)
+            self._grow(len(data))
+        self._write(self._ref_path(size, poster_path), digest.encode("ascii"))
+        return digest
+
+    # Storage
+
+    def _blob_path(self, digest: str) -> str:
+        if not re.fullmatch(r"[0-9a-f]{64}", digest):
+            raise ValueError("bad digest")
+        return os.path.join(self.path, "blobs", digest[:2], digest)
+
+    def _ref_path(self, size: str, poster_path: str) -> str:
+        return os.path.join(self.path, "refs", size, poster_path.lstrip("/"))
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _blobs(self):
+        root = os.path.join(self.path, "blobs")
+        for dirpath, _dirs, files in os.walk(root):
+            for name in files:
+                if not name.endswith(".tmp"):
+                    full = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(full)
+                    except OSError:
+                        continue
+                    yield full, st.st_size, st.st_mtime
+
+    def _grow(self, added: int):
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._blobs())
+            else:
+                self._bytes += added
+            over = self._bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used blobs until the cache is under 90% of its cap."""
+        blobs = sorted(self._blobs(), key=lambda b: b[2])
+        total = sum(size for _, size, _ in blobs)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for full, size, _ in blobs:
+            if total <= target:
+                break
+            try:
+                os.remove(full)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._bytes = total
+        if removed:
+            # Refs to removed blobs are dropped lazily: a lookup treats them as misses
+            logger.info("Evicted %d posters from %s (%d bytes kept)", removed, self.path, total)
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._blobs())
+
+    # Pre-warming
+
+    def prewarm(self, poster_paths: Iterable[Optional[str]]):
+        """Fetch these posters in the background (no-op unless enabled). Failures are only logged."""
+        if not (self.enabled and self.prewarm_enabled):
+            return
+        paths = [p for p in poster_paths if p]
+        if not paths:
+            return
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="posters")
+        for poster_path in paths:
+            self._executor.submit(self._prewarm_one, self.prewarm_size, poster_path)
+
+    def _prewarm_one(self, size: str, poster_path: str):
+        try:
+            self.get(size, poster_path)
+        except Exception as exc:
+            logger.debug("Poster prewarm failed for %s%s: %s", size, poster_path, exc)
+
+    def wait(self):
+        """Block until queued prewarm fetches are done (tests, scripts)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # Plumbing
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    session.mount("https://", HTTPAdapter(pool_maxsize=10, max_retries=2))
+                    session.mount("http://", HTTPAdapter(pool_maxsize=10, max_retries=2))
+                    self._session = session
+        return self._session
+
+    def _record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+poster_cache = PosterCache()
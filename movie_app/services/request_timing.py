@@ -0,0 +1,175 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import tmdb
+
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar[Optional["RequestMetrics"]] = contextvars.ContextVar("request_metrics", default=None)
+_tmdb_call: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("tmdb_call", default=None)
+
+
+class RequestMetrics:
+    """Counters for one request; TMDB fan-out threads add to it concurrently."""
+
+    __slots__ = ("_lock", "started", "db_queries", "db_time", "tmdb_calls", "tmdb_time",
+                 "tmdb_requests", "cache_hits")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.tmdb_calls = 0
+        self.tmdb_time = 0.0
+        self.tmdb_requests = 0
+        self.cache_hits = 0
+
+    def add(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = time.perf_counter() - self.started
+        return {
+            "total_ms": round(total * 1000, 2),
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_time * 1000, 2),
+            "tmdb_calls": self.tmdb_calls,
+            "tmdb_ms": round(self.tmdb_time * 1000, 2),
+            "tmdb_requests": self.tmdb_requests,
+            "cache_hits": self.cache_hits,
+            # Time not spent waiting on SQL or TMDB
+            "app_ms": round(max(0.0, total - self.db_time - self.tmdb_time) * 1000, 2),
+        }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("request_timing_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current.get()
+    if metrics is None:
+        return
+    starts = conn.info.get("request_timing_started")
+    if starts:
+        metrics.add(db_queries=1, db_time=time.perf_counter() - starts.pop())
+
+
+def _tmdb_request(path, elapsed, error, from_cache):
+    metrics = _current.get()
+    if metrics is None:
+        return
+    call = _tmdb_call.get()
+    if from_cache:
+        # Inside a helper call the hit is counted once for the whole call
+        if call is None:
+            metrics.add(cache_hits=1)
+        return
+    metrics.add(tmdb_requests=1)
+    if call is not None:
+        call[0] += 1
+
+
+def _tmdb_helper_call(name):
+    """A public TMDB helper started: time it as one "tmdb" call (nested helper calls are not counted again)."""
+    metrics = _current.get()
+    if metrics is None or _tmdb_call.get() is not None:
+        return None
+    network_requests = [0]
+    token = _tmdb_call.set(network_requests)
+    started = time.perf_counter()
+
+    def finished():
+        _tmdb_call.reset(token)
+        # A helper call that never reached the network was served by the memo or HTTP cache
+        metrics.add(tmdb_calls=1, tmdb_time=time.perf_counter() - started,
+                    cache_hits=0 if network_requests[0] else 1)
+
+    return finished
+
+
+class RequestTiming:
+    """
+    Per-request performance breakdown, enabled with REQUEST_TIMING_ENABLED.
+
+    Counts SQL statements and their time (SQLAlchemy cursor events), TMDB helper
+    calls and their wall time, TMDB network requests, and cache hits (TMDB memo
+    or HTTP cache, and X-Cache: HIT responses). The totals go out as a
+    Server-Timing header and one structured "request_timing" log line.
+
+    Nothing is installed until an app enables it, so the default costs nothing;
+    once installed, the hooks return immediately outside timed requests.
+    """
+
+    def __init__(self):
+        self._hooks_installed = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        if not app.config.get("REQUEST_TIMING_ENABLED"):
+            return
+        self._install_hooks()
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._reset)
+
+    def _install_hooks(self):
+        with self._lock:
+            if self._hooks_installed:
+                return
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            tmdb.client.add_listener(_tmdb_request)
+            tmdb.client.add_call_listener(_tmdb_helper_call)
+            self._hooks_installed = True
+
+    @staticmethod
+    def _start():
+        g._request_timing_token = _current.set(RequestMetrics())
+
+    @staticmethod
+    def _finish(response):
+        metrics = _current.get()
+        if metrics is None:
+            return response
+        if response.headers.get("X-Cache") == "HIT":
+            metrics.add(cache_hits=1)
+        data = metrics.as_dict()
+        response.headers["Server-Timing"] = ", ".join([
+            f'db;dur={data["db_ms"]};desc="{data["db_queries"]} queries"',
+            f'tmdb;dur={data["tmdb_ms"]};desc="{data["tmdb_calls"]} calls"',
+            f'tmdb-net;desc="{data["tmdb_requests"]} requests"',
+            f'cache;desc="{data["cache_hits"]} hits"',
+            f'app;dur={data["app_ms"]}',
+            f'total;dur={data["total_ms"]}',
+        ])
+        logger.info("request_timing %s", json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            **data,
+        }, separators=(",", ":")))
+        return response
+
+    @staticmethod
+    def _reset(exc=None):
+        token = g.pop("_request_timing_token", None)
+        if token is not None:
+            _current.reset(token)
+
+
+request_timing = RequestTiming()
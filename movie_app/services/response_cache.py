@@ -0,0 +1,184 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional
+
+from .memo import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """Per-process LRU with TTL; each gunicorn worker keeps its own copy."""
+
+    def __init__(self, max_entries: int, ttl: float, path: Optional[str] = None):
+        self._cache = TTLCache(maxsize=max_entries, ttl=ttl)
+
+    def get(self, version: int, key: str) -> Optional[Any]:
+        return self._cache.get((version, key))
+
+    def set(self, version: int, key: str, value: Any):
+        self._cache.set((version, key), value)
+
+    def clear(self):
+        self._cache.clear()
+
+    def size(self) -> int:
+        return len(self._cache)
+
+
+class FilesystemBackend:
+    """
+    JSON files shared by every worker on the host: <path>/<version>/<key digest>.json.
+    Writing the first entry of a new version removes the directories of older versions.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, path: Optional[str] = None):
+        if not path:
+            raise ValueError("The filesystem response cache needs a path")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._current_version: Optional[int] = None
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, version: int, key: str) -> str:
+        return os.path.join(self.path, str(int(version)), f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json")
+
+    def get(self, version: int, key: str) -> Optional[Any]:
+        path = self._file(version, key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, version: int, key: str, value: Any):
+        path = self._file(version, key)
+        directory = os.path.dirname(path)
+        if self._current_version != version:
+            self._current_version = version
+            self._drop_other_versions(version)
+        os.makedirs(directory, exist_ok=True)
+        if len(os.listdir(directory)) >= self.max_entries:
+            return
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def _drop_other_versions(self, version: int):
+        for name in os.listdir(self.path):
+            if name.isdigit() and int(name) < version:
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    def clear(self):
+        for name in os.listdir(self.path):
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+        self._current_version = None
+
+    def size(self) -> int:
+        if self._current_version is None:
+            return 0
+        try:
+            return len(os.listdir(os.path.join(self.path, str(self._current_version))))
+        except OSError:
+            return 0
+
+
+BACKENDS = {"memory": MemoryBackend, "filesystem": FilesystemBackend, "none": None}
+
+
+class ResponseCache:
+    """
+    Cache of whole JSON payloads for the library read endpoints.
+
+    Entries are keyed by the library version plus a caller-supplied key, so any
+    write to movies, reviews or tags (which bumps the version) makes every older
+    entry unreachable at once. Configured from the app config:
+      - RESPONSE_CACHE_BACKEND: memory (per process), filesystem (shared across workers) or none
+      - RESPONSE_CACHE_PATH: directory for the filesystem backend (default: instance folder)
+      - RESPONSE_CACHE_MAX_ENTRIES / RESPONSE_CACHE_TTL: size cap and seconds per entry
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.backend_name = "memory"
+        self._backend = MemoryBackend(512, 600)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._backend is not None
+
+    def init_app(self, app):
+        name = (app.config.get("RESPONSE_CACHE_BACKEND") or "memory").lower()
+        if name not in BACKENDS:
+            raise ValueError(f"RESPONSE_CACHE_BACKEND must be one of {', '.join(BACKENDS)}, got {name!r}")
+        path = app.config.get("RESPONSE_CACHE_PATH")
+        if not path and name == "filesystem":
+            path = os.path.join(app.instance_path, "response_cache")
+        backend_cls = BACKENDS[name]
+        self.backend_name = name
+        self._backend = backend_cls(
+            max_entries=int(app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 512)),
+            ttl=float(app.config.get("RESPONSE_CACHE_TTL", 600)),
+            path=path,
+        ) if backend_cls else None
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def make_key(parts: Dict[str, Hashable]) -> str:
+        return json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+
+    def get(self, version: int, key: str) -> Optional[Any]:
+        if not self._backend:
+            return None
+        try:
+            value = self._backend.get(version, key)
+        except Exception:
+            logger.exception("Response cache read failed")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, version: int, key: str, value: Any):
+        if not self._backend:
+            return
+        try:
+            self._backend.set(version, key, value)
+        except Exception:
+            logger.exception("Response cache write failed")
+
+    def clear(self):
+        if self._backend:
+            self._backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": self.backend_name,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": self._backend.size() if self._backend else 0,
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,249 @@
+import difflib
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, text
+
+from ..extensions import db
+
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchIndex:
+    """
+    Ranked full-text index over movie title, original title, overview and tag names.
+
+    The implementation is chosen by dialect:
+      - SQLite: an FTS5 table (rowid = movie id) ranked with bm25, plus an
+        fts5vocab table used to correct misspelled terms when nothing matches.
+      - PostgreSQL: a movie_search table with a weighted tsvector (GIN) and a
+        pg_trgm index on the titles for typo-tolerant matching.
+    Any other backend (or SQLite without FTS5) falls back to ILIKE matching.
+
+    Rows are written by index_movies()/remove_movies() inside the caller's
+    transaction, so the index commits or rolls back with the change itself.
+    """
+
+    # Column weights for bm25 on SQLite: title, original_title, overview, tags
+    BM25_WEIGHTS = (10.0, 8.0, 1.0, 4.0)
+
+    def __init__(self):
+        self.kind: Optional[str] = None  # "fts5", "postgres" or None
+        self.trigram = False
+
+    # Setup
+
+    def ensure_ready(self):
+        """Create the index structures if needed and rebuild them when out of sync with movies."""
+        dialect = db.engine.dialect.name
+        try:
+            if dialect == "sqlite":
+                self._create_sqlite()
+                self.kind = "fts5"
+            elif dialect == "postgresql":
+                self._create_postgres()
+                self.kind = "postgres"
+            else:
+                self.kind = None
+                return
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Full-text index unavailable; falling back to ILIKE search")
+            self.kind = None
+            return
+
+        indexed = db.session.execute(text(f"SELECT count(*) FROM {self._table}")).scalar() or 0
+        movies = db.session.execute(text("SELECT count(*) FROM movies")).scalar() or 0
+        if indexed != movies:
+            self.rebuild()
+
+    @property
+    def _table(self) -> str:
+        return "movies_fts" if self.kind == "fts5" else "movie_search"
+
+    def _create_sqlite(self):
+        db.session.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5("
+            "title, original_title, overview, tags, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        db.session.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts_vocab USING fts5vocab(movies_fts, 'row')"
+        ))
+
+    def _create_postgres(self):
+        try:
+            with db.session.begin_nested():
+                db.session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            self.trigram = True
+        except Exception:
+            logger.warning("pg_trgm extension unavailable; typo tolerance disabled")
+            self.trigram = False
+        db.session.execute(text(
+            "CREATE TABLE IF NOT EXISTS movie_search ("
+            "movie_id INTEGER PRIMARY KEY REFERENCES movies(id) ON DELETE CASCADE, "
+            "titles TEXT NOT NULL DEFAULT '', "
+            "document TSVECTOR NOT NULL)"
+        ))
+        db.session.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_movie_search_document ON movie_search USING GIN (document)"
+        ))
+        if self.trigram:
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_movie_search_titles_trgm ON movie_search USING GIN (titles gin_trgm_ops)"
+            ))
+
+    # Maintenance
+
+    def rebuild(self, batch_size: int = 500):
+        """Re-index every movie from scratch."""
+        if not self.kind:
+            return
+        db.session.execute(text(f"DELETE FROM {self._table}"))
+        ids = [row[0] for row in db.session.execute(text("SELECT id FROM movies ORDER BY id"))]
+        for i in range(0, len(ids), batch_size):
+            self.index_movies(ids[i:i + batch_size])
+        db.session.commit()
+        logger.info("Rebuilt full-text index for %d movies", len(ids))
+
+    def index_movies(self, movie_ids: Iterable[int]):
+        """(Re)index the given movies within the current transaction."""
+        ids = list({int(i) for i in movie_ids})
+        if not self.kind or not ids:
+            return
+        docs = self._documents(ids)
+        self.remove_movies(ids)
+        if not docs:
+            return
+        if self.kind == "fts5":
+            db.session.execute(
+                text(
+                    "INSERT INTO movies_fts (rowid, title, original_title, overview, tags) "
+                    "VALUES (:id, :title, :original_title, :overview, :tags)"
+                ),
+                docs,
+            )
+        else:
+            db.session.execute(
+                text(
+                    "INSERT INTO movie_search (movie_id, titles, document) VALUES (:id, :titles, "
+                    "setweight(to_tsvector('simple', :title), 'A') || "
+                    "setweight(to_tsvector('simple', :original_title), 'A') || "
+                    "setweight(to_tsvector('simple', :tags), 'B') || "
+                    "setweight(to_tsvector('simple', :overview), 'C'))"
+                ),
+                [{**d, "titles": f"{d['title']} {d['original_title']}".strip()} for d in docs],
+            )
+
+    def remove_movies(self, movie_ids: Iterable[int]):
+        ids = [int(i) for i in movie_ids]
+        if not self.kind or not ids:
+            return
+        key = "rowid" if self.kind == "fts5" else "movie_id"
+        stmt = text(f"DELETE FROM {self._table} WHERE {key} IN :ids").bindparams(bindparam("ids", expanding=True))
+        db.session.execute(stmt, {"ids": ids})
+
+    def _documents(self, ids: List[int]) -> List[Dict[str, object]]:
+        from ..models.movie import Movie
+        from ..models.tag import Tag, MovieTag
+
+        tags: Dict[int, List[str]] = {}
+        for movie_id, name in (
+            db.session.query(MovieTag.movie_id, Tag.name).join(Tag, Tag.id == MovieTag.tag_id)
+            .filter(MovieTag.movie_id.in_(ids)).all()
+        ):
+            tags.setdefault(movie_id, []).append(name)
+        rows = (
+            db.session.query(Movie.id, Movie.title, Movie.original_title, Movie.overview)
+            .filter(Movie.id.in_(ids)).all()
+        )
+        return [
+            {
+                "id": movie_id,
+                "title": title or "",
+                "original_title": original_title or "",
+                "overview": overview or "",
+                "tags": " ".join(tags.get(movie_id, [])),
+            }
+            for movie_id, title, original_title, overview in rows
+        ]
+
+    # Queries
+
+    def search(self, query: str, limit: int = 20) -> Optional[List[int]]:
+        """
+        Movie ids matching query, best first. Every term must match, the last
+        one as a prefix (typeahead). Returns None when no index is available.
+        """
+        if not self.kind:
+            return None
+        terms = [t.lower() for t in _TOKEN_RE.findall(query or "")]
+        if not terms:
+            return []
+        if self.kind == "fts5":
+            return self._search_sqlite(terms, limit)
+        return self._search_postgres(query, terms, limit)
+
+    def _search_sqlite(self, terms: List[str], limit: int) -> List[int]:
+        ids = self._fts_match(self._fts_expression([[t] for t in terms]), limit)
+        if ids:
+            return ids
+        # Nothing matched: widen each term with close spellings from the index vocabulary
+        groups = [[t] + self._similar_terms(t) for t in terms]
+        if all(len(g) == 1 for g in groups):
+            return []
+        return self._fts_match(self._fts_expression(groups), limit)
+
+    @staticmethod
+    def _fts_expression(groups: List[List[str]]) -> str:
+        parts = []
+        for i, group in enumerate(groups):
+            last = i == len(groups) - 1
+            alternatives = [f'"{t}"*' if last else f'"{t}"' for t in group]
+            parts.append(alternatives[0] if len(alternatives) == 1 else f"({' OR '.join(alternatives)})")
+        return " ".join(parts)
+
+    def _fts_match(self, expression: str, limit: int) -> List[int]:
+        weights = ", ".join(str(w) for w in self.BM25_WEIGHTS)
+        rows = db.session.execute(
+            text(
+                f"SELECT rowid FROM movies_fts WHERE movies_fts MATCH :q "
+                f"ORDER BY bm25(movies_fts, {weights}) LIMIT :limit"
+            ),
+            {"q": expression, "limit": limit},
+        )
+        return [row[0] for row in rows]
+
+    def _similar_terms(self, term: str, n: int = 3) -> List[str]:
+        if len(term) < 3:
+            return []
+        # Only compare against vocabulary sharing the first letter, to keep the scan small
+        rows = db.session.execute(
+            text("SELECT term FROM movies_fts_vocab WHERE term >= :lo AND term < :hi"),
+            {"lo": term[0], "hi": chr(ord(term[0]) + 1)},
+        )
+        vocabulary = [row[0] for row in rows]
+        return [t for t in difflib.get_close_matches(term, vocabulary, n=n, cutoff=0.75) if t != term]
+
+    def _search_postgres(self, query: str, terms: List[str], limit: int) -> List[int]:
+        tsquery = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+        if self.trigram:
+            sql = (
+                "SELECT movie_id FROM movie_search, to_tsquery('simple', :tsq) q "
+                "WHERE document @@ q OR titles % :raw "
+                "ORDER BY ts_rank(document, q) + similarity(titles, :raw) DESC LIMIT :limit"
+            )
+        else:
+            sql = (
+                "SELECT movie_id FROM movie_search, to_tsquery('simple', :tsq) q "
+                "WHERE document @@ q ORDER BY ts_rank(document, q) DESC LIMIT :limit"
+            )
+        rows = db.session.execute(text(sql), {"tsq": tsquery, "raw": query, "limit": limit})
+        return [row[0] for row in rows]
+
+
+search_index = SearchIndex()
@@ -0,0 +1,295 @@
+import codecs
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ..extensions import db
+from . import library, tmdb
+from .backfill import TokenBucket
+
+
+logger = logging.getLogger(__name__)
+
+_IMDB_ID_RE = re.compile(r"^tt\d+$")
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class _JSONStreamReader:
+    """Pull-style reader over a JSON text stream that decodes one value at a time."""
+
+    def __init__(self, fp, chunk_size: int = 65536):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+        self._bytes = codecs.getincrementaldecoder("utf-8-sig")()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = self._bytes.decode(chunk, final=not chunk)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so memory stays bounded by the current value
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def next_char(self) -> str:
+        ch = self.peek()
+        self.pos += 1
+        return ch
+
+    def expect(self, ch: str):
+        found = self.next_char()
+        if found != ch:
+            raise ValueError(f"Expected {ch!r} in JSON input, found {found!r}")
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+                # A number cut off at the buffer edge ("12" of "12.5") may continue in the next chunk
+                if self.eof or (end < len(self.buf) and self.buf[end] not in _NUMBER_CHARS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def iter_json_array(fp, key: str, chunk_size: int = 65536) -> Iterator[Any]:
+    """
+    Yield the elements of the array stored under `key` in the top-level JSON
+    object read from fp (text or binary). Elements are decoded one at a time,
+    and sibling values are decoded and dropped, so the whole document is never
+    held in memory. Yields nothing when the key is absent.
+    """
+    reader = _JSONStreamReader(fp, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        if not isinstance(name, str):
+            raise ValueError("Expected an object key in JSON input")
+        reader.expect(":")
+        if name == key:
+            reader.expect("[")
+            if reader.peek() == "]":
+                return
+            while True:
+                yield reader.value()
+                sep = reader.next_char()
+                if sep == "]":
+                    return
+                if sep != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, found {sep!r}")
+        reader.value()
+        sep = reader.next_char()
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError(f"Expected ',' or '}}' in JSON object, found {sep!r}")
+
+
+def library_entries(fp, chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+    """
+    Normalized items from a Stremio export's `library` section:
+    {"imdb_id", "name", "year", "type", "removed"}.
+    """
+    for item in iter_json_array(fp, "library", chunk_size):
+        if not isinstance(item, dict):
+            continue
+        # Newer exports wrap the library item in "d"; older ones are flat
+        data = item.get("d") if isinstance(item.get("d"), dict) else item
+        year = str(data.get("year") or "")[:4]
+        yield {
+            "imdb_id": str(data.get("_id") or item.get("__id") or ""),
+            "name": data.get("name") or "",
+            "year": int(year) if year.isdigit() else None,
+            "type": data.get("type") or item.get("type") or "",
+            "removed": bool(data.get("removed")),
+        }
+
+
+class StremioImport:
+    """
+    Import the movies of a Stremio library export into the library.
+
+    Entries are read incrementally and handled in chunks of `chunk_size`:
+      1. IMDb ids resolve to TMDB ids via /find, concurrently behind a token bucket
+      2. ids already in the library are filtered out with one query per chunk
+      3. details for the remaining movies are fetched the same way
+      4. the new movies are inserted and committed as one transaction per chunk
+
+    run() returns {"summary": {...}, "items": [...], "next_offset": ...}, with one
+    item per entry in export order and a status of added, exists, skipped or failed
+    (plus a reason).
+
+    offset and limit import a slice of the export's entries, so a long import can
+    be split over several calls: entries before offset are only read (to recognize
+    duplicates), and after limit entries next_offset is the offset to continue
+    from. It is None once the export is done.
+    """
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        workers: int = 8,
+        chunk_size: int = 50,
+        include_removed: bool = False,
+        added_by: Optional[int] = None,
+        report: Optional[Callable[[Dict[str, Any]], None]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ):
+        self.limiter = TokenBucket(rate)
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.include_removed = include_removed
+        self.added_by = added_by
+        self.report = report
+        self.offset = max(0, offset)
+        self.limit = limit if limit is None else max(1, limit)
+        self.next_offset: Optional[int] = None
+        self.items: List[Dict[str, Any]] = []
+        self._seen_imdb = set()
+        self._seen_tmdb = set()
+
+    def run(self, fp) -> Dict[str, Any]:
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="stremio-import") as pool:
+            pending: List[Dict[str, Any]] = []
+            for index, entry in enumerate(library_entries(fp)):
+                if index < self.offset:
+                    self._skip_reason(entry)
+                    continue
+                if self.limit is not None and len(self.items) >= self.limit:
+                    self.next_offset = index
+                    break
+                item = {"imdb_id": entry["imdb_id"], "name": entry["name"], "status": None}
+                self.items.append(item)
+                reason = self._skip_reason(entry)
+                if reason:
+                    self._finish(item, "skipped", reason=reason)
+                    continue
+                pending.append(item)
+                if len(pending) >= self.chunk_size:
+                    self._process_chunk(pool, pending)
+                    pending = []
+            if pending:
+                self._process_chunk(pool, pending)
+
+        summary = {"total": len(self.items)}
+        for status in ("added", "exists", "skipped", "failed"):
+            summary[status] = sum(1 for item in self.items if item["status"] == status)
+        return {"summary": summary, "items": self.items, "next_offset": self.next_offset}
+
+    def _skip_reason(self, entry: Dict[str, Any]) -> Optional[str]:
+        if entry["type"] != "movie":
+            return f"not a movie ({entry['type'] or 'unknown type'})"
+        if entry["removed"] and not self.include_removed:
+            return "removed from the Stremio library"
+        if not _IMDB_ID_RE.match(entry["imdb_id"]):
+            return "not an IMDb id"
+        if entry["imdb_id"] in self._seen_imdb:
+            return "duplicate entry in export"
+        self._seen_imdb.add(entry["imdb_id"])
+        return None
+
+    def _rate_limited(self, fn, *args):
+        self.limiter.acquire()
+        try:
+            return fn(*args), None
+        except Exception as exc:
+            return None, exc
+
+    def _process_chunk(self, pool: ThreadPoolExecutor, items: List[Dict[str, Any]]):
+        # 1. IMDb -> TMDB
+        found = pool.map(lambda item: self._rate_limited(tmdb.find_by_imdb, item["imdb_id"]), items)
+        resolved = []
+        for item, (match, error) in zip(items, found):
+            if error is not None:
+                self._finish(item, "failed", reason=f"TMDB lookup failed: {error}")
+            elif not match or not match.get("tmdb_id"):
+                self._finish(item, "skipped", reason="no TMDB movie for this IMDb id")
+            else:
+                item["tmdb_id"] = int(match["tmdb_id"])
+                resolved.append(item)
+
+        # 2. Deduplicate against the library (one query) and within the export
+        existing = library.existing_tmdb_ids(item["tmdb_id"] for item in resolved)
+        new_items = []
+        for item in resolved:
+            if item["tmdb_id"] in existing:
+                self._finish(item, "exists", movie_id=existing[item["tmdb_id"]])
+            elif item["tmdb_id"] in self._seen_tmdb:
+                self._finish(item, "skipped", reason="same TMDB movie as an earlier entry")
+            else:
+                self._seen_tmdb.add(item["tmdb_id"])
+                new_items.append(item)
+
+        # 3. Details for the new movies
+        fetched = pool.map(lambda item: self._rate_limited(tmdb.movie_details, item["tmdb_id"]), new_items)
+        to_add = []
+        for item, (md, error) in zip(new_items, fetched):
+            if error is not None or not md:
+                self._finish(item, "failed", reason="failed to fetch movie details")
+            else:
+                to_add.append((item, md))
+
+        # 4. Insert the chunk in one transaction
+        self._insert(to_add)
+
+    def _insert(self, to_add):
+        if not to_add:
+            return
+        try:
+            movies = library.add_movies([md for _, md in to_add], added_by=self.added_by)
+            # Read before commit expires them, and drop them from the session afterwards
+            added = [(movie.id, movie.title) for movie in movies]
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            if len(to_add) > 1:
+                # Find the offending rows without losing the rest of the chunk
+                logger.warning("Stremio import: chunk insert failed, retrying %d movies one by one", len(to_add))
+                for pair in to_add:
+                    self._insert([pair])
+                return
+            logger.exception("Stremio import: failed to add %s", to_add[0][0]["imdb_id"])
+            self._finish(to_add[0][0], "failed", reason="database error")
+            return
+        for movie in movies:
+            db.session.expunge(movie)
+        for (item, _), (movie_id, title) in zip(to_add, added):
+            self._finish(item, "added", movie_id=movie_id, title=title)
+
+    def _finish(self, item: Dict[str, Any], status: str, **fields):
+        item["status"] = status
+        item.update(fields)
+        if self.report:
+            self.report(item)
+
+
+def import_stremio_library(fp, **kwargs) -> Dict[str, Any]:
+    """Convenience wrapper: build a StremioImport and run it on fp."""
+    return StremioImport(**kwargs).run(fp)
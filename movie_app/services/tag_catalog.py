@@ -0,0 +1,132 @@
+import bisect
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..extensions import db
+
+
+_GRAM = 3
+
+
+def is_valid_tag_name(name: Any) -> bool:
+    # Require a non-empty string with at least one letter
+    return isinstance(name, str) and bool(name.strip()) and bool(re.search(r"[A-Za-z]", name))
+
+
+class _Snapshot:
+    """
+    Immutable view of every tag: predefined tags first (in their declared
+    order), then custom tags alphabetically, each with its resolved color.
+
+    - prefix index: lowercased names sorted for bisect lookups
+    - substring index: every 1..3 character gram -> ids of the names containing it
+    """
+
+    def __init__(self, tags: List[Dict[str, str]], custom_start: int, version: int, loaded_at: float):
+        self.tags = tags
+        self.custom_start = custom_start
+        self.version = version
+        self.loaded_at = loaded_at
+        self._lower = [t["name"].lower() for t in tags]
+        self._sorted = sorted((name, i) for i, name in enumerate(self._lower))
+        self._sorted_names = [name for name, _ in self._sorted]
+        grams: Dict[str, set] = {}
+        for i, name in enumerate(self._lower):
+            for size in range(1, _GRAM + 1):
+                for start in range(len(name) - size + 1):
+                    grams.setdefault(name[start:start + size], set()).add(i)
+        self._grams = grams
+
+    def prefix_ids(self, q: str) -> List[int]:
+        lo = bisect.bisect_left(self._sorted_names, q)
+        ids = []
+        for name, i in self._sorted[lo:]:
+            if not name.startswith(q):
+                break
+            ids.append(i)
+        return ids
+
+    def substring_ids(self, q: str) -> List[int]:
+        if len(q) <= _GRAM:
+            return list(self._grams.get(q, ()))
+        # Start from the rarest gram of the query, then verify the full substring
+        postings = [self._grams.get(q[i:i + _GRAM], set()) for i in range(len(q) - _GRAM + 1)]
+        candidates = min(postings, key=len)
+        return [i for i in candidates if q in self._lower[i]]
+
+    def search(self, q: str, limit: int) -> List[Dict[str, str]]:
+        q = q.lower()
+        if not q:
+            return self.tags[:limit]
+        prefix = set(self.prefix_ids(q))
+        ids = prefix.union(self.substring_ids(q))
+        # Predefined before custom, prefix matches before substring matches, then catalog order
+        ranked = sorted(ids, key=lambda i: (i >= self.custom_start, i not in prefix, i))
+        return [self.tags[i] for i in ranked[:limit]]
+
+
+class TagCatalog:
+    """
+    Process-local catalog of predefined and user-created tags for autocomplete.
+
+    Built from a single query on first use and served from memory afterwards.
+    invalidate() bumps the version so the next read rebuilds it; `ttl` bounds
+    how long tags created by other worker processes can stay invisible.
+    """
+
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self.version = 0
+        self.loads = 0
+
+    def init_app(self, app):
+        self.ttl = float(app.config.get("TAG_CATALOG_TTL", 300))
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._snapshot = None
+
+    def all(self) -> List[Dict[str, str]]:
+        return self._current().tags
+
+    def search(self, q: str, limit: int = 20) -> List[Dict[str, str]]:
+        return self._current().search((q or "").strip(), limit)
+
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and self._clock() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or self._clock() - snapshot.loaded_at >= self.ttl:
+                snapshot = self._load(self.version)
+                self._snapshot = snapshot
+            return snapshot
+
+    def _load(self, version: int) -> _Snapshot:
+        from ..models.tag import Tag, PREDEFINED_TAGS, PREDEFINED_TAG_COLORS, DEFAULT_TAG_COLOR
+
+        tags: List[Dict[str, str]] = []
+        seen = set()
+        for t in PREDEFINED_TAGS:
+            name = t.get("name")
+            if is_valid_tag_name(name) and name not in seen:
+                tags.append({"name": name, "color": t.get("color")})
+                seen.add(name)
+        custom_start = len(tags)
+        for name, color in db.session.query(Tag.name, Tag.color).order_by(Tag.name.asc()).all():
+            if is_valid_tag_name(name) and name not in seen:
+                tags.append({"name": name, "color": color or PREDEFINED_TAG_COLORS.get(name, DEFAULT_TAG_COLOR)})
+                seen.add(name)
+        self.loads += 1
+        return _Snapshot(tags, custom_start, version, self._clock())
+
+
+tag_catalog = TagCatalog()
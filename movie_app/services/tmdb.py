@@ -1,39 +1,317 @@
+import atexit
+import contextvars
+import logging
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
 from typing import Dict, Any, List, Optional, Tuple
 
 import requests
 from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import http_cache
+from .memo import TTLCache, Uncached, memoize
+from . import tmdb_fixtures
 
 
 TMDB_API_BASE = "https://api.themoviedb.org/3"
 IMAGE_BASE = "https://image.tmdb.org/t/p"
 
+logger = logging.getLogger(__name__)
+
 
-def _auth_headers() -> Dict[str, str]:
+class TMDBClient:
     """
-    Prefer Bearer token if available; otherwise return empty headers and rely on api_key query.
+    Shared HTTP client for the TMDB API.
+
+    One pooled keep-alive session per process, with retries (and backoff) on
+    429/5xx and per-call timing. Auth is resolved once from the app config
+    instead of on every request. Configure it with init_app(app), or with
+    configure(...) directly, e.g. to point base_url at a local stub server.
+
+    Independent calls can be fanned out with submit(), which runs them on a
+    bounded worker pool shared by the process (inline when max_workers <= 1).
+
+    Listeners added with add_listener(fn) are called after every GET as
+    fn(path, elapsed_seconds, error, from_cache): error is the exception raised
+    (None on success) and from_cache is None without an HTTP cache. Call
+    listeners added with add_call_listener(fn) are called as fn(name) when one
+    of the module's public helpers (search_movies, movie_details, ...) starts,
+    memo hits included, and may return a callable to run once it returns.
+
+    With a replay transport (TMDB_MODE=replay) GETs are answered from recorded
+    fixtures instead of the network, without retries; with a recorder
+    (TMDB_MODE=record) live answers are also written to the fixture store.
+    See tmdb_fixtures.
     """
-    token = current_app.config.get("TMDB_BEARER_TOKEN") or os.getenv("TMDB_BEARER_TOKEN", "")
-    headers = {}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    return headers
 
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._configured = False
+        self.base_url = TMDB_API_BASE
+        self.timeout = 10.0
+        self.pool_size = 10
+        self.max_retries = 2
+        self.backoff_factor = 0.3
+        self.max_workers = 8
+        self._session_factory = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._headers: Dict[str, str] = {}
+        self._params: Dict[str, str] = {}
+        self._stats = {"calls": 0, "errors": 0, "total_time": 0.0}
+        self._listeners = []
+        self._call_listeners = []
+        self._replay: Optional[tmdb_fixtures.ReplayTransport] = None
+        self._recorder: Optional[tmdb_fixtures.FixtureStore] = None
+
+    def init_app(self, app):
+        replay, recorder = tmdb_fixtures.from_config(app.config)
+        if recorder is not None:
+            # The dev server may never call close(); keep what was recorded anyway
+            atexit.register(recorder.save)
+        self.configure(
+            base_url=app.config.get("TMDB_API_BASE") or TMDB_API_BASE,
+            bearer_token=app.config.get("TMDB_BEARER_TOKEN") or os.getenv("TMDB_BEARER_TOKEN", ""),
+            api_key=app.config.get("TMDB_API_KEY") or os.getenv("TMDB_API_KEY", ""),
+            timeout=app.config.get("TMDB_TIMEOUT", 10.0),
+            pool_size=app.config.get("TMDB_POOL_SIZE", 10),
+            max_retries=app.config.get("TMDB_MAX_RETRIES", 2),
+            backoff_factor=app.config.get("TMDB_RETRY_BACKOFF", 0.3),
+            max_workers=app.config.get("TMDB_MAX_WORKERS", 8),
+            session_factory=http_cache.create_session if http_cache.enabled else None,
+            replay=replay,
+            recorder=recorder,
+        )
+
+    def configure(
+        self,
+        base_url: str = TMDB_API_BASE,
+        bearer_token: str = "",
+        api_key: str = "",
+        timeout: float = 10.0,
+        pool_size: int = 10,
+        max_retries: int = 2,
+        backoff_factor: float = 0.3,
+        max_workers: int = 8,
+        session_factory=None,
+        replay: Optional[tmdb_fixtures.ReplayTransport] = None,
+        recorder: Optional[tmdb_fixtures.FixtureStore] = None,
+    ):
+        """
+        session_factory, if given, builds the underlying requests.Session
+        (e.g. a CachedSession); the pool adapter and auth are applied on top.
+        replay answers every GET from fixtures; recorder saves live answers.
+        """
+        with self._lock:
+            self.base_url = base_url.rstrip("/")
+            self.timeout = float(timeout)
+            self.pool_size = int(pool_size)
+            self.max_retries = int(max_retries)
+            self.backoff_factor = float(backoff_factor)
+            self.max_workers = int(max_workers)
+            self._session_factory = session_factory
+            if self._recorder is not None and self._recorder is not recorder:
+                self._recorder.save()
+            self._replay = replay
+            self._recorder = recorder
+            # Prefer Bearer token if available; otherwise rely on the api_key query param
+            self._headers = {"Authorization": f"Bearer {bearer_token}"} if bearer_token else {}
+            self._params = {"api_key": api_key} if api_key and not bearer_token else {}
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = None
+            self._configured = True
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+        session = self._session_factory() if self._session_factory else requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(self._headers)
+        return session
+
+    def _ensure_configured(self):
+        if not self._configured:
+            self.init_app(current_app)
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        GET a TMDB API path (e.g. "/movie/603") and return the decoded JSON body.
+        Raises requests exceptions on transport errors and non-2xx responses.
+        """
+        self._ensure_configured()
+        started = time.perf_counter()
+        ok = False
+        error = None
+        from_cache = None
+        try:
+            if self._replay is not None:
+                data = self._replay.get(path, params)
+                ok = True
+                return data
+            resp = self.session.get(
+                f"{self.base_url}{path}",
+                params={**(params or {}), **self._params},
+                timeout=self.timeout,
+            )
+            from_cache = getattr(resp, "from_cache", None)
+            if from_cache is not None:
+                http_cache.record(from_cache)
+            # Not-found answers are as replayable as hits; throttling and server errors are not
+            if self._recorder is not None and (resp.ok or resp.status_code == 404):
+                self._recorder.put(path, params, resp.status_code, resp.text)
+            resp.raise_for_status()
+            data = resp.json() or {}
+            ok = True
+            return data
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._stats["calls"] += 1
+                self._stats["total_time"] += elapsed
+                if not ok:
+                    self._stats["errors"] += 1
+            logger.debug("TMDB GET %s %s in %.1fms", path, "ok" if ok else "failed", elapsed * 1000)
+            for listener in self._listeners:
+                listener(path, elapsed, error, from_cache)
+
+    def add_listener(self, fn):
+        if fn not in self._listeners:
+            self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def add_call_listener(self, fn):
+        if fn not in self._call_listeners:
+            self._call_listeners.append(fn)
+
+    def remove_call_listener(self, fn):
+        if fn in self._call_listeners:
+            self._call_listeners.remove(fn)
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """
+        Run fn(*args, **kwargs) on the shared worker pool and return its Future.
+        The callable must not need an app context; the client is configured up front.
+        It runs in a copy of the caller's contextvars, so per-request state follows it.
+        """
+        self._ensure_configured()
+        if self.max_workers <= 1:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tmdb")
+        return self._executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self):
+        """Close the session and worker pool, saving anything recorded."""
+        if self._recorder is not None:
+            self._recorder.save()
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+client = TMDBClient()
+
+# In-process memo of final lookup results, in front of the HTTP cache. Serves
+# repeated typeahead searches and re-adds without re-parsing or re-ranking.
+memo_caches: Dict[str, TTLCache] = {
+    "search_movies": TTLCache(maxsize=512, ttl=3600),
+    "movie_details": TTLCache(maxsize=512, ttl=3600),
+    "search_person": TTLCache(maxsize=256, ttl=3600),
+    "director_movie_ids": TTLCache(maxsize=256, ttl=3600),
+}
+
+
+def init_app(app):
+    """Configure the shared TMDB client and memo caches from the app config."""
+    client.init_app(app)
+    for cache in memo_caches.values():
+        cache.configure(maxsize=app.config.get("TMDB_MEMO_SIZE", 512), ttl=app.config.get("TMDB_MEMO_TTL", 3600))
+
+
+def _helper(fn):
+    """Report calls of a public helper to the client's call listeners."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not client._call_listeners:
+            return fn(*args, **kwargs)
+        finishers = [f for f in (listener(fn.__name__) for listener in client._call_listeners) if f]
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            for finish in reversed(finishers):
+                finish()
+
+    return wrapper
 
-def _api_key_param() -> Dict[str, str]:
-    """
-    Provide api_key param if no bearer token provided.
-    """
-    if "Authorization" in _auth_headers():
-        return {}
-    api_key = current_app.config.get("TMDB_API_KEY") or os.getenv("TMDB_API_KEY", "")
-    return {"api_key": api_key} if api_key else {}
+
+def memo_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: cache.stats() for name, cache in memo_caches.items()}
+
+
+def clear_memo():
+    """Drop every memoized lookup and start the hit/miss counters over."""
+    for cache in memo_caches.values():
+        cache.clear()
+        cache.reset_stats()
+
+
+def _normalize_query(s: Optional[str]) -> str:
+    """Case- and whitespace-insensitive form of a free-text lookup, used for memo keys."""
+    return " ".join((s or "").lower().split())
 
 
 def _image_url(path: Optional[str], size: str = "w342") -> Optional[str]:
-    if not path:
-        return None
-    return f"{IMAGE_BASE}/{size}{path}"
+    from .posters import poster_cache
+
+    return poster_cache.url(path, size)
 
 
 def _normalize_title(s: str) -> str:
@@ -81,57 +359,48 @@ def _directors_from_credits(credits: Dict[str, Any]) -> List[str]:
 
 
 def _movie_credits(tmdb_id: int) -> Dict[str, Any]:
-    url = f"{TMDB_API_BASE}/movie/{tmdb_id}/credits"
-    params = {**_api_key_param()}
-    try:
-        resp = requests.get(url, headers=_auth_headers(), params=params, timeout=10)
-        resp.raise_for_status()
-        return resp.json() or {}
-    except Exception:
-        return {}
+    return client.get(f"/movie/{tmdb_id}/credits")
 
 
+@memoize(memo_caches["search_person"], key=lambda name: _normalize_query(name))
 def _search_person(name: str) -> Optional[int]:
     if not name:
         return None
-    url = f"{TMDB_API_BASE}/search/person"
-    params = {"query": name, "include_adult": "false", **_api_key_param()}
-    try:
-        resp = requests.get(url, headers=_auth_headers(), params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json() or {}
-        results = data.get("results", []) or []
-        if not results:
-            return None
-        # Take the top result as best match
-        return results[0].get("id")
-    except Exception:
+    params = {"query": name, "include_adult": "false"}
+    data = client.get("/search/person", params)
+    results = data.get("results", []) or []
+    if not results:
         return None
+    # Take the top result as best match
+    return results[0].get("id")
 
 
+@memoize(memo_caches["director_movie_ids"], key=lambda person_id: int(person_id or 0))
 def _director_movie_ids(person_id: int) -> Optional[set]:
     if not person_id:
         return None
-    url = f"{TMDB_API_BASE}/person/{person_id}/movie_credits"
-    params = {**_api_key_param()}
-    try:
-        resp = requests.get(url, headers=_auth_headers(), params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json() or {}
-        crew = data.get("crew", []) or []
-        ids = set()
-        for c in crew:
-            job = (c or {}).get("job") or ""
-            dept = (c or {}).get("department") or ""
-            if "director" in job.lower() or dept.lower() == "directing":
-                mid = (c or {}).get("id")
-                if mid:
-                    ids.add(mid)
-        return ids
-    except Exception:
+    data = client.get(f"/person/{person_id}/movie_credits")
+    crew = data.get("crew", []) or []
+    ids = set()
+    for c in crew:
+        job = (c or {}).get("job") or ""
+        dept = (c or {}).get("department") or ""
+        if "director" in job.lower() or dept.lower() == "directing":
+            mid = (c or {}).get("id")
+            if mid:
+                ids.add(mid)
+    return ids
+
+
+def _director_ids_for_name(name: str) -> Optional[set]:
+    """Ids of movies directed by the best person match for name, or None if no match. Raises on TMDB errors."""
+    pid = _search_person(name)
+    if not pid:
         return None
+    return _director_movie_ids(pid) or set()
 
 
+@_helper
 def search_movies(query: str, page: int = 1, year: Optional[int] = None, director: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Enhanced TMDB search supporting optional year and director filtering with simple fuzzy ranking.
@@ -139,130 +408,194 @@ def search_movies(query: str, page: int = 1, year: Optional[int] = None, directo
     """
     if not query:
         return []
+    try:
+        return _ranked_search(query, page, year, director)
+    except Exception:
+        return []
 
-    url = f"{TMDB_API_BASE}/search/movie"
+
+@memoize(
+    memo_caches["search_movies"],
+    key=lambda query, page, year, director: (_normalize_query(query), int(page or 1), year, _normalize_query(director)),
+)
+def _ranked_search(query: str, page: int, year: Optional[int], director: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    search_movies without the error handling, so failed searches are not memoized.
+    A failed director or credits lookup only weakens the ranking; such results are
+    returned but not memoized either, so the next search retries the lookups.
+    """
     params: Dict[str, Any] = {
         "query": query,
         "page": page,
         "include_adult": "false",
-        **_api_key_param(),
     }
     if year:
         # TMDB supports both; include both to tighten results
         params["year"] = year
         params["primary_release_year"] = year
 
-    try:
-        resp = requests.get(url, headers=_auth_headers(), params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json() or {}
-        raw_results = data.get("results", []) or []
-
-        # If director provided, build a set of movie IDs they directed
-        director_ids: Optional[set] = None
-        director_name = (director or "").strip()
+    director_name = (director or "").strip()
+    # The director lookup (person search, then their credits) does not depend on
+    # the movie search, so start it first and let both run at the same time.
+    director_future = client.submit(_director_ids_for_name, director_name) if director_name else None
+
+    data = client.get("/search/movie", params)
+    raw_results = data.get("results", []) or []
+
+    # Limit to top N for enrichment and ranking
+    # Use fewer candidates when no director filtering (faster response)
+    max_candidates = 15 if director_name else 8
+    candidates = raw_results[:max_candidates]
+
+    # Only fetch credits if director filtering is being used; the calls are
+    # independent, so fan them out and collect them in candidate order.
+    credit_futures: List[Optional[Future]] = []
+    for r in candidates:
+        tmdb_id = r.get("id")
+        credit_futures.append(client.submit(_movie_credits, tmdb_id) if director_name and tmdb_id else None)
+
+    degraded = False
+
+    def _result(future: Optional[Future]):
+        nonlocal degraded
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as exc:
+            logger.warning("TMDB lookup for director ranking failed: %s", exc)
+            degraded = True
+            return None
+
+    # If director provided, build a set of movie IDs they directed
+    director_ids: Optional[set] = _result(director_future)
+
+    enriched: List[Tuple[Dict[str, Any], float]] = []
+    for r, credits_future in zip(candidates, credit_futures):
+        tmdb_id = r.get("id")
+        title = r.get("title") or r.get("original_title") or ""
+        cand_year = _extract_year(r.get("release_date"))
+        poster_path = r.get("poster_path")
+        overview = r.get("overview")
+
+        directors = []
+        if credits_future is not None:
+            credits = _result(credits_future)
+            if credits:
+                directors = _directors_from_credits(credits)
+
+        # Scoring: title similarity + year proximity + director match
+        score = 0.0
+        score += _title_similarity(title, query) * 5.0
+        if year and cand_year:
+            if cand_year == year:
+                score += 3.0
+            elif abs(cand_year - year) == 1:
+                score += 1.0
         if director_name:
-            pid = _search_person(director_name)
-            if pid:
-                director_ids = _director_movie_ids(pid) or set()
-
-        # Limit to top N for enrichment and ranking
-        # Use fewer candidates when no director filtering (faster response)
-        max_candidates = 15 if director_name else 8
-        candidates = raw_results[:max_candidates]
-
-        enriched: List[Tuple[Dict[str, Any], float]] = []
-        for r in candidates:
-            tmdb_id = r.get("id")
-            title = r.get("title") or r.get("original_title") or ""
-            cand_year = _extract_year(r.get("release_date"))
-            poster_path = r.get("poster_path")
-            overview = r.get("overview")
-
-            # Only fetch credits if director filtering is being used
-            # This is the key performance optimization: reduces API calls from 16 to 1 per search
-            directors = []
-            if director_name:
-                # Only make expensive credits call when director search is active
-                credits = _movie_credits(tmdb_id) if tmdb_id else {}
-                if credits:
-                    directors = _directors_from_credits(credits)
-
-            # Scoring: title similarity + year proximity + director match
-            score = 0.0
-            score += _title_similarity(title, query) * 5.0
-            if year and cand_year:
-                if cand_year == year:
-                    score += 3.0
-                elif abs(cand_year - year) == 1:
-                    score += 1.0
-            if director_name:
-                # boost if this movie is in the director's directed list or name matches display directors
-                in_directed_list = (director_ids is not None and tmdb_id in director_ids)
-                has_name_match = any(_normalize_title(director_name) in _normalize_title(d) or _normalize_title(d) in _normalize_title(director_name) for d in directors)
-                if in_directed_list or has_name_match:
-                    score += 3.0
-
-            enriched.append(
-                (
-                    {
-                        "tmdb_id": tmdb_id,
-                        "title": title,
-                        "year": cand_year,
-                        "poster_path": poster_path,
-                        "poster_url": _image_url(poster_path, "w185"),
-                        "overview": overview,
-                        "directors": directors,
-                    },
-                    score,
-                )
+            # boost if this movie is in the director's directed list or name matches display directors
+            in_directed_list = (director_ids is not None and tmdb_id in director_ids)
+            has_name_match = any(_normalize_title(director_name) in _normalize_title(d) or _normalize_title(d) in _normalize_title(director_name) for d in directors)
+            if in_directed_list or has_name_match:
+                score += 3.0
+
+        enriched.append(
+            (
+                {
+                    "tmdb_id": tmdb_id,
+                    "title": title,
+                    "year": cand_year,
+                    "poster_path": poster_path,
+                    "poster_url": _image_url(poster_path, "w185"),
+                    "overview": overview,
+                    "directors": directors,
+                },
+                score,
             )
+        )
 
-        # If director was provided, prefer results the director actually directed
-        def sort_key(item: Tuple[Dict[str, Any], float]):
-            d = item[0]
-            s = item[1]
-            preferred = 0
-            if director_name and director_ids is not None and d.get("tmdb_id") in director_ids:
-                preferred = 1
-            return (preferred, s)
-
-        enriched.sort(key=sort_key, reverse=True)
-        final_results = [e[0] for e in enriched]
-        return final_results
-    except Exception:
-        return []
+    # If director was provided, prefer results the director actually directed
+    def sort_key(item: Tuple[Dict[str, Any], float]):
+        d = item[0]
+        s = item[1]
+        preferred = 0
+        if director_name and director_ids is not None and d.get("tmdb_id") in director_ids:
+            preferred = 1
+        return (preferred, s)
+
+    enriched.sort(key=sort_key, reverse=True)
+    final_results = [e[0] for e in enriched]
+    return Uncached(final_results) if degraded else final_results
 
 
+@_helper
+@memoize(memo_caches["movie_details"], key=lambda tmdb_id: int(tmdb_id))
 def movie_details(tmdb_id: int) -> Optional[Dict[str, Any]]:
     """
     Get details for a movie id. Returns a dict with fields we need, or None on error.
     """
-    url = f"{TMDB_API_BASE}/movie/{tmdb_id}"
-    params = {"append_to_response": "release_dates", **_api_key_param()}
     try:
-        resp = requests.get(url, headers=_auth_headers(), params=params, timeout=10)
-        resp.raise_for_status()
-        m = resp.json()
-        year = None
-        rd = m.get("release_date") or ""
-        if len(rd) >= 4:
-            try:
-                year = int(rd[:4])
-            except Exception:
-                year = None
-
-        return {
-            "tmdb_id": m.get("id"),
-            "title": m.get("title") or m.get("original_title"),
-            "original_title": m.get("original_title"),
-            "year": year,
-            "poster_path": m.get("poster_path"),
-            "backdrop_path": m.get("backdrop_path"),
-            "overview": m.get("overview"),
-            "runtime": m.get("runtime"),
-            "tmdb_rating": m.get("vote_average"),
-            "genres": [g.get("name") for g in m.get("genres", []) if g.get("name")],
-        }
+        return fetch_movie_details(tmdb_id)
     except Exception:
         return None
+
+
+@_helper
+def fetch_movie_details(tmdb_id: int) -> Optional[Dict[str, Any]]:
+    """
+    movie_details() without the memo or the error handling: None when TMDB has no
+    such movie (404), while timeouts and other failures raise so callers can retry.
+    """
+    params = {"append_to_response": "release_dates"}
+    try:
+        m = client.get(f"/movie/{tmdb_id}", params)
+    except requests.HTTPError as exc:
+        if exc.response is not None and exc.response.status_code == 404:
+            return None
+        raise
+    year = None
+    rd = m.get("release_date") or ""
+    if len(rd) >= 4:
+        try:
+            year = int(rd[:4])
+        except Exception:
+            year = None
+
+    return {
+        "tmdb_id": m.get("id"),
+        "title": m.get("title") or m.get("original_title"),
+        "original_title": m.get("original_title"),
+        "year": year,
+        "poster_path": m.get("poster_path"),
+        "backdrop_path": m.get("backdrop_path"),
+        "overview": m.get("overview"),
+        "runtime": m.get("runtime"),
+        "tmdb_rating": m.get("vote_average"),
+        "genres": [g.get("name") for g in m.get("genres", []) if g.get("name")],
+    }
+
+
+@_helper
+def movie_details_many(tmdb_ids: List[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+    """movie_details() for several ids, fetched concurrently on the client's worker pool."""
+    futures = {int(tmdb_id): client.submit(movie_details, int(tmdb_id)) for tmdb_id in tmdb_ids}
+    return {tmdb_id: future.result() for tmdb_id, future in futures.items()}
+
+
+@_helper
+def find_by_imdb(imdb_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Resolve an IMDb id (tt...) through TMDB's /find endpoint. Returns
+    {"tmdb_id", "title", "year"} for the first movie match, or None when TMDB
+    has no movie for the id. Request errors are raised so callers can report them.
+    """
+    data = client.get(f"/find/{imdb_id}", {"external_source": "imdb_id"})
+    results = data.get("movie_results") or []
+    if not results:
+        return None
+    m = results[0]
+    return {
+        "tmdb_id": m.get("id"),
+        "title": m.get("title") or m.get("original_title"),
+        "year": _extract_year(m.get("release_date")),
+    }
@@ -0,0 +1,176 @@
+"""
+Recorded TMDB responses for offline runs: record once, replay without the network.
+
+TMDB_MODE selects what the TMDB client does with them:
+  - live (default): requests go to TMDB (or TMDB_API_BASE) as usual
+  - record: requests go to TMDB and every answer (2xx and 404) is written to TMDB_FIXTURES_PATH
+  - replay: requests are answered from TMDB_FIXTURES_PATH only; nothing touches the network
+
+Replay can add TMDB_REPLAY_LATENCY seconds (plus up to TMDB_REPLAY_JITTER more)
+to every call and fail TMDB_REPLAY_ERROR_RATE of them with a 503, so the same
+fixtures serve correctness tests and throughput runs. TMDB_REPLAY_SEED makes the
+injected jitter and errors repeatable. A request with no recording fails like an
+unreachable TMDB would (FixtureMissing, a requests.ConnectionError).
+
+The store is one gzipped JSON Lines file, one {"key", "status", "body"} object
+per request, where key is the path plus its sorted query string (auth left out).
+"""
+import gzip
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+
+
+logger = logging.getLogger(__name__)
+
+MODES = ("live", "record", "replay")
+
+# Query params that never change the answer and must not end up in fixture files
+_IGNORED_PARAMS = ("api_key",)
+
+
+class FixtureMissing(requests.ConnectionError):
+    """Replay mode got a request that was never recorded."""
+
+
+def fixture_key(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key for a request: path plus sorted params, free-text queries case/space-folded."""
+    items = []
+    for name, value in sorted((params or {}).items()):
+        if name in _IGNORED_PARAMS or value is None:
+            continue
+        value = str(value)
+        if name == "query":
+            value = " ".join(value.lower().split())
+        items.append((name, value))
+    return f"{path}?{urlencode(items)}" if items else path
+
+
+class FixtureStore:
+    """In-memory map of fixture key -> (status, JSON text), loaded from and saved to `path`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[int, str]] = {}
+        self._dirty = False
+        if os.path.exists(path):
+            self.load()
+
+    def load(self):
+        entries = {}
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    entries[row["key"]] = (int(row["status"]), json.dumps(row["body"]))
+        with self._lock:
+            self._entries = entries
+            self._dirty = False
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Tuple[int, str]]:
+        return self._entries.get(fixture_key(path, params))
+
+    def put(self, path: str, params: Optional[Dict[str, Any]], status: int, text: str):
+        entry = (int(status), json.dumps(json.loads(text or "{}")))
+        with self._lock:
+            key = fixture_key(path, params)
+            if self._entries.get(key) != entry:
+                self._entries[key] = entry
+                self._dirty = True
+
+    def save(self):
+        """Write the store if anything was recorded since the last save (atomically, sorted by key)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            rows = sorted(self._entries.items())
+            self._dirty = False
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            # mtime=0 keeps the file byte-identical across re-recordings of the same data
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                for key, (status, text) in rows:
+                    line = json.dumps({"key": key, "status": status, "body": json.loads(text)}, sort_keys=True,
+                                      separators=(",", ":"))
+                    f.write(line.encode("utf-8") + b"\n")
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        logger.info("Saved %d TMDB fixtures to %s", len(rows), self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReplayTransport:
+    """Answers TMDB GETs from a FixtureStore, with optional injected latency and errors."""
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.store = store
+        self.latency = max(0.0, float(latency))
+        self.jitter = max(0.0, float(jitter))
+        self.error_rate = min(1.0, max(0.0, float(error_rate)))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise _http_error(path, 503, '{"status_message": "Injected replay error"}')
+        entry = self.store.get(path, params)
+        if entry is None:
+            raise FixtureMissing(f"No TMDB fixture for {fixture_key(path, params)} in {self.store.path}")
+        status, text = entry
+        if status >= 400:
+            raise _http_error(path, status, text)
+        return json.loads(text) or {}
+
+
+def _http_error(path: str, status: int, text: str) -> requests.HTTPError:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = text.encode("utf-8")
+    resp.url = path
+    return requests.HTTPError(f"{status} Error (replayed) for {path}", response=resp)
+
+
+def from_config(config) -> Tuple[Optional[ReplayTransport], Optional[FixtureStore]]:
+    """(replay transport, recording store) for the TMDB client; both None in live mode."""
+    mode = (config.get("TMDB_MODE") or "live").lower()
+    if mode not in MODES:
+        raise ValueError(f"TMDB_MODE must be one of {', '.join(MODES)}, got {mode!r}")
+    if mode == "live":
+        return None, None
+    path = config.get("TMDB_FIXTURES_PATH")
+    if not path:
+        raise ValueError(f"TMDB_MODE={mode} needs TMDB_FIXTURES_PATH")
+    if mode == "record":
+        return None, FixtureStore(path)
+    if not os.path.exists(path):
+        raise ValueError(f"TMDB fixtures not found at {path}; record them first (TMDB_MODE=record)")
+    transport = ReplayTransport(
+        FixtureStore(path),
+        latency=config.get("TMDB_REPLAY_LATENCY", 0.0),
+        jitter=config.get("TMDB_REPLAY_JITTER", 0.0),
+        error_rate=config.get("TMDB_REPLAY_ERROR_RATE", 0.0),
+        seed=config.get("TMDB_REPLAY_SEED"),
+    )
+    return transport, None
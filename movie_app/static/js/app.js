@@ -316,7 +316,7 @@
 
   async function loadLibrary(page) {
     try {
-      const data = await apiGet(`/api/movies?page=${page || 1}`);
+      const data = await apiGet(`/api/movies?page=${page || 1}&include=tags`);
       renderLibrary(data.items || []);
       renderPagination(data.total_pages || 1, data.page || 1);
     } catch (e) {
@@ -639,10 +639,17 @@
       // Load existing rating and tags only if user is logged in
       if (currentUser) {
         loadMovieRating(m.id);
-        loadMovieTags(m.id);
+        // Tags are embedded in the list payload (include=tags); fetch only if missing
+        if (!Array.isArray(m.tags)) loadMovieTags(m.id);
       }
     });
     libraryGrid.appendChild(frag);
+
+    if (currentUser) {
+      items.forEach((m) => {
+        if (Array.isArray(m.tags)) renderMovieTags(m.id, m.tags);
+      });
+    }
   }
 
   function renderPagination(totalPages, currentPage) {
@@ -745,53 +752,56 @@
   async function loadMovieTags(movieId) {
     try {
       const result = await apiGet(`/api/movies/${movieId}/tags`);
-      const tagsContainer = document.getElementById(`tags-${movieId}`);
-      const tagCounter = document.getElementById(`tag-counter-${movieId}`);
-      if (!tagsContainer) return;
-      
-      // Update cache with fresh data
-      const tagNames = result.tags ? result.tags.map(tag => tag.name) : [];
-      cachedMovieTags.set(movieId, tagNames);
-      
-      tagsContainer.innerHTML = "";
-      const tagCount = result.tags ? result.tags.length : 0;
-      
-      if (result.tags && result.tags.length > 0) {
-        result.tags.forEach((tag, index) => {
-          const tagButton = document.createElement("button");
-          tagButton.className = `tag p${(index % 7) + 1}`;
-          tagButton.type = "button";
-          tagButton.dataset.selected = "true";
-          tagButton.dataset.tagId = tag.id;
-          // Create tag content with dot and user symbol
-          let tagContent = `<span class="dot"></span>${tag.name}`;
-          
-          // Add user name if we know who added it
-          if (tag.added_by) {
-            tagContent += `<span class="tag-user-symbol">${tag.added_by}</span>`;
-          }
-          
-          tagButton.innerHTML = tagContent;
-          
-          // Add click handler to remove tag
-          tagButton.addEventListener("click", () => {
-            removeTag(movieId, tag.id, tag.name);
-          });
-          
-          tagsContainer.appendChild(tagButton);
-        });
-      }
-      
-      // Update tag counter
-      if (tagCounter) {
-        tagCounter.textContent = `${tagCount} tag${tagCount === 1 ? '' : 's'} selected`;
-      }
-      
+      renderMovieTags(movieId, result.tags || []);
     } catch (error) {
       console.error("Error loading tags:", error);
     }
   }
 
+  function renderMovieTags(movieId, tags) {
+    const tagsContainer = document.getElementById(`tags-${movieId}`);
+    const tagCounter = document.getElementById(`tag-counter-${movieId}`);
+    if (!tagsContainer) return;
+    
+    // Update cache with fresh data
+    const tagNames = tags.map(tag => tag.name);
+    cachedMovieTags.set(movieId, tagNames);
+    
+    tagsContainer.innerHTML = "";
+    const tagCount = tags.length;
+    
+    if (tags.length > 0) {
+      tags.forEach((tag, index) => {
+        const tagButton = document.createElement("button");
+        tagButton.className = `tag p${(index % 7) + 1}`;
+        tagButton.type = "button";
+        tagButton.dataset.selected = "true";
+        tagButton.dataset.tagId = tag.id;
+        // Create tag content with dot and user symbol
+        let tagContent = `<span class="dot"></span>${tag.name}`;
+        
+        // Add user name if we know who added it
+        if (tag.added_by) {
+          tagContent += `<span class="tag-user-symbol">${tag.added_by}</span>`;
+        }
+        
+        tagButton.innerHTML = tagContent;
+        
+        // Add click handler to remove tag
+        tagButton.addEventListener("click", () => {
+          removeTag(movieId, tag.id, tag.name);
+        });
+        
+        tagsContainer.appendChild(tagButton);
+      });
+    }
+    
+    // Update tag counter
+    if (tagCounter) {
+      tagCounter.textContent = `${tagCount} tag${tagCount === 1 ? '' : 's'} selected`;
+    }
+  }
+
   // Cache current movie tags to avoid repeated API calls when excluding already-applied tags
   let cachedAllTags = null; // deprecated for suggestions; kept for fallback only
   let cachedMovieTags = new Map(); // Cache current tags per movie
@@ -1314,6 +1324,7 @@
   // Initialize genre checklist functionality
   let selectedGenres = new Set();
   let allGenres = [];
+  let genreCounts = new Map();
   
   function initGenreChecklist() {
     if (!genreChecklist) return;
@@ -1364,7 +1375,7 @@
       
       const label = document.createElement('span');
       label.className = 'genre-checkbox-label';
-      label.textContent = genre;
+      label.textContent = genreCounts.has(genre) ? `${genre} (${genreCounts.get(genre)})` : genre;
       
       item.appendChild(checkbox);
       item.appendChild(customCheckbox);
@@ -1591,12 +1602,12 @@
   loadLibrary = async function(page) {
     const seq = ++libraryLoadSeq;
     try {
-      let url = `/api/movies?page=${page || 1}`;
-      
       // Add filter parameters
+      let filterQuery = '';
       Object.keys(currentFilters).forEach(key => {
-        url += `&${key}=${encodeURIComponent(currentFilters[key])}`;
+        filterQuery += `&${key}=${encodeURIComponent(currentFilters[key])}`;
       });
+      const url = `/api/movies?page=${page || 1}&include=tags${filterQuery}`;
       
       const data = await apiGet(url);
       // If a newer call started after this one, skip DOM work
@@ -1604,21 +1615,29 @@
       renderLibrary(data.items || []);
       renderPagination(data.total_pages || 1, data.page || 1);
       
-      // Update available filter options (lightweight endpoints)
+      // Update available filter options with match counts (one cached facets call)
       if (seq === libraryLoadSeq && page === 1) {
         try {
-          const g = await apiGet('/api/movies/genres');
-          const genreList = Array.isArray(g.genres) ? g.genres : [];
+          const facets = await apiGet(`/api/movies/facets?${filterQuery.slice(1)}`);
+          if (seq !== libraryLoadSeq) return;
+          const genreFacets = Array.isArray(facets.genres) ? facets.genres : [];
+          genreCounts = new Map(genreFacets.map(g => [g.name, g.count]));
+          const genreList = genreFacets.map(g => g.name);
+          // Keep selected options visible even when nothing else matches them
+          selectedGenres.forEach(g => { if (!genreCounts.has(g)) genreList.push(g); });
           updateGenreOptions(genreList);
           // Also refresh tag options
-          const tags = await fetchAvailableTags();
+          const tags = Array.isArray(facets.tags) ? facets.tags : [];
           if (tagFilter) {
             const currentTags = Array.from(tagFilter.selectedOptions).map(opt => opt.value);
+            currentTags.forEach(name => {
+              if (name && !tags.some(t => t.name === name)) tags.push({ name, count: 0 });
+            });
             tagFilter.innerHTML = '<option value="">All Tags</option>';
             tags.forEach(tag => {
               const option = document.createElement('option');
               option.value = tag.name;
-              option.textContent = tag.name;
+              option.textContent = `${tag.name} (${tag.count})`;
               if (currentTags.includes(tag.name)) option.selected = true;
               tagFilter.appendChild(option);
             });
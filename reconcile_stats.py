@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Recompute the library_counters table (movie total and per-user review counts)
+from the movies and reviews tables.
+
+Run after bulk edits made outside the app, or if the dashboard stats drift.
+"""
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from movie_app import create_app
+from movie_app.services import counters
+
+
+def reconcile_stats():
+    app = create_app()
+    with app.app_context():
+        values = counters.reconcile()
+        print(f"✓ Reconciled {len(values)} counters")
+        for key, value in sorted(values.items()):
+            print(f"  {key} = {value}")
+
+
+if __name__ == "__main__":
+    reconcile_stats()
@@ -0,0 +1,120 @@
+"""
+Tests for the fingerprinted, precompressed static asset build and its /assets route.
+"""
+import gzip
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from movie_app.app import create_app
+from movie_app.services.assets import brotli, build, minify_css, minify_js
+
+STATIC = "movie_app/static"
+
+SAMPLE_JS = r"""
+// line comment with a 'quote'
+const re = /\/\*[a-z]+"/g;  /* block
+   comment */
+function total(items, n) {
+  const label = `count: ${items.filter(i => i > n).length} // not a comment ${"}"}`;
+  const odd = 'it\'s /* kept */';
+  let x = n + +items.length;
+  x = x / 2 / 1;
+  if (re.test("/*abc\"")) { x = x - -1; }
+  return [label, odd, x, typeof /x/.source];
+}
+console.log(JSON.stringify(total([1, 2, 3], 1)));
+"""
+
+
+def _node(code):
+    return subprocess.run(["node", "-e", code], capture_output=True, text=True, check=True).stdout
+
+
+def test_minified_js_behaves_like_the_source():
+    minified = minify_js(SAMPLE_JS)
+    assert "comment" not in minified.replace("not a comment", "")
+    assert "  " not in minified.replace("count: ", "")
+    if shutil.which("node") is None:
+        pytest.skip("node is not installed")
+    assert _node(minified) == _node(SAMPLE_JS)
+    with open(f"{STATIC}/js/app.js", encoding="utf-8") as f:
+        subprocess.run(["node", "--check", "-"], input=minify_js(f.read()), text=True, check=True)
+
+
+def test_minified_css_keeps_strings_and_selectors():
+    css = '/* the "x" */\na  >  b , c :hover { color : red ; content: "a ; /* x */ b" ;}\n'
+    assert minify_css(css) == 'a>b,c :hover{color : red;content: "a ; /* x */ b"}\n'
+
+
+@pytest.fixture
+def built(tmp_path):
+    manifest = build(STATIC, str(tmp_path / "dist"))
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "ASSETS_DIR": str(tmp_path / "dist"),
+        "TESTING": True,
+    })
+    return app, manifest
+
+
+def test_pages_link_fingerprinted_assets(built):
+    app, manifest = built
+    page = app.test_client().get("/auth/login").get_data(as_text=True)
+    for name in ("js/app.js", "css/app.css", "img/placeholder-poster.svg"):
+        assert re.fullmatch(r"[\w/-]+\.[0-9a-f]{12}\.\w+", manifest["files"][name]["path"])
+        assert f"/assets/{manifest['files'][name]['path']}" in page
+    assert "/static/" not in page
+
+
+def test_assets_are_precompressed_and_immutable(built, tmp_path):
+    app, manifest = built
+    client = app.test_client()
+    url = f"/assets/{manifest['files']['js/app.js']['path']}"
+    with open(tmp_path / "dist" / manifest["files"]["js/app.js"]["path"], "rb") as f:
+        plain = f.read()
+
+    zipped = client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+    assert zipped.status_code == 200
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert zipped.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert zipped.headers["Vary"] == "Accept-Encoding"
+    assert zipped.mimetype in ("text/javascript", "application/javascript")
+    assert gzip.decompress(zipped.data) == plain
+
+    if brotli is not None:
+        br = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+        assert br.headers["Content-Encoding"] == "br"
+        assert brotli.decompress(br.data) == plain
+
+    identity = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in identity.headers
+    assert identity.data == plain
+    assert client.get(url, headers={"If-None-Match": identity.headers["ETag"]}).status_code == 304
+
+    assert client.get("/assets/js/app.000000000000.js").status_code == 404
+    assert client.get("/assets/manifest.json").status_code == 404
+
+
+def test_edited_sources_fall_back_to_static_until_rebuilt(tmp_path):
+    shutil.copytree(STATIC, tmp_path / "static")
+    first = build(str(tmp_path / "static"), str(tmp_path / "dist"))
+    with open(tmp_path / "static" / "js" / "app.js", "a", encoding="utf-8") as f:
+        f.write("\nconsole.log('edited');\n")
+    second = build(str(tmp_path / "static"), str(tmp_path / "dist"))
+    old, new = first["files"]["js/app.js"]["path"], second["files"]["js/app.js"]["path"]
+    assert old != new
+    # Outputs of the earlier build are removed
+    assert not (tmp_path / "dist" / old).exists() and (tmp_path / "dist" / f"{new}.gz").exists()
+
+    # The app's real app.js no longer matches this build, so it is served from /static
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "ASSETS_DIR": str(tmp_path / "dist"),
+        "TESTING": True,
+    })
+    page = app.test_client().get("/auth/login").get_data(as_text=True)
+    assert "/static/js/app.js" in page
+    assert f"/assets/{second['files']['css/app.css']['path']}" in page
@@ -0,0 +1,117 @@
+"""
+Tests for the resumable TMDB backfill engine.
+"""
+import json
+
+import pytest
+
+from benchmarks.tmdb_stub import StubTMDBServer
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie, MovieGenre
+from movie_app.services import tmdb
+from movie_app.services.backfill import TokenBucket, missing_json_list_filter, run_backfill
+
+
+@pytest.fixture
+def stub():
+    with StubTMDBServer() as server:
+        yield server
+
+
+@pytest.fixture
+def app(tmp_path, stub):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "TMDB_API_BASE": stub.base_url,
+        "HTTP_CACHE_BACKEND": "none",
+        "TMDB_RETRY_BACKOFF": 0,
+        "TESTING": True,
+    })
+    tmdb.clear_memo()
+    with app.app_context():
+        for i in range(1, 26):
+            db.session.add(Movie(tmdb_id=i, title=f"Movie {i}", genres=[]))
+        db.session.commit()
+    yield app
+    tmdb.client.close()
+    tmdb.clear_memo()
+
+
+def _apply_genres(movie, details):
+    movie.set_genres(details["genres"])
+    return True
+
+
+def test_backfill_updates_rows_in_chunks(app, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    with app.app_context():
+        rows = Movie.query.filter(missing_json_list_filter("genres"))
+        stats = run_backfill("genres", rows, tmdb.movie_details, _apply_genres, rate=1000, workers=4,
+                             chunk_size=10, checkpoint_path=str(checkpoint), report=lambda msg: None)
+        assert stats == {"total": 25, "updated": 25, "failed": 0, "skipped": 0}
+        assert Movie.query.filter(missing_json_list_filter("genres")).count() == 0
+        assert MovieGenre.query.count() >= 25
+    assert not checkpoint.exists()
+
+
+def test_backfill_resumes_after_checkpoint(app, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(json.dumps({"last_id": 20}))
+    with app.app_context():
+        rows = Movie.query.filter(missing_json_list_filter("genres"))
+        stats = run_backfill("genres", rows, tmdb.movie_details, _apply_genres, rate=1000,
+                             checkpoint_path=str(checkpoint), report=lambda msg: None)
+        assert stats["total"] == 5
+        assert Movie.query.filter(missing_json_list_filter("genres")).count() == 20
+
+
+def test_failed_fetches_are_retried_on_resume(app, stub, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    stub.errors = {"/movie/3": 503, "/movie/4": 404}
+
+    def interrupted(movie, details):
+        if movie.id == 15:
+            raise RuntimeError("interrupted")
+        return _apply_genres(movie, details)
+
+    with app.app_context():
+        rows = Movie.query.filter(missing_json_list_filter("genres"))
+        stats = run_backfill("genres", rows, tmdb.fetch_movie_details, _apply_genres, rate=1000, chunk_size=10,
+                             checkpoint_path=str(checkpoint), report=lambda msg: None)
+        assert stats == {"total": 25, "updated": 23, "failed": 1, "skipped": 1}
+        # Kept short of the failed row
+        assert json.loads(checkpoint.read_text())["last_id"] == 2
+
+    # A run that dies later on still resumes at the failed row
+    checkpoint.unlink()
+    with app.app_context():
+        for movie in Movie.query.all():
+            movie.set_genres([])
+        db.session.commit()
+        rows = Movie.query.filter(missing_json_list_filter("genres"))
+        with pytest.raises(RuntimeError):
+            run_backfill("genres", rows, tmdb.fetch_movie_details, interrupted, rate=1000, chunk_size=10,
+                         checkpoint_path=str(checkpoint), report=lambda msg: None)
+    assert json.loads(checkpoint.read_text())["last_id"] == 2
+
+    stub.errors = {"/movie/4": 404}
+    with app.app_context():
+        rows = Movie.query.filter(missing_json_list_filter("genres"))
+        stats = run_backfill("genres", rows, tmdb.fetch_movie_details, _apply_genres, rate=1000, chunk_size=10,
+                             checkpoint_path=str(checkpoint), report=lambda msg: None)
+        # Row 3 plus the rows of the unfinished chunk and after; row 4 is still missing upstream
+        assert stats == {"total": 17, "updated": 16, "failed": 0, "skipped": 1}
+        assert Movie.query.filter_by(tmdb_id=3).one().genres
+    assert not checkpoint.exists()
+
+
+def test_token_bucket_limits_rate():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+    bucket.acquire()
+    bucket.acquire()
+    assert bucket._tokens == 0
+    now[0] += 0.5
+    bucket.acquire()
+    assert bucket._tokens == 0
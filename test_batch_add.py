@@ -0,0 +1,53 @@
+"""
+Tests for adding several TMDB movies at once through /api/movies/batch.
+"""
+import pytest
+
+from benchmarks.tmdb_stub import StubTMDBServer
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.services import counters, tmdb
+
+
+@pytest.fixture
+def app(tmp_path):
+    with StubTMDBServer() as stub:
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+            "TMDB_API_BASE": stub.base_url,
+            "HTTP_CACHE_BACKEND": "none",
+            "TESTING": True,
+        })
+        with app.app_context():
+            for i in range(1, 6):
+                db.session.add(Movie(tmdb_id=i, title=f"Movie {i}"))
+            db.session.commit()
+            counters.reconcile()
+        yield app
+        tmdb.client.close()
+        tmdb.clear_memo()
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    return client
+
+
+def test_batch_add_reports_each_id_and_counts_once(app, client):
+    data = client.post("/api/movies/batch", json={"tmdb_ids": [3, 701, "702", 701]}).get_json()
+    assert data["ok"]
+    assert list(data["results"]) == ["3", "701", "702"]
+    assert data["results"]["3"]["status"] == "exists"
+    assert {data["results"][k]["status"] for k in ("701", "702")} == {"added"}
+    assert client.get("/api/movies/stats").get_json()["total_movies"] == 7
+
+    with app.app_context():
+        assert Movie.query.get(data["results"]["701"]["id"]).title == "Stub Movie 701"
+
+
+def test_batch_add_rejects_bad_ids(client):
+    assert client.post("/api/movies/batch", json={"tmdb_ids": ["x"]}).status_code == 400
+    assert client.post("/api/movies/batch", json={"tmdb_ids": list(range(101))}).status_code == 400
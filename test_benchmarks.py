@@ -0,0 +1,80 @@
+"""
+Tests for the benchmark harness: seeded generator, scenario run and baseline comparison.
+"""
+import copy
+
+import pytest
+
+from benchmarks.library_generator import generate_library
+from benchmarks.suite import compare, run_suite
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.models.review import Review
+
+
+def _library(tmp_path, name, seed):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / name}", "TESTING": True})
+    with app.app_context():
+        totals = generate_library(300, seed=seed)
+        rows = [(m.title, m.year, tuple(m.genres)) for m in Movie.query.order_by(Movie.id)]
+        ratings = [(r.movie_id, r.user_id, r.rating) for r in Review.query.order_by(Review.id)]
+        db.session.remove()
+    return app, totals, rows, ratings
+
+
+def test_generator_is_deterministic(tmp_path):
+    app, totals, rows, ratings = _library(tmp_path, "a.db", seed=7)
+    assert totals["movies"] == 300 and totals["reviews"] > 0 and totals["movie_tags"] > 0
+    assert _library(tmp_path, "b.db", seed=7)[1:] == (totals, rows, ratings)
+    assert _library(tmp_path, "c.db", seed=8)[2] != rows
+
+    stats = app.test_client()
+    stats.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    assert stats.get("/api/movies/stats").get_json()["total_movies"] == 300
+    with app.app_context(), pytest.raises(ValueError):
+        generate_library(10)
+
+
+@pytest.fixture(scope="module")
+def results():
+    return run_suite(200, iterations=2, warmup=0, log=lambda line: None)
+
+
+def test_every_scenario_runs(results):
+    assert results["meta"]["rows"]["movies"] == 200
+    assert len(results["scenarios"]) >= 20
+    assert {"add_batch", "tag_remove", "delete_movie", "stremio_import"} <= set(results["scenarios"])
+    for name, r in results["scenarios"].items():
+        assert r["iterations"] == 2 and r["median_ms"] > 0, name
+    assert results["scenarios"]["list_default"]["queries"] >= 1
+
+
+def test_compare_flags_slowdowns_and_extra_queries(results):
+    assert compare(results, results) == []
+
+    slower = copy.deepcopy(results)
+    slower["scenarios"]["facets"]["median_ms"] = results["scenarios"]["facets"]["median_ms"] * 2 + 5
+    slower["scenarios"]["stats"]["queries"] += 1
+    regressions = compare(slower, results)
+    assert [line.split(":")[0] for line in regressions] == ["facets", "stats"]
+
+    # Noise below the absolute threshold is ignored
+    jitter = copy.deepcopy(results)
+    jitter["scenarios"]["tags_all"]["median_ms"] = results["scenarios"]["tags_all"]["median_ms"] * 1.5
+    assert compare(jitter, results, min_delta_ms=1000) == []
+
+    # Scenarios missing from the results fail the comparison, unless --only left them out
+    partial = copy.deepcopy(results)
+    del partial["scenarios"]["facets"]
+    assert compare(partial, results) == ["facets: missing from the results"]
+    partial["meta"]["only"] = ["stats"]
+    del partial["scenarios"]["tags_all"]
+    assert compare(partial, results) == []
+    partial["meta"]["only"] = ["stats", "facets"]
+    assert compare(partial, results) == ["facets: missing from the results"]
+
+    other = copy.deepcopy(results)
+    other["meta"]["size"] = 1000
+    with pytest.raises(ValueError):
+        compare(other, results)
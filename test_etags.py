@@ -0,0 +1,95 @@
+"""
+Tests for conditional GETs on the read APIs, keyed by the library version.
+"""
+import pytest
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.services import counters
+from movie_app.services.library_version import LibraryVersion, library_version
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}", "TESTING": True})
+    with app.app_context():
+        for i in range(3):
+            db.session.add(Movie(tmdb_id=i + 1, title=f"Movie {i}"))
+        db.session.commit()
+        counters.reconcile()
+    return app
+
+
+def _login(app, username, password):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": username, "password": password})
+    return client
+
+
+def test_matching_etag_returns_304_without_running_queries(app):
+    client = _login(app, "Alex", "alex")
+    first = client.get("/api/movies?per_page=2")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    again = client.get("/api/movies?per_page=2", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert not [s for s in statements if "movies" in s or "library_counters" in s]
+
+    assert client.get("/api/movies?per_page=3", headers={"If-None-Match": etag}).status_code == 200
+    assert _login(app, "Carrie", "carrie").get("/api/movies?per_page=2", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_writes_and_other_processes_change_the_etag(app):
+    client = _login(app, "Alex", "alex")
+    etag = client.get("/api/movies/stats").headers["ETag"]
+    movie_id = client.get("/api/movies").get_json()["items"][0]["id"]
+    assert client.post(f"/api/movies/{movie_id}/review", json={"rating": 4}).get_json()["ok"]
+    resp = client.get("/api/movies/stats", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.get_json()["unrated_movies"] == 2
+
+    # A version published by another worker process is picked up from the shared file
+    etag = resp.headers["ETag"]
+    library_version.publish(library_version.current() + 1)
+    assert client.get("/api/movies/stats", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_failed_write_does_not_publish_a_version(app):
+    client = _login(app, "Alex", "alex")
+    before = library_version.current()
+
+    def fail(session):
+        raise RuntimeError("disk full")
+
+    event.listen(Session, "before_commit", fail)
+    try:
+        assert client.post("/api/movies/1/tags", json={"name": "Nope"}).status_code == 500
+    finally:
+        event.remove(Session, "before_commit", fail)
+    assert library_version.current() == before
+    with app.app_context():
+        assert counters.get_many([counters.VERSION])[counters.VERSION] == before
+
+    # The rolled-back bump is not published by the next commit either
+    assert client.post("/api/movies/1/tags", json={"name": "Yes"}).get_json()["ok"]
+    assert library_version.current() == before + 1
+
+
+def test_server_databases_read_the_version_row(tmp_path):
+    # Replicas on other hosts could not see a local version file
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config["SQLALCHEMY_DATABASE_URI"] = "postgresql://db.internal/movies"
+    version = LibraryVersion()
+    version.init_app(app)
+    assert version.path is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,83 @@
+"""
+Tests for /api/movies/facets: grouped counts and caching by library version.
+"""
+import pytest
+from sqlalchemy import event
+
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.models.review import Review
+from movie_app.models.tag import Tag, MovieTag
+from movie_app.services import counters
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}", "TESTING": True})
+    with app.app_context():
+        tag = Tag(name="Classic", slug="classic")
+        db.session.add(tag)
+        for i in range(10):
+            movie = Movie(tmdb_id=i + 1, title=f"Movie {i}", year=1985 + i * 3)
+            movie.set_genres(["Drama", "Comedy"] if i % 2 else ["Drama"])
+            db.session.add(movie)
+        db.session.flush()
+        for movie in Movie.query.order_by(Movie.id).limit(4):
+            db.session.add(MovieTag(movie_id=movie.id, tag_id=tag.id))
+            db.session.add(Review(movie_id=movie.id, user_id=1, rating=2.5 + movie.id * 0.5))
+        db.session.commit()
+        counters.reconcile()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    return client
+
+
+def test_facet_counts(client):
+    data = client.get("/api/movies/facets").get_json()
+    assert data["total"] == 10
+    assert data["unrated"] == 6
+    assert data["genres"] == [{"name": "Drama", "count": 10}, {"name": "Comedy", "count": 5}]
+    assert data["tags"] == [{"name": "Classic", "color": "#fff2cc", "count": 4}]
+    assert sum(y["count"] for y in data["years"]) == 10
+    assert data["decades"] == [{"decade": 2010, "count": 1}, {"decade": 2000, "count": 4},
+                               {"decade": 1990, "count": 3}, {"decade": 1980, "count": 2}]
+    # Best ratings are 3.0, 3.5, 4.0, 4.5
+    assert [(r["rating"], r["count"], r["at_least"]) for r in data["ratings"]] == [
+        (5, 0, 0), (4, 2, 2), (3, 2, 4), (2, 0, 4), (1, 0, 4)]
+
+
+def test_facets_ignore_their_own_filter(client):
+    data = client.get("/api/movies/facets?genre=Comedy&year_from=1990").get_json()
+    assert data["total"] == 4
+    # Genre counts still cover every genre within the year range
+    assert data["genres"] == [{"name": "Drama", "count": 8}, {"name": "Comedy", "count": 4}]
+    # Year counts still cover every Comedy
+    assert sum(y["count"] for y in data["years"]) == 5
+
+
+def test_facets_cached_until_library_changes(app, client):
+    first = client.get("/api/movies/facets").get_json()
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert client.get("/api/movies/facets").get_json() == first
+    assert not [s for s in statements if "movie_genres" in s]
+
+    client.post("/api/movies/5/review", json={"rating": 5})
+    data = client.get("/api/movies/facets").get_json()
+    assert data["version"] > first["version"]
+    assert data["unrated"] == 5
+    assert data["ratings"][0] == {"rating": 5, "count": 1, "at_least": 1}
+
+
+def test_filter_order_shares_a_cache_entry(client):
+    assert client.get("/api/movies/facets?genre=Drama,Comedy").headers["X-Cache"] == "MISS"
+    assert client.get("/api/movies/facets?genre=Comedy,Drama").headers["X-Cache"] == "HIT"
+    assert client.get("/api/movies?genre=Drama,Comedy&tags=Classic").headers["X-Cache"] == "MISS"
+    assert client.get("/api/movies?tags=Classic&genre=Comedy,Drama").headers["X-Cache"] == "HIT"
@@ -0,0 +1,47 @@
+"""
+Tests for the cached Flask-Login user identity.
+"""
+import pytest
+from sqlalchemy import event
+
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.review import Review
+from movie_app.models.user import User
+
+
+@pytest.fixture
+def app(tmp_path):
+    return create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}", "TESTING": True})
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    return client
+
+
+def test_authenticated_requests_skip_the_users_table(app, client):
+    assert client.get("/auth/status").get_json() == {"authenticated": True, "username": "Alex", "is_admin": True}
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    for _ in range(5):
+        assert client.get("/api/movies/stats").status_code == 200
+    assert not [s for s in statements if "FROM users" in s]
+
+
+def test_user_changes_invalidate_the_identity(app, client):
+    client.get("/auth/status")
+    with app.app_context():
+        User.query.filter_by(username="Alex").one().username = "Alexandra"
+        db.session.commit()
+    assert client.get("/auth/status").get_json()["username"] == "Alexandra"
+
+    with app.app_context():
+        # Bulk delete, as clear_users.py does
+        Review.query.delete()
+        User.query.delete()
+        db.session.commit()
+    assert client.get("/auth/status").get_json() == {"authenticated": False}
@@ -0,0 +1,74 @@
+"""
+Tests for the incrementally maintained library statistics.
+"""
+import pytest
+
+from benchmarks.tmdb_stub import StubTMDBServer
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.services import counters, tmdb
+
+
+@pytest.fixture
+def app(tmp_path):
+    with StubTMDBServer() as stub:
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+            "TMDB_API_BASE": stub.base_url,
+            "HTTP_CACHE_BACKEND": "none",
+            "TESTING": True,
+        })
+        with app.app_context():
+            for i in range(1, 6):
+                db.session.add(Movie(tmdb_id=i, title=f"Movie {i}"))
+            db.session.commit()
+            # Rows above bypassed the routes
+            counters.reconcile()
+        yield app
+        tmdb.client.close()
+        tmdb.clear_memo()
+
+
+def _login(app, username, password):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": username, "password": password})
+    return client
+
+
+def _snapshot(app):
+    with app.app_context():
+        return counters.get_many([counters.MOVIES, counters.reviews_key(1), counters.reviews_key(2)])
+
+
+def test_stats_follow_adds_reviews_and_deletes(app):
+    alex = _login(app, "Alex", "alex")
+    carrie = _login(app, "Carrie", "carrie")
+    assert alex.get("/api/movies/stats").get_json() == {"total_movies": 5, "unrated_movies": 5}
+
+    new_id = alex.post("/api/movies", json={"tmdb_id": 500}).get_json()["id"]
+    alex.post(f"/api/movies/{new_id}/review", json={"rating": 4})
+    alex.post(f"/api/movies/{new_id}/review", json={"rating": 4.5})  # update, not a new review
+    carrie.post(f"/api/movies/{new_id}/review", json={"rating": 3})
+    alex.post("/api/movies/1/review", json={"rating": 2})
+    assert alex.get("/api/movies/stats").get_json() == {"total_movies": 6, "unrated_movies": 4}
+    assert carrie.get("/api/movies/stats").get_json() == {"total_movies": 6, "unrated_movies": 5}
+
+    assert alex.delete(f"/api/movies/{new_id}").get_json()["ok"]
+    assert alex.get("/api/movies/stats").get_json() == {"total_movies": 5, "unrated_movies": 4}
+    assert carrie.get("/api/movies/stats").get_json() == {"total_movies": 5, "unrated_movies": 5}
+
+    incremental = _snapshot(app)
+    with app.app_context():
+        counters.reconcile()
+    assert _snapshot(app) == incremental
+
+
+def test_increment_creates_missing_counters_with_the_delta(app):
+    key = counters.reviews_key(99)
+    with app.app_context():
+        counters.increment(key, -1)
+        counters.increment(key, 3)
+        counters.increment(counters.MOVIES, 2)
+        db.session.commit()
+        assert counters.get_many([key, counters.MOVIES]) == {key: 2, counters.MOVIES: 7}
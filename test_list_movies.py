@@ -0,0 +1,118 @@
+"""
+Tests for the /api/movies listing: rating payloads and query counts.
+"""
+import pytest
+from sqlalchemy import event
+
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.models.review import Review
+from movie_app.models.tag import Tag, MovieTag
+from movie_app.models.user import User
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}", "TESTING": True})
+    with app.app_context():
+        users = User.query.order_by(User.id).all()
+        for i in range(60):
+            movie = Movie(tmdb_id=1000 + i, title=f"Movie {i}", year=1980 + i % 40)
+            movie.set_genres(["Drama", "Comedy"] if i % 2 else ["Drama"])
+            db.session.add(movie)
+        db.session.flush()
+        for movie in Movie.query.all():
+            for user in users:
+                db.session.add(Review(movie_id=movie.id, user_id=user.id, rating=3.5))
+        db.session.commit()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    resp = client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    assert resp.status_code == 200
+    return client
+
+
+def _count_queries(app, fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+def test_list_movies_includes_ratings_by_username(client):
+    data = client.get("/api/movies?per_page=5").get_json()
+    assert len(data["items"]) == 5
+    assert data["total"] == 60
+    for item in data["items"]:
+        assert item["ratings"] == {"Alex": 3.5, "Carrie": 3.5}
+
+
+def test_list_movies_query_count_is_independent_of_page_size(app, client):
+    counts = {}
+    client.get("/auth/status")  # warm the user identity cache
+    for per_page in (1, 10, 50):
+        counts[per_page] = _count_queries(app, lambda: client.get(f"/api/movies?per_page={per_page}"))
+    assert counts[1] == counts[10] == counts[50]
+
+
+def test_cursor_pagination_walks_library_without_gaps(app, client):
+    seen = []
+    data = client.get("/api/movies?cursor=&per_page=25").get_json()
+    seen.extend(item["id"] for item in data["items"])
+
+    # A movie added mid-walk must not shift the remaining pages
+    with app.app_context():
+        db.session.add(Movie(tmdb_id=99999, title="Late Arrival"))
+        db.session.commit()
+
+    while data["next_cursor"]:
+        data = client.get(f"/api/movies?cursor={data['next_cursor']}&per_page=25").get_json()
+        seen.extend(item["id"] for item in data["items"])
+
+    assert len(seen) == len(set(seen)) == 60
+
+
+def test_cursor_pagination_applies_filters(client):
+    data = client.get("/api/movies?cursor=&per_page=50&genre=Comedy").get_json()
+    assert len(data["items"]) == 30
+    assert data["next_cursor"] is None
+    assert all("Comedy" in item["genres"] for item in data["items"])
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/api/movies?cursor=not-a-cursor").status_code == 400
+
+
+def test_tags_are_embedded_and_bulk_loadable(app, client):
+    with app.app_context():
+        alex = User.query.filter_by(username="Alex").first()
+        tag = Tag(name="Classic", slug="classic")
+        db.session.add(tag)
+        db.session.flush()
+        first = Movie.query.order_by(Movie.added_at.desc(), Movie.id.desc()).first()
+        db.session.add(MovieTag(movie_id=first.id, tag_id=tag.id, added_by=alex.id))
+        db.session.commit()
+        first_id = first.id
+
+    expected = [{"id": 1, "name": "Classic", "color": "#fff2cc", "added_by": "Alex"}]
+    items = client.get("/api/movies?per_page=2&include=tags").get_json()["items"]
+    assert items[0]["tags"] == expected
+    assert items[1]["tags"] == []
+    assert "tags" not in client.get("/api/movies?per_page=2").get_json()["items"][0]
+
+    bulk = client.get(f"/api/movies/tags?ids={first_id},{items[1]['id']}").get_json()["tags"]
+    assert bulk == {str(first_id): expected, str(items[1]["id"]): []}
@@ -0,0 +1,119 @@
+"""
+Tests for the admin-only Prometheus /metrics endpoint and its cross-process aggregation.
+"""
+import base64
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.tmdb_stub import StubTMDBServer
+from movie_app.app import create_app
+from movie_app.services import tmdb
+from movie_app.services.metrics import metrics
+
+
+@pytest.fixture
+def app(tmp_path):
+    with StubTMDBServer() as stub:
+        tmdb.clear_memo()
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+            "TMDB_API_BASE": stub.base_url,
+            "HTTP_CACHE_BACKEND": "none",
+            "METRICS_DIR": str(tmp_path / "metrics"),
+            "METRICS_MULTIPROCESS": True,
+            "TESTING": True,
+        })
+        yield app
+        tmdb.client.close()
+        tmdb.clear_memo()
+
+
+def _login(app, username):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": username, "password": username.lower()})
+    return client
+
+
+def _value(text, name, **labels):
+    for line in text.splitlines():
+        m = re.match(r"^(\w+)(?:\{(.*)\})? (\S+)$", line)
+        if not m or m.group(1) != name:
+            continue
+        found = dict(re.findall(r'(\w+)="([^"]*)"', m.group(2) or ""))
+        if all(found.get(k) == str(v) for k, v in labels.items()):
+            return float(m.group(3))
+    return None
+
+
+def test_metrics_require_the_admin(app):
+    assert app.test_client().get("/metrics").status_code == 401
+    assert _login(app, "Carrie").get("/metrics").status_code == 403
+    assert _login(app, "Alex").get("/metrics").status_code == 200
+
+    basic = base64.b64encode(b"Alex:alex").decode()
+    assert app.test_client().get("/metrics", headers={"Authorization": f"Basic {basic}"}).status_code == 200
+    wrong = base64.b64encode(b"Alex:nope").decode()
+    assert app.test_client().get("/metrics", headers={"Authorization": f"Basic {wrong}"}).status_code == 401
+
+
+def test_route_histograms_and_tmdb_counters(app):
+    client = _login(app, "Alex")
+    for _ in range(3):
+        client.get("/api/movies")
+    client.get("/api/movies/search?q=stub")
+    client.get("/api/movies/search?q=stub")
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert "# TYPE movieapp_http_request_duration_seconds histogram" in text
+    labels = {"endpoint": "movies.list_movies", "method": "GET"}
+    assert _value(text, "movieapp_http_request_duration_seconds_count", **labels) == 3
+    assert _value(text, "movieapp_http_request_duration_seconds_bucket", le="+Inf", **labels) == 3
+    assert _value(text, "movieapp_http_requests_total", status=200, **labels) == 3
+    assert _value(text, "movieapp_tmdb_requests_total", kind="search/movie", outcome="ok") == 1
+    assert _value(text, "movieapp_tmdb_request_duration_seconds_count", kind="search/movie") == 1
+    # The repeated search came from the memo
+    assert _value(text, "movieapp_cache_hit_ratio", cache="tmdb_search_movies") == 0.5
+    assert _value(text, "movieapp_db_pool_size") is not None
+    assert _value(text, "movieapp_workers") == 1
+
+
+def test_snapshots_from_other_workers_are_summed(app, tmp_path):
+    client = _login(app, "Alex")
+    client.get("/api/movies")
+    client.get("/api/movies")
+    with app.app_context():
+        snapshot = metrics.snapshot()
+
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    # One worker that is still running (our parent process) and one that has exited
+    for pid in (os.getppid(), exited.pid):
+        with open(tmp_path / "metrics" / f"metrics-{pid}.json", "w", encoding="utf-8") as f:
+            json.dump({**snapshot, "pid": pid}, f)
+
+    labels = {"endpoint": "movies.list_movies", "method": "GET"}
+    for _ in range(2):
+        text = client.get("/metrics").get_data(as_text=True)
+        assert _value(text, "movieapp_http_request_duration_seconds_count", **labels) == 6
+        # Gauges only count live workers
+        assert _value(text, "movieapp_workers") == 2
+    # The exited worker's counts were moved to the archive
+    assert not (tmp_path / "metrics" / f"metrics-{exited.pid}.json").exists()
+    assert (tmp_path / "metrics" / "archive.json").exists()
+
+
+def test_single_process_writes_no_snapshots(tmp_path):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "TESTING": True,
+    })
+    client = _login(app, "Alex")
+    client.get("/api/movies")
+    text = client.get("/metrics").get_data(as_text=True)
+    assert _value(text, "movieapp_http_requests_total", endpoint="movies.list_movies", method="GET", status=200) == 1
+    assert not (tmp_path / "test.db.metrics").exists()
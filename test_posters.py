@@ -0,0 +1,143 @@
+"""
+Tests for the /img poster proxy and its content-addressed disk cache.
+"""
+import hashlib
+import os
+import time
+
+import pytest
+
+from benchmarks.tmdb_stub import StubTMDBServer
+from movie_app.app import create_app
+from movie_app.services import tmdb
+from movie_app.services.posters import poster_cache
+
+
+@pytest.fixture
+def stub():
+    with StubTMDBServer() as server:
+        yield server
+
+
+def _app(tmp_path, stub, **config):
+    tmdb.clear_memo()
+    return create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "TMDB_API_BASE": stub.base_url,
+        "HTTP_CACHE_BACKEND": "none",
+        "POSTER_CACHE_DIR": str(tmp_path / "posters"),
+        "POSTER_SOURCE_BASE": f"{stub.base_url}/t/p",
+        "METRICS_ENABLED": False,
+        "TESTING": True,
+        **config,
+    })
+
+
+@pytest.fixture(autouse=True)
+def _cleanup():
+    yield
+    poster_cache.wait()
+    tmdb.client.close()
+    tmdb.clear_memo()
+
+
+def _login(app):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    return client
+
+
+def test_payloads_link_to_the_proxy(tmp_path, stub):
+    client = _login(_app(tmp_path, stub))
+    client.post("/api/movies", json={"tmdb_id": 10})
+    assert client.get("/api/movies").get_json()["items"][0]["poster_url"] == "/img/w185/poster10.jpg"
+    assert client.get("/api/movies/search?q=stub").get_json()["results"][0]["poster_url"].startswith("/img/w185/")
+
+    tmdb.clear_memo()
+    client = _login(_app(tmp_path, stub, POSTER_PROXY_ENABLED=False, RESPONSE_CACHE_BACKEND="none"))
+    assert client.get("/api/movies").get_json()["items"][0]["poster_url"] == f"{tmdb.IMAGE_BASE}/w185/poster10.jpg"
+
+
+def test_proxy_urls_follow_the_mount_point(tmp_path, stub):
+    app = _app(tmp_path, stub, RESPONSE_CACHE_BACKEND="none", APPLICATION_ROOT="/films")
+    client = _login(app)
+    client.post("/api/movies", json={"tmdb_id": 10})
+    # The test client mounts the app at APPLICATION_ROOT, i.e. SCRIPT_NAME=/films
+    assert client.get("/api/movies").get_json()["items"][0]["poster_url"] == "/films/img/w185/poster10.jpg"
+    assert client.get("/img/w185/poster10.jpg").status_code == 200
+    with app.app_context():
+        assert poster_cache.url("/poster10.jpg") == "/films/img/w185/poster10.jpg"
+    assert poster_cache.url("/poster10.jpg") == "/img/w185/poster10.jpg"
+
+
+def test_posters_require_login(tmp_path, stub):
+    app = _app(tmp_path, stub)
+    assert app.test_client().get("/img/w185/poster7.jpg").status_code == 302
+    assert stub.request_count == 0
+
+
+def test_posters_are_fetched_once_and_served_immutable(tmp_path, stub):
+    client = _login(_app(tmp_path, stub))
+    first = client.get("/img/w185/poster7.jpg")
+    assert first.status_code == 200
+    assert first.mimetype == "image/jpeg"
+    assert first.headers["Cache-Control"] == "private, max-age=31536000, immutable"
+    digest = hashlib.sha256(first.data).hexdigest()
+    assert first.headers["ETag"] == f'"{digest}"'
+    # Stored by content
+    assert os.path.exists(tmp_path / "posters" / "blobs" / digest[:2] / digest)
+
+    fetched = stub.request_count
+    assert client.get("/img/w185/poster7.jpg").data == first.data
+    revalidated = client.get("/img/w185/poster7.jpg", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert stub.request_count == fetched
+    assert poster_cache.stats()["hits"] == 2 and poster_cache.stats()["misses"] == 1
+
+
+def test_bad_requests_and_upstream_failures(tmp_path, stub):
+    client = _login(_app(tmp_path, stub))
+    assert client.get("/img/original/poster1.jpg").status_code == 404
+    assert client.get("/img/w185/../secret.jpg").status_code == 404
+    assert client.get("/img/w185/poster1.txt").status_code == 404
+    assert client.get("/img/w185/missing.jpg").status_code == 404  # 404 upstream
+    # ...which is remembered
+    fetched = stub.request_count
+    assert client.get("/img/w185/missing.jpg").status_code == 404
+    assert stub.request_count == fetched
+
+    client = _login(_app(tmp_path, stub, POSTER_SOURCE_BASE="http://127.0.0.1:9/t/p"))
+    failed = client.get("/img/w185/poster2.jpg")
+    assert failed.status_code == 502
+    assert failed.headers["Cache-Control"] == "no-store"
+
+
+def test_least_recently_used_posters_are_evicted(tmp_path, stub):
+    client = _login(_app(tmp_path, stub, POSTER_CACHE_MAX_BYTES=100))
+    sizes = []
+    for n in range(3):
+        sizes.append(len(client.get(f"/img/w185/poster{n}.jpg").data))
+        blob = next(p for p in (tmp_path / "posters" / "blobs").rglob("*")
+                    if p.is_file() and p.read_bytes().endswith(f"poster{n}.jpg\xff\xd9".encode("latin-1")))
+        # poster0 is the least recently used
+        os.utime(blob, (time.time() - 1000 + n * 100,) * 2)
+    assert sum(sizes) <= 100
+
+    client.get("/img/w185/poster3.jpg")
+    assert poster_cache.size_bytes() <= 90
+    fetched = stub.request_count
+    client.get("/img/w185/poster2.jpg")
+    assert stub.request_count == fetched  # still cached
+    client.get("/img/w185/poster0.jpg")
+    assert stub.request_count == fetched + 1  # evicted, fetched again
+
+
+def test_new_movies_can_prewarm_their_posters(tmp_path, stub):
+    client = _login(_app(tmp_path, stub, POSTER_PREWARM=True))
+    client.post("/api/movies/batch", json={"tmdb_ids": [21, 22]})
+    poster_cache.wait()
+
+    fetched = stub.request_count
+    assert client.get("/img/w185/poster21.jpg").status_code == 200
+    assert client.get("/img/w185/poster22.jpg").status_code == 200
+    assert stub.request_count == fetched
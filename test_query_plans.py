@@ -0,0 +1,151 @@
+"""
+Plan-regression tests: every hot library query must be served by an index on
+SQLite, and the migrations must add those indexes to older databases.
+"""
+import os
+import re
+
+import pytest
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import event, inspect
+
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.models.review import Review
+from movie_app.models.tag import Tag, MovieTag
+from movie_app.services import counters
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+LIBRARY_TABLES = {"movies", "movie_genres", "movie_tags", "reviews", "tags", "users"}
+# A bare "SCAN <table>" reads every row; "SCAN <table> USING ... INDEX" only walks an index
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+HOT_URLS = [
+    "/api/movies",
+    "/api/movies?year_from=1990&year_to=2000",
+    "/api/movies?genre=Drama",
+    "/api/movies?tags=Classic",
+    "/api/movies?min_rating=3",
+    "/api/movies?unrated=1",
+    "/api/movies?include=tags",
+    "/api/movies?genre=Drama&tags=Classic&min_rating=3&unrated=1",
+    "/api/movies/facets",
+    "/api/movies/facets?genre=Drama&year_from=1990",
+    "/api/movies/stats",
+]
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "TESTING": True,
+        # Every request must reach the database for its plan to be checked
+        "RESPONSE_CACHE_BACKEND": "none",
+    })
+    with app.app_context():
+        tag = Tag(name="Classic", slug="classic")
+        db.session.add(tag)
+        for i in range(30):
+            movie = Movie(tmdb_id=i + 1, title=f"Movie {i}", year=1980 + i)
+            movie.set_genres(["Drama"] if i % 2 else ["Comedy"])
+            db.session.add(movie)
+        db.session.flush()
+        for movie in Movie.query.order_by(Movie.id).limit(6):
+            db.session.add(MovieTag(movie_id=movie.id, tag_id=tag.id))
+            db.session.add(Review(movie_id=movie.id, user_id=1, rating=4))
+        db.session.commit()
+        counters.reconcile()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    return client
+
+
+def _query_plans(app, client, url):
+    """(sql, [plan lines]) for every SELECT the request runs."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            assert client.get(url).status_code == 200
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+        with db.engine.connect() as conn:
+            return [
+                (sql, [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params)])
+                for sql, params in statements
+            ]
+
+
+def _full_scans(plans):
+    return [
+        (line, " ".join(sql.split())[:120])
+        for sql, plan in plans
+        for line in plan
+        if (m := FULL_SCAN.match(line)) and m.group(1) in LIBRARY_TABLES
+    ]
+
+
+def _plan_lines(plans):
+    return [line for _, plan in plans for line in plan]
+
+
+@pytest.mark.parametrize("url", HOT_URLS)
+def test_hot_queries_never_scan_a_table(app, client, url):
+    assert _full_scans(_query_plans(app, client, url)) == []
+
+
+def test_default_listing_is_read_in_index_order(app, client):
+    lines = _plan_lines(_query_plans(app, client, "/api/movies"))
+    assert "SCAN movies USING INDEX ix_movies_added_at_id" in lines
+    assert not [line for line in lines if "TEMP B-TREE FOR ORDER BY" in line]
+
+
+@pytest.mark.parametrize("url, index", [
+    ("/api/movies?year_from=1990&year_to=2000", "ix_movies_year"),
+    ("/api/movies?genre=Drama", "ix_movie_genres_name_movie_id"),
+    ("/api/movies?tags=Classic", "ix_movie_tags_tag_id_movie_id"),
+    ("/api/movies?unrated=1", "ix_reviews_user_id_movie_id"),
+    ("/api/movies?min_rating=3", "ix_reviews_movie_id_rating"),
+])
+def test_filters_use_their_index(app, client, url, index):
+    assert [line for line in _plan_lines(_query_plans(app, client, url)) if index in line]
+
+
+def test_migrations_add_missing_indexes(app, client, capsys):
+    dropped = ["ix_movies_year", "ix_movie_tags_tag_id_movie_id", "ix_reviews_user_id_movie_id",
+               "ix_reviews_movie_id_rating"]
+    with app.app_context():
+        # A database created before the indexes were declared
+        with db.engine.begin() as conn:
+            for name in dropped:
+                conn.exec_driver_sql(f"DROP INDEX {name}")
+    scans = _full_scans(_query_plans(app, client, "/api/movies?min_rating=3"))
+    assert "SCAN reviews" in [line for line, _ in scans]
+
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+        names = {ix["name"] for table in ("movies", "movie_tags", "reviews")
+                 for ix in inspect(db.engine).get_indexes(table)}
+        assert set(dropped) <= names
+        # Downgrading leaves the indexes the models own; upgrading again is a no-op
+        downgrade(directory=MIGRATIONS, revision="base")
+        assert set(dropped) <= {ix["name"] for table in ("movies", "movie_tags", "reviews")
+                                for ix in inspect(db.engine).get_indexes(table)}
+        upgrade(directory=MIGRATIONS)
+        upgrade(directory=MIGRATIONS)
+        # Renders offline, without inspecting the database
+        upgrade(directory=MIGRATIONS, revision="base:0001", sql=True)
+    assert "CREATE INDEX IF NOT EXISTS ix_movies_year ON movies (year)" in capsys.readouterr().out
+    assert _full_scans(_query_plans(app, client, "/api/movies?min_rating=3")) == []
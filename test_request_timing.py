@@ -0,0 +1,107 @@
+"""
+Tests for the per-request Server-Timing instrumentation.
+"""
+import json
+import logging
+import re
+
+import pytest
+
+from benchmarks.tmdb_stub import StubTMDBServer
+from movie_app.app import create_app
+from movie_app.services import request_timing as request_timing_module, tmdb
+
+
+def _make_app(tmp_path, stub, enabled):
+    return create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "TMDB_API_BASE": stub.base_url,
+        "HTTP_CACHE_BACKEND": "none",
+        "REQUEST_TIMING_ENABLED": enabled,
+        "TESTING": True,
+    })
+
+
+@pytest.fixture
+def stub():
+    with StubTMDBServer() as stub:
+        tmdb.clear_memo()
+        yield stub
+        tmdb.client.close()
+        tmdb.clear_memo()
+
+
+@pytest.fixture
+def client(tmp_path, stub):
+    client = _make_app(tmp_path, stub, True).test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    return client
+
+
+def _timing(resp):
+    """Server-Timing header as {metric: {"dur": float, "desc": str}}."""
+    out = {}
+    for part in resp.headers["Server-Timing"].split(", "):
+        name, *params = part.split(";")
+        out[name] = {}
+        for param in params:
+            key, value = param.split("=", 1)
+            out[name][key] = value.strip('"') if key == "desc" else float(value)
+    return out
+
+
+def _count(desc, label):
+    return int(re.search(rf"(\d+) {label}", desc).group(1))
+
+
+def test_sql_time_and_queries_are_reported(client, caplog):
+    with caplog.at_level(logging.INFO, logger="movie_app.services.request_timing"):
+        resp = client.get("/api/movies")
+    timing = _timing(resp)
+    assert _count(timing["db"]["desc"], "queries") >= 2
+    assert timing["total"]["dur"] >= timing["db"]["dur"]
+
+    line = [r.getMessage() for r in caplog.records if r.getMessage().startswith("request_timing ")][-1]
+    logged = json.loads(line.split(" ", 1)[1])
+    assert logged["endpoint"] == "movies.list_movies"
+    assert logged["status"] == 200
+    assert logged["db_queries"] == _count(timing["db"]["desc"], "queries")
+
+
+def test_tmdb_calls_and_memo_hits(client, stub):
+    first = _timing(client.get("/api/movies/search?q=stub"))
+    assert _count(first["tmdb"]["desc"], "calls") == 1
+    assert _count(first["tmdb-net"]["desc"], "requests") >= 1
+
+    again = _timing(client.get("/api/movies/search?q=stub"))
+    assert _count(again["tmdb-net"]["desc"], "requests") == 0
+    assert _count(again["cache"]["desc"], "hits") == 1
+
+
+def test_requests_from_fan_out_threads_are_attributed(client, stub):
+    resp = client.post("/api/movies/batch", json={"tmdb_ids": [11, 12, 13]})
+    timing = _timing(resp)
+    assert _count(timing["tmdb"]["desc"], "calls") == 1
+    assert _count(timing["tmdb-net"]["desc"], "requests") == 3
+
+
+def test_disabled_by_default(tmp_path, stub):
+    client = _make_app(tmp_path, stub, False).test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    assert "Server-Timing" not in client.get("/api/movies").headers
+
+
+def test_helpers_imported_by_name_are_timed(client, stub):
+    # Bound at import time, before the app installed its hooks
+    from movie_app.services import movie_details
+
+    metrics = request_timing_module.RequestMetrics()
+    token = request_timing_module._current.set(metrics)
+    try:
+        movie_details(31)
+        movie_details(31)
+    finally:
+        request_timing_module._current.reset(token)
+    assert metrics.tmdb_calls == 2
+    assert metrics.tmdb_requests == 1
+    assert metrics.cache_hits == 1
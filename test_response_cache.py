@@ -0,0 +1,68 @@
+"""
+Tests for the library response cache and its backends.
+"""
+import pytest
+
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.services import counters
+from movie_app.services.response_cache import response_cache
+
+
+@pytest.fixture(params=["memory", "filesystem"])
+def app(request, tmp_path):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "RESPONSE_CACHE_BACKEND": request.param,
+        "RESPONSE_CACHE_PATH": str(tmp_path / "response_cache"),
+        "TESTING": True,
+    })
+    with app.app_context():
+        for i in range(5):
+            movie = Movie(tmdb_id=i + 1, title=f"Movie {i}")
+            movie.set_genres(["Drama", "Comedy"] if i % 2 else ["Drama"])
+            db.session.add(movie)
+        db.session.commit()
+        counters.reconcile()
+    return app
+
+
+def _login(app, username, password):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": username, "password": password})
+    return client
+
+
+def test_repeat_requests_hit_until_a_write(app):
+    alex = _login(app, "Alex", "alex")
+    first = alex.get("/api/movies?genre=Drama,Comedy")
+    assert first.headers["X-Cache"] == "MISS"
+    # Same filters in another order share the entry
+    again = alex.get("/api/movies?genre=Comedy,Drama")
+    assert again.headers["X-Cache"] == "HIT"
+    assert again.get_json() == first.get_json()
+    # Users share entries unless the result is per user
+    assert _login(app, "Carrie", "carrie").get("/api/movies?genre=Drama,Comedy").headers["X-Cache"] == "HIT"
+
+    movie_id = first.get_json()["items"][0]["id"]
+    alex.post(f"/api/movies/{movie_id}/review", json={"rating": 4})
+    after = alex.get("/api/movies?genre=Comedy,Drama")
+    assert after.headers["X-Cache"] == "MISS"
+    assert after.get_json()["items"][0]["ratings"] == {"Alex": 4.0}
+
+    stats = response_cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_unrated_results_are_cached_per_user(app):
+    alex = _login(app, "Alex", "alex")
+    carrie = _login(app, "Carrie", "carrie")
+    movie_id = alex.get("/api/movies").get_json()["items"][0]["id"]
+    alex.post(f"/api/movies/{movie_id}/review", json={"rating": 3})
+
+    assert alex.get("/api/movies?unrated=1").get_json()["total"] == 4
+    resp = carrie.get("/api/movies?unrated=1")
+    assert resp.headers["X-Cache"] == "MISS"
+    assert resp.get_json()["total"] == 5
@@ -0,0 +1,55 @@
+"""
+Tests for library-only search backed by the full-text index.
+"""
+import pytest
+
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.services.search_index import search_index
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}", "TESTING": True})
+    with app.app_context():
+        db.session.add_all([
+            Movie(tmdb_id=1, title="The Matrix", overview="A hacker learns the truth about reality."),
+            Movie(tmdb_id=2, title="Reality Bites", overview="Friends after college."),
+            Movie(tmdb_id=3, title="Amélie", original_title="Le Fabuleux Destin d'Amélie Poulain"),
+            Movie(tmdb_id=4, title="Spirited Away", overview="A girl in a world of spirits."),
+        ])
+        db.session.commit()
+        # Movies above were inserted behind the index's back
+        search_index.rebuild()
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    return client
+
+
+def _titles(client, q):
+    resp = client.get(f"/api/movies/search?library_only=true&q={q}")
+    return [r["title"] for r in resp.get_json()["results"]]
+
+
+def test_prefix_and_accent_insensitive_matching(client):
+    assert _titles(client, "matr") == ["The Matrix"]
+    assert _titles(client, "amelie") == ["Amélie"]
+    assert _titles(client, "fabuleux destin") == ["Amélie"]
+
+
+def test_title_matches_rank_above_overview_matches(client):
+    assert _titles(client, "reality") == ["Reality Bites", "The Matrix"]
+
+
+def test_misspelled_terms_still_match(client):
+    assert _titles(client, "spirted") == ["Spirited Away"]
+
+
+def test_tags_are_searchable_and_kept_in_sync(client):
+    movie_id = client.get("/api/movies?per_page=50").get_json()["items"][-1]["id"]
+    assert client.post(f"/api/movies/{movie_id}/tags", json={"name": "Mind-Bender"}).get_json()["ok"]
+    assert _titles(client, "bender") == ["The Matrix"]
+
+    assert client.delete(f"/api/movies/{movie_id}").get_json()["ok"]
+    assert _titles(client, "bender") == []
@@ -0,0 +1,105 @@
+"""
+Tests for the streaming Stremio library import.
+"""
+import io
+import json
+
+import pytest
+
+from benchmarks.tmdb_stub import StubTMDBServer
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.services import counters, tmdb
+from movie_app.services.stremio import iter_json_array
+
+
+@pytest.fixture
+def app(tmp_path):
+    with StubTMDBServer() as stub:
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+            "TMDB_API_BASE": stub.base_url,
+            "HTTP_CACHE_BACKEND": "none",
+            "TESTING": True,
+        })
+        yield app
+        tmdb.client.close()
+        tmdb.clear_memo()
+
+
+def _entry(imdb_id, name, type_="movie", removed=False):
+    return {"__id": imdb_id, "d": {"_id": imdb_id, "name": name, "type": type_, "removed": removed, "year": "1999"}}
+
+
+def test_iter_json_array_matches_full_parse():
+    with open("stremioExport.json", "rb") as fp:
+        expected = json.load(fp)["library"]
+    with open("stremioExport.json", "rb") as fp:
+        assert list(iter_json_array(fp, "library", chunk_size=7)) == expected
+    assert list(iter_json_array(io.StringIO('{"a": 12345, "library": [1, 2.5, "x"]}'), "library", chunk_size=3)) == [1, 2.5, "x"]
+    assert list(iter_json_array(io.StringIO('{"other": []}'), "library")) == []
+
+
+def test_import_reports_every_entry(app):
+    with app.app_context():
+        db.session.add(Movie(tmdb_id=12, title="Already here"))
+        db.session.commit()
+        counters.reconcile()
+    export = {"user": {"_id": "u"}, "library": [
+        _entry("tt0000011", "New One"),
+        _entry("tt0000012", "Existing"),
+        _entry("tt0000013", "New Two"),
+        _entry("tt0000011", "New One again"),
+        _entry("tt0000015", "Listed as movie, series on TMDB"),
+        _entry("tt0000016", "A Show", type_="series"),
+        _entry("tt0000017", "Removed", removed=True),
+        _entry("kitsu:1", "Not IMDb"),
+    ]}
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    data = client.post("/api/import/stremio", data=json.dumps(export), content_type="application/json").get_json()
+
+    assert data["ok"]
+    assert data["summary"] == {"total": 8, "added": 2, "exists": 1, "skipped": 5, "failed": 0}
+    statuses = [(item["imdb_id"], item["status"]) for item in data["items"]]
+    assert statuses == [
+        ("tt0000011", "added"), ("tt0000012", "exists"), ("tt0000013", "added"), ("tt0000011", "skipped"),
+        ("tt0000015", "skipped"), ("tt0000016", "skipped"), ("tt0000017", "skipped"), ("kitsu:1", "skipped"),
+    ]
+    assert all(item.get("reason") for item in data["items"] if item["status"] == "skipped")
+
+    assert client.get("/api/movies/stats").get_json()["total_movies"] == 3
+    with app.app_context():
+        assert {m.tmdb_id for m in Movie.query.all()} == {11, 12, 13}
+        assert Movie.query.filter_by(tmdb_id=11).one().added_by == 1
+
+
+def test_import_rejects_malformed_export(app):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    resp = client.post("/api/import/stremio", data='{"library": [{"a": 1}', content_type="application/json")
+    assert resp.status_code == 400
+
+
+def test_import_resumes_from_next_offset(app):
+    app.config["STREMIO_IMPORT_BATCH"] = 3
+    export = json.dumps({"library": [
+        _entry("tt0000011", "One"),
+        _entry("tt0000016", "A Show", type_="series"),
+        _entry("tt0000013", "Two"),
+        _entry("tt0000011", "One again"),
+        _entry("tt0000014", "Three"),
+    ]})
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+
+    first = client.post("/api/import/stremio", data=export, content_type="application/json").get_json()
+    assert first["next_offset"] == 3
+    assert [item["status"] for item in first["items"]] == ["added", "skipped", "added"]
+
+    rest = client.post("/api/import/stremio?offset=3", data=export, content_type="application/json").get_json()
+    assert rest["next_offset"] is None
+    # Entries before the offset still count for duplicate detection
+    assert [(item["imdb_id"], item["status"]) for item in rest["items"]] == [("tt0000011", "skipped"), ("tt0000014", "added")]
+    assert client.get("/api/movies/stats").get_json()["total_movies"] == 3
@@ -0,0 +1,73 @@
+"""
+Tests for the in-memory tag catalog behind tag autocomplete.
+"""
+import pytest
+from sqlalchemy import event
+
+from movie_app.app import create_app
+from movie_app.extensions import db
+from movie_app.models.movie import Movie
+from movie_app.models.tag import Tag
+from movie_app.services.tag_catalog import tag_catalog
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}", "TESTING": True})
+    with app.app_context():
+        db.session.add(Movie(tmdb_id=1, title="Heat"))
+        db.session.add_all([
+            Tag(name="Dreamy", slug="dreamy"),
+            Tag(name="Heist", slug="heist", color="#000000"),
+            Tag(name="Drama", slug="drama"),
+        ])
+        db.session.commit()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+    return client
+
+
+def _names(resp):
+    return [t["name"] for t in resp.get_json()["tags"]]
+
+
+def test_search_ranks_predefined_then_prefix_then_substring(client):
+    assert _names(client.get("/api/tags/search?q=dr")) == ["Drama", "Dreamy"]
+    assert _names(client.get("/api/tags/search?q=EAM")) == ["Dreamy"]
+    assert _names(client.get("/api/tags/search?q=de")) == ["Deep", "Mind-Bender", "Underrated Gem"]
+    assert _names(client.get("/api/tags/search?q=heis")) == ["Heist"]
+    assert len(_names(client.get("/api/tags/search?limit=5"))) == 5
+
+
+def test_colors_are_resolved(client):
+    tags = {t["name"]: t["color"] for t in client.get("/api/tags/all").get_json()["tags"]}
+    assert tags["Heist"] == "#000000"
+    assert tags["Dreamy"] == "#e9ecef"
+    assert tags["Drama"] == "#f3e8ff"
+    assert list(tags).count("Drama") == 1
+
+
+def test_autocomplete_is_served_from_memory_and_refreshed_on_new_tags(app, client):
+    client.get("/api/tags/all")
+    statements = []
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    loads, version = tag_catalog.loads, tag_catalog.version
+    client.get("/api/tags/search?q=dre")
+    client.get("/api/tags/all")
+    assert not [s for s in statements if "tags" in s]
+    assert tag_catalog.loads == loads
+
+    movie_id = client.get("/api/movies").get_json()["items"][0]["id"]
+    # Tagging with an existing tag leaves the catalog alone
+    assert client.post(f"/api/movies/{movie_id}/tags", json={"name": "Heist"}).get_json()["ok"]
+    assert tag_catalog.version == version
+    assert client.post(f"/api/movies/{movie_id}/tags", json={"name": "Dread"}).get_json()["ok"]
+    assert tag_catalog.version == version + 1
+    assert "Dread" in _names(client.get("/api/tags/search?q=dre"))
+    assert tag_catalog.loads == loads + 1
@@ -0,0 +1,147 @@
+"""
+Tests for the pooled TMDB client against a local stub server.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from flask import Flask
+
+from movie_app.services import tmdb
+from movie_app.services.cache import http_cache
+from movie_app.services.posters import poster_cache
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        server.client_ports.add(self.client_address[1])
+        path = self.path.split("?", 1)[0]
+        if path == "/flaky" and server.failures_left > 0:
+            server.failures_left -= 1
+            return self._send(503, {"status_message": "try again"})
+        if path in server.broken:
+            return self._send(404, {"status_message": "not found"})
+        if path == "/search/movie":
+            return self._send(200, {"results": [
+                {"id": 603, "title": "The Matrix", "release_date": "1999-03-31", "poster_path": "/m.jpg"},
+                {"id": 604, "title": "The Matrix Reloaded", "release_date": "2003-05-15"},
+            ]})
+        if path == "/movie/603":
+            return self._send(200, {"id": 603, "title": "The Matrix", "release_date": "1999-03-31",
+                                    "genres": [{"id": 28, "name": "Action"}], "vote_average": 8.2})
+        return self._send(200, {"ok": True})
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.requests = []
+    server.client_ports = set()
+    server.failures_left = 0
+    server.broken = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    tmdb.client.configure(
+        base_url=f"http://127.0.0.1:{server.server_address[1]}",
+        api_key="test-key",
+        backoff_factor=0,
+    )
+    tmdb.clear_memo()
+    # Poster URLs point at TMDB unless an app turned the local proxy on
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config["POSTER_PROXY_ENABLED"] = False
+    poster_cache.init_app(app)
+    yield server
+    tmdb.client.close()
+    tmdb.clear_memo()
+    tmdb.client._configured = False
+    server.shutdown()
+    server.server_close()
+
+
+def test_helpers_go_through_the_client(stub_server):
+    results = tmdb.search_movies("the matrix")
+    assert [r["tmdb_id"] for r in results] == [603, 604]
+    assert results[0]["poster_url"] == f"{tmdb.IMAGE_BASE}/w185/m.jpg"
+
+    details = tmdb.movie_details(603)
+    assert details["genres"] == ["Action"]
+    assert all("api_key=test-key" in path for path in stub_server.requests)
+
+
+def test_connections_are_kept_alive(stub_server):
+    for _ in range(5):
+        tmdb.client.get("/movie/603")
+    assert len(stub_server.requests) == 5
+    assert len(stub_server.client_ports) == 1
+
+
+def test_retries_server_errors(stub_server):
+    stub_server.failures_left = 2
+    assert tmdb.client.get("/flaky") == {"ok": True}
+    assert len(stub_server.requests) == 3
+
+
+def test_lookups_are_memoized_on_normalized_arguments(stub_server):
+    first = tmdb.search_movies("The Matrix")
+    assert tmdb.search_movies("  the   MATRIX ") is first
+    assert tmdb.movie_details(603) is tmdb.movie_details(603)
+    assert len(stub_server.requests) == 2
+    assert tmdb.memo_stats()["search_movies"]["hits"] >= 1
+
+
+def test_rankings_from_failed_lookups_are_not_memoized(stub_server):
+    stub_server.broken = {"/search/person", "/movie/604/credits"}
+    degraded = tmdb.search_movies("the matrix", director="Wachowski")
+    assert [r["tmdb_id"] for r in degraded] == [603, 604]
+    assert tmdb.memo_stats()["search_movies"]["size"] == 0
+    assert tmdb.memo_stats()["search_person"]["size"] == 0
+
+    stub_server.broken = set()
+    seen = len(stub_server.requests)
+    tmdb.search_movies("the matrix", director="Wachowski")
+    retried = [path.split("?", 1)[0] for path in stub_server.requests[seen:]]
+    assert "/search/person" in retried and "/movie/604/credits" in retried
+    assert tmdb.memo_stats()["search_movies"]["size"] == 1
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_http_cache_is_scoped_to_the_client(stub_server, tmp_path, backend):
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config.update(
+        HTTP_CACHE_BACKEND=backend,
+        HTTP_CACHE_MAX_ENTRIES=1,
+        TMDB_API_BASE=tmdb.client.base_url,
+    )
+    http_cache.init_app(app)
+    tmdb.client.configure(base_url=tmdb.client.base_url, api_key="test-key", session_factory=http_cache.create_session)
+
+    tmdb.client.get("/movie/603")
+    tmdb.client.get("/movie/603")
+    tmdb.client.get("/search/movie", {"query": "matrix"})
+    assert len(stub_server.requests) == 2
+    assert http_cache.stats()["hits"] == 1
+
+    # A plain requests call is not cached
+    requests.get(f"{tmdb.client.base_url}/movie/603", timeout=5)
+    assert len(stub_server.requests) == 3
+
+    assert http_cache.prune() == 1
+    assert len(tmdb.client.session.cache.responses) == 1
@@ -0,0 +1,125 @@
+"""
+Tests for recording TMDB answers and replaying them offline (TMDB_MODE=record/replay).
+"""
+import gzip
+import time
+
+import pytest
+import requests
+
+from benchmarks.record_tmdb_fixtures import DEFAULT_FIXTURES, record
+from benchmarks.tmdb_stub import StubTMDBServer
+from movie_app.app import create_app
+from movie_app.services import tmdb
+from movie_app.services.tmdb_fixtures import FixtureMissing, FixtureStore, ReplayTransport, fixture_key
+
+
+def _app(tmp_path, **config):
+    tmdb.clear_memo()
+    return create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "HTTP_CACHE_BACKEND": "none",
+        "METRICS_ENABLED": False,
+        "TESTING": True,
+        **config,
+    })
+
+
+@pytest.fixture(autouse=True)
+def _reset_client():
+    yield
+    tmdb.client.configure()
+    tmdb.clear_memo()
+
+
+def test_recorded_answers_replay_without_the_network(tmp_path):
+    path = str(tmp_path / "tmdb.jsonl.gz")
+    with StubTMDBServer() as stub:
+        record(path, searches=["Heat"], director_searches=[("Heat", "Stub Director")], movies=[42],
+               imdb_ids=["tt0000011"], api_base=stub.base_url)
+        live = (tmdb.search_movies("Heat"), tmdb.search_movies("Heat", director="Stub Director"),
+                tmdb.movie_details(42), tmdb.find_by_imdb("tt0000011"))
+        tmdb.clear_memo()
+    assert live[0] and live[2]["title"] == "Stub Movie 42"
+
+    # The stub is gone; everything now comes from the fixture file
+    _app(tmp_path, TMDB_MODE="replay", TMDB_FIXTURES_PATH=path)
+    # Free-text queries match regardless of case and spacing
+    assert tmdb.search_movies("  HEAT ") == live[0]
+    assert tmdb.search_movies("Heat", director="Stub Director") == live[1]
+    assert tmdb.movie_details(42) == live[2]
+    assert tmdb.find_by_imdb("tt0000011") == live[3]
+
+    # Unrecorded requests fail like an unreachable TMDB
+    assert tmdb.search_movies("not recorded") == []
+    assert tmdb.movie_details(43) is None
+    with pytest.raises(FixtureMissing):
+        tmdb.find_by_imdb("tt0000012")
+
+
+def test_api_keys_stay_out_of_fixtures(tmp_path):
+    store = FixtureStore(str(tmp_path / "f.jsonl.gz"))
+    store.put("/movie/1", {"api_key": "secret", "language": "en"}, 200, '{"id": 1}')
+    store.put("/movie/2", None, 404, '{"status_message": "not found"}')
+    store.save()
+    with gzip.open(store.path, "rt", encoding="utf-8") as f:
+        assert "secret" not in f.read()
+    assert fixture_key("/movie/1", {"language": "en", "api_key": "x"}) == "/movie/1?language=en"
+
+    replay = ReplayTransport(FixtureStore(store.path))
+    assert replay.get("/movie/1", {"language": "en", "api_key": "other"}) == {"id": 1}
+    with pytest.raises(requests.HTTPError) as err:
+        replay.get("/movie/2")
+    assert err.value.response.status_code == 404
+
+
+def test_injected_latency_and_errors(tmp_path):
+    store = FixtureStore(str(tmp_path / "f.jsonl.gz"))
+    store.put("/movie/1", None, 200, '{"id": 1}')
+
+    slow = ReplayTransport(store, latency=0.05)
+    started = time.perf_counter()
+    slow.get("/movie/1")
+    assert time.perf_counter() - started >= 0.05
+
+    flaky = ReplayTransport(store, error_rate=0.5, seed=7)
+    outcomes = []
+    for _ in range(40):
+        try:
+            flaky.get("/movie/1")
+            outcomes.append("ok")
+        except requests.HTTPError as exc:
+            assert exc.response.status_code == 503
+            outcomes.append("error")
+    assert 5 < outcomes.count("error") < 35
+    # The same seed injects the same errors
+    again = ReplayTransport(store, error_rate=0.5, seed=7)
+    replayed = []
+    for _ in range(40):
+        try:
+            again.get("/movie/1")
+            replayed.append("ok")
+        except requests.HTTPError:
+            replayed.append("error")
+    assert replayed == outcomes
+
+
+def test_shipped_fixtures_drive_the_app(tmp_path):
+    app = _app(tmp_path, TMDB_MODE="replay", TMDB_FIXTURES_PATH=DEFAULT_FIXTURES)
+    client = app.test_client()
+    client.post("/auth/login", json={"username": "Alex", "password": "alex"})
+
+    found = client.get("/api/movies/search?q=bench 3").get_json()
+    assert len(found["results"]) == 8
+    assert client.post("/api/movies", json={"tmdb_id": 10}).get_json()["ok"] is True
+    assert [m["title"] for m in client.get("/api/movies").get_json()["items"]] == ["Stub Movie 10"]
+
+    _app(tmp_path, TMDB_MODE="replay", TMDB_FIXTURES_PATH=DEFAULT_FIXTURES, TMDB_REPLAY_ERROR_RATE=1.0)
+    assert tmdb.movie_details(11) is None
+
+
+def test_mode_is_validated(tmp_path):
+    with pytest.raises(ValueError):
+        _app(tmp_path, TMDB_MODE="offline")
+    with pytest.raises(ValueError):
+        _app(tmp_path, TMDB_MODE="replay", TMDB_FIXTURES_PATH=str(tmp_path / "missing.jsonl.gz"))